@@ -1,9 +1,11 @@
 import numpy as np
-from PIL import Image, ImageDraw
 import os
 from datetime import datetime
 import math
 import colorsys
+from animation_backends import get_backend
+from supersampling import new_canvas
+from render_profiler import NULL_PROFILER, RenderProfiler
 
 class ColorPalette:
     def __init__(self):
@@ -60,39 +62,79 @@ class AnimatedArtGenerator:
         self.output_dir = 'animated_art'
         os.makedirs(self.output_dir, exist_ok=True)
         self.palette = ColorPalette()
+        self.encode_stats = None
+        self.antialias = 1  # Supersampling factor per axis, 1 disables antialiasing
+        self.canvas_pool = []  # Resolved supersampled canvases, reused by later frames
+        self.profiler = NULL_PROFILER  # Stage timings; see enable_profiling
         
+    def new_canvas(self, mode='RGB', color='black'):
+        """Create a drawing canvas for a frame or layer, supersampled when antialiasing is on"""
+        return new_canvas((self.width, self.height), mode, color, self.antialias, self.canvas_pool)
+    
+    def enable_profiling(self, profiler=None):
+        """
+        Record per-stage timings of every frame from now on
+        :param profiler: RenderProfiler to record into, a new one by default
+        :return: The profiler, for summary() and the CSV / Chrome trace exports
+        """
+        self.profiler = profiler or RenderProfiler()
+        return self.profiler
+    
+    def disable_profiling(self):
+        self.profiler = NULL_PROFILER
+    
+    def profile_frames(self, frames=30, profiler=None):
+        """Render frames without encoding them, with stage timings recorded"""
+        profiler = self.enable_profiling(profiler)
+        try:
+            for i in range(frames):
+                with profiler.frame(i):
+                    self.create_frame(i, frames)
+        finally:
+            self.disable_profiling()
+        return profiler
+    
     def create_frame(self, frame_num, total_frames):
         """Create a new frame (to be implemented by subclasses)"""
         pass
     
-    def generate_animation(self, name, frames=60, duration=100):
-        """Generate and save an animated GIF"""
+    def generate_animation(self, name, frames=60, duration=100, backend='gif', quality=80, antialias=None):
+        """
+        Generate and save an animation
+        :param name: Base name of the output file
+        :param frames: Number of frames to render
+        :param duration: Display time of each frame in milliseconds
+        :param backend: Output format, one of 'gif', 'mp4', 'webp' or 'apng'
+        :param quality: Encoder quality from 1 to 100 (used by mp4 and webp, compression effort for apng)
+        :param antialias: Supersampling factor per axis for this render (2 is comparable to 4x SSAA)
+        """
+        if antialias is not None:
+            self.antialias = antialias
         print(f"Generating {name} animation...")
         
-        images = []
-        for i in range(frames):
-            print(f"Generating frame {i+1}/{frames}")
-            frame = self.create_frame(i, frames)
-            images.append(frame)
-        
+        writer = get_backend(backend, quality)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{name}_{timestamp}.gif"
+        filename = f"{name}_{timestamp}.{writer.extension}"
         filepath = os.path.join(self.output_dir, filename)
         
-        images[0].save(
-            filepath,
-            save_all=True,
-            append_images=images[1:],
-            duration=duration,
-            loop=0
-        )
+        writer.open(filepath, (self.width, self.height), duration)
+        for i in range(frames):
+            print(f"Generating frame {i+1}/{frames}")
+            with self.profiler.frame(i):
+                frame = self.create_frame(i, frames)
+                with self.profiler.span('encode'):
+                    writer.write_frame(frame)
+        self.encode_stats = writer.close()
+        
         print(f"Saved: {filepath}")
+        print(f"Encoded {self.encode_stats['frames']} frames with {backend} "
+              f"at {self.encode_stats['fps']:.1f} fps")
         return filepath
 
 class SpinningMandala(AnimatedArtGenerator):
     def create_frame(self, frame_num, total_frames):
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         base_hue = frame_num / total_frames
         rotation = frame_num * (360 / total_frames)
@@ -124,12 +166,12 @@ class SpinningMandala(AnimatedArtGenerator):
             
             draw.polygon(points, fill=color)
         
-        return image
+        return canvas.resolve()
 
 class ExpandingSpiral(AnimatedArtGenerator):
     def create_frame(self, frame_num, total_frames):
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         start_angle = (frame_num * 10) % 360
         expansion = frame_num / total_frames
@@ -161,12 +203,12 @@ class ExpandingSpiral(AnimatedArtGenerator):
                 
                 draw.line(points[-2:], fill=color, width=2)
         
-        return image
+        return canvas.resolve()
 
 class PulsatingCircles(AnimatedArtGenerator):
     def create_frame(self, frame_num, total_frames):
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         phase = frame_num * (2 * math.pi / total_frames)
         base_hue = frame_num / total_frames
@@ -195,12 +237,12 @@ class PulsatingCircles(AnimatedArtGenerator):
             y1 = self.height/2 + radius
             draw.ellipse([x0, y0, x1, y1], outline=color, width=2)
         
-        return image
+        return canvas.resolve()
 
 class MorphingStars(AnimatedArtGenerator):
     def create_frame(self, frame_num, total_frames):
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         phase = frame_num * (2 * math.pi / total_frames)
         points = 5 + int(2.5 * (math.sin(phase) + 1))
@@ -234,7 +276,7 @@ class MorphingStars(AnimatedArtGenerator):
             
             draw.line([star_points[i], star_points[i+1]], fill=color, width=2)
         
-        return image
+        return canvas.resolve()
 
 def main():
     print("Animated Art Generator")
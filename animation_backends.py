@@ -0,0 +1,157 @@
+import cv2
+import numpy as np
+import time
+
+class AnimationBackend:
+    """Base class for animation output backends"""
+    name = None
+    extension = None
+
+    def __init__(self, quality=80):
+        """
+        Initialize the backend
+        :param quality: Encoder quality from 1 (smallest) to 100 (best)
+        """
+        self.quality = quality
+        self.filepath = None
+        self.frame_count = 0
+        self.encode_time = 0.0
+
+    def open(self, filepath, size, duration):
+        """
+        Start a new animation file
+        :param filepath: Output file path
+        :param size: Frame size (width, height)
+        :param duration: Display time of each frame in milliseconds
+        """
+        self.filepath = filepath
+        self.size = size
+        self.duration = duration
+        self.frame_count = 0
+        self.encode_time = 0.0
+        start = time.perf_counter()
+        self._open()
+        self.encode_time += time.perf_counter() - start
+
+    def write_frame(self, frame):
+        """Encode a single PIL frame"""
+        start = time.perf_counter()
+        self._write(frame)
+        self.encode_time += time.perf_counter() - start
+        self.frame_count += 1
+
+    def close(self):
+        """Finish the file and return encode statistics"""
+        start = time.perf_counter()
+        self._close()
+        self.encode_time += time.perf_counter() - start
+        return self.stats()
+
+    def encode_fps(self):
+        """Get encode throughput in frames per second"""
+        if self.encode_time <= 0:
+            return 0.0
+        return self.frame_count / self.encode_time
+
+    def stats(self):
+        """Get encode statistics for the last animation"""
+        return {
+            'backend': self.name,
+            'frames': self.frame_count,
+            'encode_time': self.encode_time,
+            'fps': self.encode_fps()
+        }
+
+    def _open(self):
+        pass
+
+    def _write(self, frame):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+class BufferedPILBackend(AnimationBackend):
+    """Backend that hands all frames to a PIL animated writer in one call"""
+
+    def _open(self):
+        self.frames = []
+
+    def _write(self, frame):
+        self.frames.append(frame)
+
+    def _close(self):
+        if self.frames:
+            self.frames[0].save(
+                self.filepath,
+                save_all=True,
+                append_images=self.frames[1:],
+                **self.save_options()
+            )
+        self.frames = []
+
+    def save_options(self):
+        """Get format specific keyword arguments for Image.save"""
+        return {'duration': self.duration, 'loop': 0}
+
+class GifBackend(BufferedPILBackend):
+    """Animated GIF output (256 colors)"""
+    name = 'gif'
+    extension = 'gif'
+
+class WebPBackend(BufferedPILBackend):
+    """Animated WebP output, lossless at quality 100"""
+    name = 'webp'
+    extension = 'webp'
+
+    def save_options(self):
+        options = super().save_options()
+        options['quality'] = self.quality
+        options['lossless'] = self.quality >= 100
+        options['method'] = 4
+        return options
+
+class ApngBackend(BufferedPILBackend):
+    """Animated PNG output (lossless, quality controls compression effort)"""
+    name = 'apng'
+    extension = 'png'
+
+    def save_options(self):
+        options = super().save_options()
+        # Higher quality spends more time compressing for a smaller file
+        options['compress_level'] = max(1, min(9, round(self.quality / 100 * 9)))
+        return options
+
+class Mp4Backend(AnimationBackend):
+    """MP4 output through OpenCV VideoWriter, frames are streamed straight to the encoder"""
+    name = 'mp4'
+    extension = 'mp4'
+
+    def _open(self):
+        fps = 1000.0 / self.duration
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.writer = cv2.VideoWriter(self.filepath, fourcc, fps, self.size)
+        if not self.writer.isOpened():
+            raise IOError(f"Could not open video writer for {self.filepath}")
+        # Only honoured by codecs that support it
+        self.writer.set(cv2.VIDEOWRITER_PROP_QUALITY, self.quality)
+
+    def _write(self, frame):
+        rgb = np.asarray(frame.convert('RGB'))
+        self.writer.write(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+
+    def _close(self):
+        self.writer.release()
+
+BACKENDS = {
+    'gif': GifBackend,
+    'mp4': Mp4Backend,
+    'webp': WebPBackend,
+    'apng': ApngBackend
+}
+
+def get_backend(name, quality=80):
+    """Create an output backend by name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', choose from {', '.join(BACKENDS)}")
+    return BACKENDS[name](quality)
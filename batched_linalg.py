@@ -0,0 +1,117 @@
+import time
+import numpy as np
+import sympy as sp
+
+def is_numeric(matrix):
+    """Check whether a SymPy matrix has no free symbols, so NumPy can take it"""
+    return not matrix.free_symbols
+
+def to_array(matrix):
+    """Convert a numeric SymPy matrix to a float (or complex) array"""
+    try:
+        # Integers, rationals and floats convert directly, far cheaper than evalf
+        return np.array(matrix.tolist(), dtype=np.float64)
+    except TypeError:
+        values = matrix.evalf().tolist()
+        try:
+            return np.array(values, dtype=np.float64)
+        except TypeError:
+            return np.array(values, dtype=np.complex128)
+
+# Below this size converting a SymPy matrix costs more than its exact
+# determinant (see benchmark_crossover), so small ones stay symbolic
+NUMERIC_FROM = 4
+
+def split_batch(matrices, numeric_from=NUMERIC_FROM):
+    """
+    Sort matrices into NumPy stacks and symbolic leftovers
+    :param numeric_from: Smallest SymPy matrix size sent to NumPy; arrays always are
+    :return: (dict of shape -> (indexes, stacked array), list of symbolic indexes)
+    """
+    if isinstance(matrices, np.ndarray):
+        return {matrices.shape[1:]: (list(range(len(matrices))), matrices)}, []
+    groups = {}
+    symbolic = []
+    for i, matrix in enumerate(matrices):
+        if isinstance(matrix, np.ndarray):
+            groups.setdefault(matrix.shape, []).append((i, matrix))
+        elif matrix.rows >= numeric_from and is_numeric(matrix):
+            groups.setdefault(matrix.shape, []).append((i, to_array(matrix)))
+        else:
+            symbolic.append(i)
+    stacks = {shape: ([i for i, _ in items], np.stack([array for _, array in items]))
+              for shape, items in groups.items()}
+    return stacks, symbolic
+
+def batch_det(matrices, cache=None, numeric_from=NUMERIC_FROM):
+    """
+    Determinants of many matrices. Numeric matrices (SymPy without symbols,
+    or NumPy arrays) are stacked by shape and go through one np.linalg.det
+    call per shape; matrices with symbols keep the exact symbolic path.
+    :param matrices: Sequence of SymPy matrices/arrays, or an (k, n, n) array
+    :param cache: Optional SymbolicCache for the symbolic determinants
+    :param numeric_from: Smallest SymPy matrix size sent to NumPy
+    :return: List of determinants in input order (floats or SymPy expressions)
+    """
+    stacks, symbolic = split_batch(matrices, numeric_from)
+    results = [None] * (sum(len(indexes) for indexes, _ in stacks.values()) + len(symbolic))
+    for indexes, stack in stacks.values():
+        for i, value in zip(indexes, np.linalg.det(stack).tolist()):
+            results[i] = value
+    for i in symbolic:
+        results[i] = cache.apply('det', matrices[i]) if cache else matrices[i].det()
+    return results
+
+def batch_eigvals(matrices, cache=None, numeric_from=NUMERIC_FROM):
+    """
+    Eigenvalues of many matrices, batched through np.linalg.eigvals for the
+    numeric ones and symbolic for the rest
+    :return: List of eigenvalue lists in input order; symbolic eigenvalues are
+             repeated by their multiplicity to match the NumPy form
+    """
+    stacks, symbolic = split_batch(matrices, numeric_from)
+    results = [None] * (sum(len(indexes) for indexes, _ in stacks.values()) + len(symbolic))
+    for indexes, stack in stacks.values():
+        for i, values in zip(indexes, np.linalg.eigvals(stack)):
+            results[i] = values
+    for i in symbolic:
+        eigenvalues = cache.apply('eigenvals', matrices[i]) if cache else matrices[i].eigenvals()
+        results[i] = [value for value, multiplicity in eigenvalues.items() for _ in range(multiplicity)]
+    return results
+
+def benchmark_crossover(sizes=(2, 3, 4, 6, 8), batches=(1, 10, 100, 1000), repeat=3):
+    """
+    Time symbolic Matrix.det() against batch_det on numeric SymPy matrices and
+    report, per matrix size, the smallest batch where the NumPy path wins.
+    The 'numpy' timing includes converting the SymPy matrices to arrays;
+    'stacked' is the same batch handed over as one (k, n, n) array.
+    """
+    rng = np.random.default_rng(0)
+    print(f"{'size':>4} {'batch':>6} {'symbolic':>12} {'numpy':>12} {'stacked':>12}")
+    crossover = {}
+    for n in sizes:
+        for batch in batches:
+            arrays = rng.integers(-9, 10, (batch, n, n)).astype(np.float64)
+            matrices = [sp.Matrix(array.astype(int)) for array in arrays]
+            timings = []
+            for path in (lambda: [m.det() for m in matrices], lambda: batch_det(matrices, numeric_from=0),
+                         lambda: batch_det(arrays)):
+                best = float('inf')
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    path()
+                    best = min(best, time.perf_counter() - start)
+                timings.append(best)
+            print(f"{n:>4} {batch:>6} {timings[0]:>11.5f}s {timings[1]:>11.5f}s {timings[2]:>11.5f}s")
+            if timings[1] < timings[0] and n not in crossover:
+                crossover[n] = batch
+        print(f"size {n}: NumPy path faster from batch {crossover.get(n, 'never (in range)')}")
+    return crossover
+
+def main():
+    print("Batched Linear Algebra")
+    print("======================")
+    benchmark_crossover()
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
-import bpy
+import os
+import math
 import random
-from mathutils import Vector
+import time
+from node_graph import MATERIAL_SPECS, MaterialBuilder, spec_variant, baked_spec
+
+try:
+    import bpy
+except ImportError:
+    # Outside Blender: build node graphs against the headless stand-in
+    import bpy_stub as bpy
 
 class NoiseTextureGenerator:
     def __init__(self):
@@ -12,6 +20,7 @@ class NoiseTextureGenerator:
             'musgrave': self.create_musgrave,
             'wave': self.create_wave
         }
+        self.builder = MaterialBuilder(bpy)
 
     def clear_scene(self):
         """Clear existing materials and textures"""
@@ -22,264 +31,218 @@ class NoiseTextureGenerator:
         # Remove existing textures
         for texture in bpy.data.textures:
             bpy.data.textures.remove(texture)
-
-    def create_base_material(self, name):
-        """Create a new material with nodes"""
-        material = bpy.data.materials.new(name=name)
-        material.use_nodes = True
-        nodes = material.node_tree.nodes
-        nodes.clear()
-        return material, nodes
-
-    def create_basic_node_setup(self, material_name):
-        """Create basic node setup for material"""
-        material, nodes = self.create_base_material(material_name)
-        
-        # Create nodes
-        output = nodes.new('ShaderNodeOutputMaterial')
-        principled = nodes.new('ShaderNodeBsdfPrincipled')
-        texture_coord = nodes.new('ShaderNodeTexCoord')
-        mapping = nodes.new('ShaderNodeMapping')
-        noise_texture = nodes.new('ShaderNodeTexNoise')
-        color_ramp = nodes.new('ShaderNodeValToRGB')
         
-        # Position nodes
-        output.location = Vector((300, 0))
-        principled.location = Vector((0, 0))
-        texture_coord.location = Vector((-800, 0))
-        mapping.location = Vector((-600, 0))
-        noise_texture.location = Vector((-400, 0))
-        color_ramp.location = Vector((-200, 0))
-        
-        # Link nodes
-        links = material.node_tree.links
-        links.new(texture_coord.outputs['Generated'], mapping.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], noise_texture.inputs['Vector'])
-        links.new(noise_texture.outputs['Fac'], color_ramp.inputs['Fac'])
-        links.new(color_ramp.outputs['Color'], principled.inputs['Base Color'])
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        
-        return material, nodes, color_ramp, noise_texture, mapping
+        # Cached materials were just removed; real bpy raises ReferenceError on them
+        self.builder.cache.clear()
+
+    def create_material(self, name, spec):
+        """Create (or reuse) a material from a node graph spec"""
+        return self.builder.build(name, spec)
 
     def create_clouds(self, name="CloudNoise"):
         """Create cloud-like noise texture"""
-        material, nodes, color_ramp, noise_texture, mapping = self.create_basic_node_setup(name)
-        
-        # Configure noise
-        noise_texture.inputs['Scale'].default_value = 5.0
-        noise_texture.inputs['Detail'].default_value = 8.0
-        noise_texture.inputs['Roughness'].default_value = 0.7
-        
-        # Configure color ramp
-        color_ramp.color_ramp.elements[0].position = 0.3
-        color_ramp.color_ramp.elements[0].color = (0.1, 0.1, 0.1, 1)
-        color_ramp.color_ramp.elements[1].position = 0.7
-        color_ramp.color_ramp.elements[1].color = (1, 1, 1, 1)
-        
-        return material
+        return self.create_material(name, MATERIAL_SPECS['clouds'])
 
     def create_marble(self, name="MarbleNoise"):
         """Create marble-like noise texture"""
-        material, nodes, color_ramp, noise_texture, mapping = self.create_basic_node_setup(name)
-        
-        # Add wave texture for marble effect
-        wave_texture = nodes.new('ShaderNodeTexWave')
-        wave_texture.location = Vector((-400, -200))
-        
-        # Configure wave texture
-        wave_texture.wave_type = 'RINGS'
-        wave_texture.inputs['Scale'].default_value = 2.0
-        wave_texture.inputs['Distortion'].default_value = 2.0
-        wave_texture.inputs['Detail'].default_value = 2.0
-        
-        # Mix noise and wave
-        mix_node = nodes.new('ShaderNodeMixRGB')
-        mix_node.location = Vector((-200, -100))
-        mix_node.blend_type = 'OVERLAY'
-        
-        # Link nodes
-        links = material.node_tree.links
-        links.new(wave_texture.outputs['Color'], mix_node.inputs[1])
-        links.new(noise_texture.outputs['Color'], mix_node.inputs[2])
-        links.new(mix_node.outputs['Color'], color_ramp.inputs['Fac'])
-        
-        return material
+        return self.create_material(name, MATERIAL_SPECS['marble'])
 
     def create_wood(self, name="WoodNoise"):
         """Create wood-like noise texture"""
-        material, nodes, color_ramp, noise_texture, mapping = self.create_basic_node_setup(name)
-        
-        # Configure mapping for wood grain
-        mapping.inputs['Scale'].default_value[0] = 20.0
-        mapping.inputs['Scale'].default_value[1] = 1.0
-        mapping.inputs['Scale'].default_value[2] = 1.0
-        
-        # Configure noise
-        noise_texture.inputs['Scale'].default_value = 15.0
-        noise_texture.inputs['Detail'].default_value = 10.0
-        noise_texture.inputs['Roughness'].default_value = 0.8
-        
-        # Configure color ramp for wood colors
-        color_ramp.color_ramp.elements[0].position = 0.4
-        color_ramp.color_ramp.elements[0].color = (0.4, 0.2, 0.1, 1)
-        color_ramp.color_ramp.elements[1].position = 0.6
-        color_ramp.color_ramp.elements[1].color = (0.6, 0.3, 0.1, 1)
-        
-        return material
+        return self.create_material(name, MATERIAL_SPECS['wood'])
 
     def create_voronoi(self, name="VoronoiNoise"):
         """Create cellular/voronoi noise texture"""
-        material, nodes = self.create_base_material(name)
-        
-        # Create nodes
-        output = nodes.new('ShaderNodeOutputMaterial')
-        principled = nodes.new('ShaderNodeBsdfPrincipled')
-        texture_coord = nodes.new('ShaderNodeTexCoord')
-        mapping = nodes.new('ShaderNodeMapping')
-        voronoi = nodes.new('ShaderNodeTexVoronoi')
-        color_ramp = nodes.new('ShaderNodeValToRGB')
-        
-        # Position nodes
-        output.location = Vector((300, 0))
-        principled.location = Vector((0, 0))
-        texture_coord.location = Vector((-800, 0))
-        mapping.location = Vector((-600, 0))
-        voronoi.location = Vector((-400, 0))
-        color_ramp.location = Vector((-200, 0))
-        
-        # Configure voronoi
-        voronoi.inputs['Scale'].default_value = 10.0
-        voronoi.feature = 'DISTANCE_TO_EDGE'
-        
-        # Link nodes
-        links = material.node_tree.links
-        links.new(texture_coord.outputs['Generated'], mapping.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], voronoi.inputs['Vector'])
-        links.new(voronoi.outputs['Distance'], color_ramp.inputs['Fac'])
-        links.new(color_ramp.outputs['Color'], principled.inputs['Base Color'])
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        
-        return material
+        return self.create_material(name, MATERIAL_SPECS['voronoi'])
 
     def create_musgrave(self, name="MusgraveNoise"):
         """Create Musgrave-type noise texture"""
-        material, nodes = self.create_base_material(name)
-        
-        # Create nodes
-        output = nodes.new('ShaderNodeOutputMaterial')
-        principled = nodes.new('ShaderNodeBsdfPrincipled')
-        texture_coord = nodes.new('ShaderNodeTexCoord')
-        mapping = nodes.new('ShaderNodeMapping')
-        musgrave = nodes.new('ShaderNodeTexMusgrave')
-        color_ramp = nodes.new('ShaderNodeValToRGB')
-        
-        # Position nodes
-        output.location = Vector((300, 0))
-        principled.location = Vector((0, 0))
-        texture_coord.location = Vector((-800, 0))
-        mapping.location = Vector((-600, 0))
-        musgrave.location = Vector((-400, 0))
-        color_ramp.location = Vector((-200, 0))
-        
-        # Configure Musgrave
-        musgrave.musgrave_type = 'FBM'
-        musgrave.inputs['Scale'].default_value = 5.0
-        musgrave.inputs['Detail'].default_value = 8.0
-        musgrave.inputs['Dimension'].default_value = 2.0
-        
-        # Link nodes
-        links = material.node_tree.links
-        links.new(texture_coord.outputs['Generated'], mapping.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], musgrave.inputs['Vector'])
-        links.new(musgrave.outputs['Fac'], color_ramp.inputs['Fac'])
-        links.new(color_ramp.outputs['Color'], principled.inputs['Base Color'])
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        
-        return material
+        return self.create_material(name, MATERIAL_SPECS['musgrave'])
 
     def create_wave(self, name="WaveNoise"):
         """Create wave-based noise texture"""
-        material, nodes = self.create_base_material(name)
-        
-        # Create nodes
-        output = nodes.new('ShaderNodeOutputMaterial')
-        principled = nodes.new('ShaderNodeBsdfPrincipled')
-        texture_coord = nodes.new('ShaderNodeTexCoord')
-        mapping = nodes.new('ShaderNodeMapping')
-        wave = nodes.new('ShaderNodeTexWave')
-        color_ramp = nodes.new('ShaderNodeValToRGB')
-        
-        # Position nodes
-        output.location = Vector((300, 0))
-        principled.location = Vector((0, 0))
-        texture_coord.location = Vector((-800, 0))
-        mapping.location = Vector((-600, 0))
-        wave.location = Vector((-400, 0))
-        color_ramp.location = Vector((-200, 0))
-        
-        # Configure wave
-        wave.wave_type = 'BANDS'
-        wave.bands_direction = 'DIAGONAL'
-        wave.inputs['Scale'].default_value = 5.0
-        wave.inputs['Distortion'].default_value = 2.0
-        wave.inputs['Detail'].default_value = 2.0
-        
-        # Link nodes
-        links = material.node_tree.links
-        links.new(texture_coord.outputs['Generated'], mapping.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], wave.inputs['Vector'])
-        links.new(wave.outputs['Color'], color_ramp.inputs['Fac'])
-        links.new(color_ramp.outputs['Color'], principled.inputs['Base Color'])
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        
-        return material
+        return self.create_material(name, MATERIAL_SPECS['wave'])
 
-    def create_test_scene(self):
-        """Create a test scene with different noise materials"""
-        # Clear existing scene
-        self.clear_scene()
-        
-        # Create a grid of planes
-        spacing = 3
-        for i, noise_type in enumerate(self.noise_types.keys()):
-            row = i // 3
-            col = i % 3
+    def create_baked_material(self, noise_type, resolution=1024, cache_dir='baked_textures'):
+        """
+        Create a material that loads a pre-baked image of a noise type instead of
+        evaluating its procedural nodes at render time. Bakes are cached by graph.
+        """
+        # Imported here: the baker needs PIL, which Blender's bundled Python lacks
+        from material_baker import MaterialBaker
+        baker = MaterialBaker(resolution, resolution)
+        image_path = os.path.abspath(baker.bake_cached(MATERIAL_SPECS[noise_type], cache_dir))
+        return self.create_material(f"{noise_type.capitalize()}Baked", baked_spec(image_path))
+
+    def create_variants(self, noise_type, count, **settings):
+        """
+        Create count variants of one noise type in bulk
+        :param settings: Socket name -> list of count values for the texture node
+        """
+        spec = MATERIAL_SPECS[noise_type]
+        items = []
+        for i in range(count):
+            inputs = {socket: values[i] for socket, values in settings.items()}
+            items.append((f"{noise_type.capitalize()}Noise_{i}", spec_variant(spec, {'texture': inputs})))
+        return self.builder.build_many(items)
+
+    def test_swatches(self, count=None):
+        """(label, material) pairs cycling through the noise types"""
+        names = list(self.noise_types)
+        count = count or len(names)
+        swatches = []
+        for i in range(count):
+            noise_type = names[i % len(names)]
+            material = self.noise_types[noise_type](f"{noise_type.capitalize()}Noise")
+            swatches.append((noise_type.capitalize(), material))
+        return swatches
+
+    def grid_positions(self, count, columns=None, spacing=3):
+        """Swatch centres on a grid, 3 columns for the basic set and square beyond that"""
+        columns = columns or (3 if count <= 9 else math.ceil(math.sqrt(count)))
+        return [((i % columns) * spacing, (i // columns) * spacing) for i in range(count)], columns
+
+    def create_test_scene(self, swatches=None, count=None, columns=None, spacing=3, use_operators=False):
+        """
+        Create a test scene with different noise materials
+        :param swatches: List of (label, material); when not given, existing materials
+                         are cleared and count swatches cycle through the noise types
+        :param count: Number of swatches to create (one per noise type by default)
+        :param columns: Grid columns, chosen from the swatch count by default
+        :param use_operators: Build with bpy.ops like an interactive user; every
+                              operator goes through the context and triggers a
+                              depsgraph update, so this is much slower for large grids.
+                              The data API only pulls ahead with scene size: the
+                              default 6 swatches build about as fast either way
+        """
+        if swatches is None:
+            # Clear existing scene
+            self.clear_scene()
+            swatches = self.test_swatches(count)
+        positions, columns = self.grid_positions(len(swatches), columns, spacing)
+        if use_operators:
+            self.add_swatches_with_operators(swatches, positions)
+        else:
+            self.add_swatches(swatches, positions)
+        
+        # Frame the grid: the 3 x 2 default keeps the original camera placement
+        rows = math.ceil(len(swatches) / columns)
+        extent = max(columns, rows * 1.5) / 3
+        center_x = (columns - 1) * spacing / 2
+        center_y = (rows - 1) * spacing / 2
+        camera_location = (center_x + extent, center_y - 7.5 * extent, 8 * extent)
+        self.add_camera_and_light(camera_location, use_operators)
+
+    def add_swatches(self, swatches, positions):
+        """Add swatches through the data API: one shared plane mesh, objects linked directly"""
+        mesh = bpy.data.meshes.new("SwatchPlane")
+        mesh.from_pydata([(-1, -1, 0), (1, -1, 0), (1, 1, 0), (-1, 1, 0)], [], [(0, 1, 2, 3)])
+        mesh.update()
+        # One data slot, overridden per object so the mesh can stay shared
+        mesh.materials.append(None)
+        
+        objects = bpy.context.scene.collection.objects
+        for (label, material), (x, y) in zip(swatches, positions):
+            plane = bpy.data.objects.new(f"{label}Swatch", mesh)
+            plane.location = (x, y, 0)
+            slot = plane.material_slots[0]
+            slot.link = 'OBJECT'
+            slot.material = material
+            objects.link(plane)
             
+            curve = bpy.data.curves.new(f"{label}Label", type='FONT')
+            curve.body = label
+            curve.align_x = 'CENTER'
+            text = bpy.data.objects.new(f"{label}Label", curve)
+            text.location = (x, y - 1.2, 0)
+            text.scale = (0.2, 0.2, 0.2)
+            objects.link(text)
+
+    def add_swatches_with_operators(self, swatches, positions):
+        """Add swatches with one operator call per plane and per label"""
+        for (label, material), (x, y) in zip(swatches, positions):
             # Create plane
             bpy.ops.mesh.primitive_plane_add(
                 size=2,
-                location=(col * spacing, row * spacing, 0)
+                location=(x, y, 0)
             )
             plane = bpy.context.active_object
-            
-            # Create and assign material
-            material = self.noise_types[noise_type](f"{noise_type.capitalize()}Noise")
             plane.data.materials.append(material)
             
             # Add text label
             bpy.ops.object.text_add(
-                location=(col * spacing, row * spacing - 1.2, 0)
+                location=(x, y - 1.2, 0)
             )
             text = bpy.context.active_object
-            text.data.body = noise_type.capitalize()
+            text.data.body = label
             text.data.align_x = 'CENTER'
             text.scale = (0.2, 0.2, 0.2)
-        
-        # Set up camera
-        bpy.ops.object.camera_add(
-            location=(4, -6, 8),
-            rotation=(0.9, 0, 0.7)
-        )
-        bpy.context.scene.camera = bpy.context.active_object
-        
-        # Add lighting
-        bpy.ops.object.light_add(
-            type='SUN',
-            location=(5, 5, 10),
-            rotation=(0.5, 0.2, 0.3)
-        )
+
+    def add_camera_and_light(self, camera_location, use_operators=False):
+        """Add the scene camera and a sun light"""
+        camera_rotation = (0.9, 0, 0.7)
+        light_location = (5, 5, 10)
+        light_rotation = (0.5, 0.2, 0.3)
+        if use_operators:
+            # Set up camera
+            bpy.ops.object.camera_add(
+                location=camera_location,
+                rotation=camera_rotation
+            )
+            bpy.context.scene.camera = bpy.context.active_object
+            
+            # Add lighting
+            bpy.ops.object.light_add(
+                type='SUN',
+                location=light_location,
+                rotation=light_rotation
+            )
+            return
+        
+        objects = bpy.context.scene.collection.objects
+        camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+        camera.location = camera_location
+        camera.rotation_euler = camera_rotation
+        objects.link(camera)
+        bpy.context.scene.camera = camera
+        
+        sun = bpy.data.objects.new("Sun", bpy.data.lights.new("Sun", type='SUN'))
+        sun.location = light_location
+        sun.rotation_euler = light_rotation
+        objects.link(sun)
+        
+        # Evaluate the new objects once instead of after every addition
+        bpy.context.view_layer.update()
+
+    def clear_objects(self):
+        """Remove every object from the file"""
+        for obj in bpy.data.objects:
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+def benchmark_scene_build(counts=(6, 60, 300), repeats=5):
+    """
+    Time building swatch grids through the data API and through operators
+    :param repeats: Builds per path, alternating between them; the best time is reported
+    """
+    generator = NoiseTextureGenerator()
+    print(f"Scene build benchmark ({bpy.__name__})")
+    for count in counts:
+        timings = {False: float('inf'), True: float('inf')}
+        for _ in range(repeats):
+            for use_operators in (False, True):
+                generator.clear_objects()
+                start = time.perf_counter()
+                generator.create_test_scene(count=count, use_operators=use_operators)
+                timings[use_operators] = min(timings[use_operators], time.perf_counter() - start)
+        print(f"{count} swatches: data API {timings[False]:.4f}s, "
+              f"operators {timings[True]:.4f}s ({timings[True] / timings[False]:.1f}x)")
 
 def main():
+    if bpy.__name__ == 'bpy_stub':
+        # No Blender: compare scene construction paths on the stand-in instead
+        benchmark_scene_build()
+        return
+    
     generator = NoiseTextureGenerator()
     generator.create_test_scene()
     
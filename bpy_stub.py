@@ -0,0 +1,462 @@
+"""
+Headless stand-in for the small part of the bpy API the Blender scripts use.
+It keeps the same shapes (bpy.data collections, node trees with sockets and
+links, colour ramps) in plain Python objects, so material and scene code can
+run, be tested and be profiled outside Blender.
+"""
+
+import os
+
+# Input sockets (name, default) and output socket names of each shader node type
+NODE_SOCKETS = {
+    'ShaderNodeOutputMaterial': (
+        [('Surface', None), ('Volume', None), ('Displacement', (0.0, 0.0, 0.0))], []),
+    'ShaderNodeBsdfPrincipled': (
+        [('Base Color', (0.8, 0.8, 0.8, 1.0)), ('Metallic', 0.0), ('Roughness', 0.5)], ['BSDF']),
+    'ShaderNodeTexCoord': ([], ['Generated', 'Normal', 'UV', 'Object']),
+    'ShaderNodeMapping': (
+        [('Vector', (0.0, 0.0, 0.0)), ('Location', (0.0, 0.0, 0.0)),
+         ('Rotation', (0.0, 0.0, 0.0)), ('Scale', (1.0, 1.0, 1.0))], ['Vector']),
+    'ShaderNodeTexNoise': (
+        [('Vector', (0.0, 0.0, 0.0)), ('Scale', 5.0), ('Detail', 2.0),
+         ('Roughness', 0.5), ('Distortion', 0.0)], ['Fac', 'Color']),
+    'ShaderNodeTexVoronoi': (
+        [('Vector', (0.0, 0.0, 0.0)), ('Scale', 5.0), ('Randomness', 1.0)],
+        ['Distance', 'Color', 'Position']),
+    'ShaderNodeTexWave': (
+        [('Vector', (0.0, 0.0, 0.0)), ('Scale', 5.0), ('Distortion', 0.0),
+         ('Detail', 2.0), ('Detail Scale', 1.0)], ['Color', 'Fac']),
+    'ShaderNodeTexMusgrave': (
+        [('Vector', (0.0, 0.0, 0.0)), ('Scale', 5.0), ('Detail', 2.0),
+         ('Dimension', 2.0), ('Lacunarity', 2.0)], ['Fac']),
+    'ShaderNodeValToRGB': ([('Fac', 0.5)], ['Color', 'Alpha']),
+    'ShaderNodeTexImage': ([('Vector', (0.0, 0.0, 0.0))], ['Color', 'Alpha']),
+    'ShaderNodeMixRGB': (
+        [('Fac', 0.5), ('Color1', (0.5, 0.5, 0.5, 1.0)), ('Color2', (0.5, 0.5, 0.5, 1.0))], ['Color'])
+}
+
+# Enum properties and their defaults per node type
+NODE_PROPERTIES = {
+    'ShaderNodeTexVoronoi': {'feature': 'F1', 'distance': 'EUCLIDEAN'},
+    'ShaderNodeTexWave': {'wave_type': 'BANDS', 'bands_direction': 'X', 'rings_direction': 'X'},
+    'ShaderNodeTexMusgrave': {'musgrave_type': 'FBM'},
+    'ShaderNodeMixRGB': {'blend_type': 'MIX'}
+}
+
+class Socket:
+    def __init__(self, node, name, default_value=None):
+        self.node = node
+        self.name = name
+        self.default_value = default_value
+        self.links = []
+
+    @property
+    def is_linked(self):
+        return bool(self.links)
+
+class SocketCollection:
+    """Sockets addressable by name or by index, like node.inputs"""
+
+    def __init__(self, sockets):
+        self.sockets = sockets
+        self.by_name = {}
+        for socket in sockets:
+            self.by_name.setdefault(socket.name, socket)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self.sockets[key]
+        return self.by_name[key]
+
+    def __iter__(self):
+        return iter(self.sockets)
+
+    def __len__(self):
+        return len(self.sockets)
+
+class ColorRampElement:
+    def __init__(self, position, color):
+        self.position = position
+        self.color = color
+
+class ColorRampElements:
+    def __init__(self):
+        self.items = [ColorRampElement(0.0, (0.0, 0.0, 0.0, 1.0)),
+                      ColorRampElement(1.0, (1.0, 1.0, 1.0, 1.0))]
+
+    def new(self, position):
+        element = ColorRampElement(position, (0.0, 0.0, 0.0, 1.0))
+        self.items.append(element)
+        return element
+
+    def remove(self, element):
+        self.items.remove(element)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+class ColorRamp:
+    def __init__(self):
+        self.elements = ColorRampElements()
+        self.interpolation = 'LINEAR'
+
+class Node:
+    def __init__(self, bl_idname):
+        if bl_idname not in NODE_SOCKETS:
+            raise RuntimeError(f"Node type {bl_idname} undefined")
+        self.bl_idname = bl_idname
+        self.name = bl_idname
+        self.location = (0.0, 0.0)
+        inputs, outputs = NODE_SOCKETS[bl_idname]
+        self.inputs = SocketCollection([Socket(self, name, default) for name, default in inputs])
+        self.outputs = SocketCollection([Socket(self, name) for name in outputs])
+        for prop, value in NODE_PROPERTIES.get(bl_idname, {}).items():
+            setattr(self, prop, value)
+        if bl_idname == 'ShaderNodeValToRGB':
+            self.color_ramp = ColorRamp()
+
+class Link:
+    def __init__(self, from_socket, to_socket):
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.from_node = from_socket.node
+        self.to_node = to_socket.node
+
+class Nodes:
+    def __init__(self, tree):
+        self.tree = tree
+        self.items = []
+
+    def new(self, type):
+        node = Node(type)
+        self.items.append(node)
+        return node
+
+    def remove(self, node):
+        self.tree.links.items = [link for link in self.tree.links.items
+                                 if link.from_node is not node and link.to_node is not node]
+        self.items.remove(node)
+
+    def clear(self):
+        self.items = []
+        self.tree.links.items = []
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+class Links:
+    def __init__(self):
+        self.items = []
+
+    def new(self, from_socket, to_socket):
+        # An input takes a single link, a new one replaces the old
+        for old in to_socket.links:
+            self.items.remove(old)
+            old.from_socket.links.remove(old)
+        link = Link(from_socket, to_socket)
+        from_socket.links.append(link)
+        to_socket.links = [link]
+        self.items.append(link)
+        return link
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+class NodeTree:
+    def __init__(self):
+        self.links = Links()
+        self.nodes = Nodes(self)
+
+class Material:
+    def __init__(self, name):
+        self.name = name
+        self.node_tree = None
+        self._use_nodes = False
+
+    @property
+    def use_nodes(self):
+        return self._use_nodes
+
+    @use_nodes.setter
+    def use_nodes(self, value):
+        # Enabling nodes creates the default Principled BSDF -> Output tree
+        if value and self.node_tree is None:
+            self.node_tree = NodeTree()
+            principled = self.node_tree.nodes.new('ShaderNodeBsdfPrincipled')
+            output = self.node_tree.nodes.new('ShaderNodeOutputMaterial')
+            self.node_tree.links.new(principled.outputs['BSDF'], output.inputs['Surface'])
+        self._use_nodes = value
+
+class Mesh:
+    def __init__(self, name):
+        self.name = name
+        self.vertices = []
+        self.edges = []
+        self.polygons = []
+        self.materials = []
+
+    def from_pydata(self, vertices, edges, faces):
+        self.vertices = [tuple(v) for v in vertices]
+        self.edges = [tuple(e) for e in edges]
+        self.polygons = [tuple(f) for f in faces]
+
+    def update(self):
+        pass
+
+class TextCurve:
+    def __init__(self, name, type='FONT'):
+        self.name = name
+        self.type = type
+        self.body = ''
+        self.align_x = 'LEFT'
+        self.size = 1.0
+
+class Camera:
+    def __init__(self, name):
+        self.name = name
+        self.lens = 50.0
+
+class Light:
+    def __init__(self, name, type='POINT'):
+        self.name = name
+        self.type = type
+        self.energy = 1.0
+
+class MaterialSlot:
+    """Slot of an object: the material comes from the data unless link is 'OBJECT'"""
+
+    def __init__(self, obj, index):
+        self.obj = obj
+        self.index = index
+
+    @property
+    def link(self):
+        return 'OBJECT' if self.index in self.obj.slot_materials else 'DATA'
+
+    @link.setter
+    def link(self, value):
+        if value == 'OBJECT':
+            self.obj.slot_materials.setdefault(self.index, None)
+        else:
+            self.obj.slot_materials.pop(self.index, None)
+
+    @property
+    def material(self):
+        if self.link == 'OBJECT':
+            return self.obj.slot_materials[self.index]
+        return self.obj.data.materials[self.index]
+
+    @material.setter
+    def material(self, value):
+        if self.link == 'OBJECT':
+            self.obj.slot_materials[self.index] = value
+        else:
+            self.obj.data.materials[self.index] = value
+
+class Object:
+    def __init__(self, name, object_data):
+        self.name = name
+        self.data = object_data
+        self.location = (0.0, 0.0, 0.0)
+        self.rotation_euler = (0.0, 0.0, 0.0)
+        self.scale = (1.0, 1.0, 1.0)
+        self.matrix_world = None
+        self.slot_materials = {}
+
+    @property
+    def material_slots(self):
+        count = len(getattr(self.data, 'materials', ()))
+        return [MaterialSlot(self, i) for i in range(count)]
+
+class Texture:
+    def __init__(self, name, type='NONE'):
+        self.name = name
+        self.type = type
+
+class DataCollection:
+    """A bpy.data collection: unique names with Blender's .001 suffixes"""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.items = {}
+
+    def unique_name(self, name):
+        if name not in self.items:
+            return name
+        counter = 1
+        while f"{name}.{counter:03d}" in self.items:
+            counter += 1
+        return f"{name}.{counter:03d}"
+
+    def new(self, name, *args, **kwargs):
+        item = self.factory(self.unique_name(name), *args, **kwargs)
+        self.items[item.name] = item
+        return item
+
+    def remove(self, item, do_unlink=True):
+        if do_unlink and item in context.scene.collection.objects.items:
+            context.scene.collection.objects.unlink(item)
+        del self.items[item.name]
+
+    def get(self, name, default=None):
+        return self.items.get(name, default)
+
+    def __getitem__(self, name):
+        return self.items[name]
+
+    def __contains__(self, name):
+        return name in self.items
+
+    def __iter__(self):
+        # Iterate over a snapshot so removing while iterating works like in Blender
+        return iter(list(self.items.values()))
+
+    def __len__(self):
+        return len(self.items)
+
+class ImageData:
+    def __init__(self, name, filepath=''):
+        self.name = name
+        self.filepath = filepath
+
+class Images(DataCollection):
+    def __init__(self):
+        super().__init__(ImageData)
+
+    def load(self, filepath, check_existing=False):
+        if check_existing:
+            for image in self.items.values():
+                if image.filepath == filepath:
+                    return image
+        return self.new(os.path.basename(filepath), filepath)
+
+class BlendData:
+    def __init__(self):
+        self.materials = DataCollection(Material)
+        self.textures = DataCollection(Texture)
+        self.images = Images()
+        self.meshes = DataCollection(Mesh)
+        self.curves = DataCollection(TextCurve)
+        self.cameras = DataCollection(Camera)
+        self.lights = DataCollection(Light)
+        self.objects = DataCollection(Object)
+
+class CollectionObjects:
+    def __init__(self):
+        self.items = []
+
+    def link(self, obj):
+        self.items.append(obj)
+
+    def unlink(self, obj):
+        self.items.remove(obj)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+class SceneCollection:
+    def __init__(self):
+        self.objects = CollectionObjects()
+
+class RenderSettings:
+    def __init__(self):
+        self.engine = 'BLENDER_EEVEE'
+        self.film_transparent = False
+        self.resolution_x = 1920
+        self.resolution_y = 1080
+
+class Scene:
+    def __init__(self):
+        self.collection = SceneCollection()
+        self.camera = None
+        self.render = RenderSettings()
+
+    @property
+    def objects(self):
+        return list(self.collection.objects)
+
+class ViewLayer:
+    def __init__(self, scene):
+        self.scene = scene
+        self.updates = 0
+
+    def update(self):
+        """Evaluate the scene (depsgraph update): world matrices of every object"""
+        self.updates += 1
+        for obj in self.scene.collection.objects:
+            (x, y, z), (sx, sy, sz) = obj.location, obj.scale
+            obj.matrix_world = ((sx, 0.0, 0.0, x), (0.0, sy, 0.0, y),
+                                (0.0, 0.0, sz, z), (0.0, 0.0, 0.0, 1.0))
+
+class Context:
+    def __init__(self):
+        self.scene = Scene()
+        self.view_layer = ViewLayer(self.scene)
+        self.active_object = None
+
+def _add_object(name, object_data, location=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0)):
+    """
+    What the object add operators do: create data and object, link it, make it
+    active and run a depsgraph update, so each call costs O(objects in scene)
+    """
+    obj = data.objects.new(name, object_data)
+    obj.location = tuple(location)
+    obj.rotation_euler = tuple(rotation)
+    context.scene.collection.objects.link(obj)
+    context.active_object = obj
+    context.view_layer.update()
+    return {'FINISHED'}
+
+class MeshOps:
+    @staticmethod
+    def primitive_plane_add(size=2.0, location=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0)):
+        half = size / 2
+        mesh = data.meshes.new('Plane')
+        mesh.from_pydata([(-half, -half, 0), (half, -half, 0), (half, half, 0), (-half, half, 0)],
+                         [], [(0, 1, 2, 3)])
+        return _add_object('Plane', mesh, location, rotation)
+
+class ObjectOps:
+    @staticmethod
+    def text_add(location=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0)):
+        curve = data.curves.new('Text', type='FONT')
+        curve.body = 'Text'
+        return _add_object('Text', curve, location, rotation)
+
+    @staticmethod
+    def camera_add(location=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0)):
+        return _add_object('Camera', data.cameras.new('Camera'), location, rotation)
+
+    @staticmethod
+    def light_add(type='POINT', location=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0)):
+        return _add_object(type.capitalize(), data.lights.new(type.capitalize(), type=type),
+                           location, rotation)
+
+class Ops:
+    mesh = MeshOps
+    object = ObjectOps
+
+data = BlendData()
+context = Context()
+ops = Ops()
+
+def reset():
+    """Start over with empty data, like opening a new file"""
+    global data, context
+    data = BlendData()
+    context = Context()
@@ -1,5 +1,5 @@
 from animated_art_generator import AnimatedArtGenerator, ColorPalette
-from PIL import Image, ImageDraw, ImageFilter, ImageChops
+from PIL import Image, ImageFilter, ImageChops
 import math
 import numpy as np
 
@@ -9,8 +9,8 @@ class ComplexPatterns(AnimatedArtGenerator):
         
     def create_kaleidoscope_layer(self, frame_num, total_frames, segments=8):
         """Create a kaleidoscope effect"""
-        base = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(base)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         # Create a segment
         segment_angle = 360 / segments
@@ -31,6 +31,7 @@ class ComplexPatterns(AnimatedArtGenerator):
                 draw.line(points[-2:], fill=color, width=2)
         
         # Rotate and copy the segment
+        base = canvas.resolve()
         base_segment = base.crop((self.width/2, 0, self.width, self.height/2))
         for i in range(segments):
             rotated = base_segment.rotate(i * segment_angle)
@@ -42,8 +43,8 @@ class ComplexPatterns(AnimatedArtGenerator):
     
     def create_fractal_layer(self, frame_num, total_frames):
         """Create a fractal spiral effect"""
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         def draw_fractal(x, y, size, angle, depth):
             if depth <= 0 or size < 5:
@@ -74,12 +75,12 @@ class ComplexPatterns(AnimatedArtGenerator):
             angle = start_angle + i * (math.pi/2)
             draw_fractal(center_x, center_y, 100, angle, 6)
         
-        return image
+        return canvas.resolve()
     
     def create_wave_layer(self, frame_num, total_frames):
         """Create an interference wave pattern"""
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         phase = frame_num * (2 * math.pi / total_frames)
         wave_centers = [
@@ -105,7 +106,7 @@ class ComplexPatterns(AnimatedArtGenerator):
                 
                 draw.point((x, y), fill=color)
         
-        return image
+        return canvas.resolve()
     
     def blend_images(self, images, frame_num, total_frames):
         """Blend multiple image layers with different blend modes"""
@@ -114,32 +115,37 @@ class ComplexPatterns(AnimatedArtGenerator):
         
         # Blend subsequent images
         for img in images[1:]:
-            # Create masks for smooth transitions
-            phase = frame_num * (2 * math.pi / total_frames)
-            alpha = int(128 + 64 * math.sin(phase))  # Oscillating opacity
-            
-            # Apply different blend modes
-            screen = ImageChops.screen(result, img)
-            multiply = ImageChops.multiply(result, img)
-            
-            # Blend between different modes based on frame
-            if frame_num % 2 == 0:
-                result = Image.blend(result, screen, alpha/255)
-            else:
-                result = Image.blend(result, multiply, alpha/255)
+            with self.profiler.span('blend'):
+                # Create masks for smooth transitions
+                phase = frame_num * (2 * math.pi / total_frames)
+                alpha = int(128 + 64 * math.sin(phase))  # Oscillating opacity
+                
+                # Apply different blend modes
+                screen = ImageChops.screen(result, img)
+                multiply = ImageChops.multiply(result, img)
+                
+                # Blend between different modes based on frame
+                if frame_num % 2 == 0:
+                    result = Image.blend(result, screen, alpha/255)
+                else:
+                    result = Image.blend(result, multiply, alpha/255)
         
         # Add final glow effect
-        glow = result.filter(ImageFilter.GaussianBlur(3))
-        result = Image.blend(result, glow, 0.3)
+        with self.profiler.span('glow'):
+            glow = result.filter(ImageFilter.GaussianBlur(3))
+            result = Image.blend(result, glow, 0.3)
         
         return result
     
     def create_frame(self, frame_num, total_frames):
         """Create a complex frame combining multiple effects"""
         # Create individual layers
-        kaleidoscope = self.create_kaleidoscope_layer(frame_num, total_frames)
-        fractal = self.create_fractal_layer(frame_num, total_frames)
-        wave = self.create_wave_layer(frame_num, total_frames)
+        with self.profiler.span('kaleidoscope_layer'):
+            kaleidoscope = self.create_kaleidoscope_layer(frame_num, total_frames)
+        with self.profiler.span('fractal_layer'):
+            fractal = self.create_fractal_layer(frame_num, total_frames)
+        with self.profiler.span('wave_layer'):
+            wave = self.create_wave_layer(frame_num, total_frames)
         
         # Blend layers together
         return self.blend_images([kaleidoscope, fractal, wave], 
@@ -1,24 +1,32 @@
-import matplotlib.pyplot as plt
+import sys
+import numpy as np
 import pandas as pd
+from outliers import iqr_fences, find_outliers, scan_csv, plot_fences
 
 # Create a DataFrame with some numerical data (including outliers)
 data = {'A': [80, 83, 81, 92, 95, 96, 87, 108, 97, 98,105,110,120,86,75,140]}
 df = pd.DataFrame(data)
 
-# Create a box plot
-plt.boxplot(df.values, labels=df.columns)
-plt.title('Box Plot with Outliers')
-plt.xlabel('Columns')
-plt.ylabel('Values')
+# Fences and outliers of the whole column
+fences = iqr_fences(df, 'A')
+outliers = find_outliers(df, 'A')
+print(fences)
+print(outliers)
 
-# Highlight potential outliers with red color
-outliers = dict(markerfacecolor='red', markersize=8, marker='o', linestyle='none')
-plt.boxplot(df.values, labels=df.columns, flierprops=outliers)
+# Per-group fences for a larger frame, all groups in one pass
+rng = np.random.default_rng(0)
+groups = pd.DataFrame({'group': rng.choice(list('abcd'), 1_000_000),
+                       'value': rng.normal(100, 15, 1_000_000)})
+group_outliers = find_outliers(groups, 'value', by='group')
+print(iqr_fences(groups, 'value', by='group'))
+print(group_outliers['group'].value_counts())
 
-plt.show()
+# Streaming mode: approximate fences for a CSV read in chunks
+if len(sys.argv) > 2:
+    stream_fences, stream_outliers = scan_csv(sys.argv[1], sys.argv[2],
+                                              by=sys.argv[3] if len(sys.argv) > 3 else None)
+    print(stream_fences)
+    print(f"{len(stream_outliers)} outliers")
 
-df_outlier1 = df[df['Length']> 216].copy()
-print(Counter(df_outlier1['conterfeit']))
-
-df_outlier2 = df[df['Length']> 215.5].copy()
-print(Counter(df_outlier2['conterfeit']))
\ No newline at end of file
+# Box plot from the precomputed fences, outliers highlighted in red
+plot_fences(fences, outliers, value='A')
@@ -1,32 +1,31 @@
 # fit a line to the economic data
-from numpy import sin
-from numpy import sqrt
+import os
+import sys
 from numpy import arange
-from pandas import read_csv
-from scipy.optimize import curve_fit
 from matplotlib import pyplot
+from curve_fitter import PARAMETERS, objective, load_series, multistart_fit
 
-# define the true objective function
-def objective(x, a, b, c, d):
-	return a * sin(b - x) + c * x**2 + d
-
-# load the dataset
-url = 'https://raw.githubusercontent.com/jbrownlee/Datasets/master/longley.csv'
-dataframe = read_csv(url, header=None)
-data = dataframe.values
-# choose the input and output variables
-x, y = data[:, 4], data[:, -1]
-# curve fit
-popt, _ = curve_fit(objective, x, y)
-# summarize the parameter values
-a, b, c, d = popt
-print(popt)
-# plot input vs output
-pyplot.scatter(x, y)
-# define a sequence of inputs between the smallest and largest known inputs
-x_line = arange(min(x), max(x), 1)
-# calculate the output for the range
-y_line = objective(x_line, a, b, c, d)
-# create a line plot for the mapping function
-pyplot.plot(x_line, y_line, '--', color='red')
-pyplot.show()
\ No newline at end of file
+# the process pool re-imports this script on platforms that spawn workers
+if __name__ == '__main__':
+	# load the dataset from a local copy of
+	# https://raw.githubusercontent.com/jbrownlee/Datasets/master/longley.csv
+	# (a CSV file, or a .npy array which is memory-mapped)
+	path = sys.argv[1] if len(sys.argv) > 1 else 'longley.csv'
+	if not os.path.exists(path):
+		sys.exit(f"{path} not found, download the Longley dataset or pass a data file")
+	# choose the input and output variables
+	x, y = load_series(path, x_column=4, y_column=-1)
+	# curve fit from several starting points with the analytic Jacobian
+	popt, sse, fits = multistart_fit(x, y, starts=16)
+	# summarize the parameter values
+	print(dict(zip(PARAMETERS, popt.tolist())), f"sse={sse:.4f} ({len(fits)} starts converged)")
+	a, b, c, d = popt
+	# plot input vs output
+	pyplot.scatter(x, y)
+	# define a sequence of inputs between the smallest and largest known inputs
+	x_line = arange(min(x), max(x), 1)
+	# calculate the output for the range
+	y_line = objective(x_line, a, b, c, d)
+	# create a line plot for the mapping function
+	pyplot.plot(x_line, y_line, '--', color='red')
+	pyplot.show()
@@ -1,35 +1,21 @@
-import matplotlib.pyplot as plt
 import numpy as np
+from fast_plots import render_batch
 
 # Create sample data
 x = np.linspace(0, 10, 100)
 y = np.sin(x)
 
-# Plot the data
-plt.plot(x, y, label='sin(x)')
-plt.title('2D Plot')
-plt.xlabel('x-axis')
-plt.ylabel('y-axis')
-plt.legend()
-plt.show()
-
-import matplotlib.pyplot as plt
-import numpy as np
-from mpl_toolkits.mplot3d import Axes3D
-
 # Create sample 3D data
 theta = np.linspace(0, 10 * np.pi, 100)
-x = np.cos(theta)
-y = np.sin(theta)
-z = theta
 
-# Plot the 3D data
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
-ax.plot(x, y, z, label='3D Spiral')
-ax.set_title('3D Plot')
-ax.set_xlabel('X-axis')
-ax.set_ylabel('Y-axis')
-ax.set_zlabel('Z-axis')
-ax.legend()
-plt.show()
\ No newline at end of file
+# Line charts are decimated before drawing, so the same calls work for
+# series with millions of points
+charts = {
+    'plot_2d': {'kind': 'line', 'title': '2D Plot', 'series': [(x, y, 'sin(x)')],
+                'xlabel': 'x-axis', 'ylabel': 'y-axis'},
+    'plot_3d': {'kind': 'line3d', 'title': '3D Plot', 'x': np.cos(theta), 'y': np.sin(theta), 'z': theta,
+                'label': '3D Spiral', 'xlabel': 'X-axis', 'ylabel': 'Y-axis', 'zlabel': 'Z-axis'}
+}
+
+for filepath in render_batch(charts, 'charts'):
+    print(filepath)
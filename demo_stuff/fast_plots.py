@@ -0,0 +1,210 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Line plots are decimated down to about this many points; a chart a few
+# thousand pixels wide cannot show more
+MAX_POINTS = 4000
+
+def minmax_decimate(x, y, buckets=MAX_POINTS // 2):
+    """
+    Keep the minimum and maximum of every bucket, in their original order.
+    Spikes survive, which plain striding would drop.
+    :param x: Sorted x values (array or memory map)
+    :param y: Values, same length
+    :return: (x, y) with at most 2 * buckets points
+    """
+    n = len(y)
+    if n <= 2 * buckets:
+        return np.asarray(x), np.asarray(y)
+    size = -(-n // buckets)
+    full = n // size * size
+    # Whole buckets are a reshaped view; only the last partial bucket is separate
+    blocks = np.asarray(y[:full]).reshape(-1, size)
+    starts = np.arange(0, full, size)
+    low = starts + blocks.argmin(axis=1)
+    high = starts + blocks.argmax(axis=1)
+    if full < n:
+        tail = np.asarray(y[full:])
+        low = np.append(low, full + tail.argmin())
+        high = np.append(high, full + tail.argmax())
+    indexes = np.column_stack((np.minimum(low, high), np.maximum(low, high))).ravel()
+    return np.asarray(x)[indexes], np.asarray(y)[indexes]
+
+def lttb(x, y, threshold=MAX_POINTS):
+    """
+    Largest-Triangle-Three-Buckets: keep the point of each bucket that forms
+    the largest triangle with the previous pick and the next bucket's mean.
+    Visually closer to the raw line than min/max, at one pick per bucket.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    # Bucket means in one pass; the picks below depend on each other, so only
+    # that part is a loop over buckets
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    picks = np.empty(threshold, dtype=np.intp)
+    picks[0], picks[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        if bucket + 1 < threshold - 2:
+            next_x, next_y = mean_x[bucket + 1], mean_y[bucket + 1]
+        else:
+            next_x, next_y = x[-1], y[-1]
+        px, py = x[previous], y[previous]
+        area = np.abs((px - next_x) * (y[start:stop] - py) - (px - x[start:stop]) * (next_y - py))
+        previous = start + int(area.argmax())
+        picks[bucket + 1] = previous
+    return x[picks], y[picks]
+
+def binned_histogram(data, bins=30, range=None, chunksize=1_000_000):
+    """
+    Histogram counts computed chunk by chunk, so the plot only ever sees the
+    bin counts, never the raw samples
+    :param range: (low, high); found with a first streaming pass when omitted
+    :return: (counts, edges)
+    """
+    if range is None:
+        low, high = np.inf, -np.inf
+        for start in np.arange(0, len(data), chunksize):
+            chunk = np.asarray(data[start:start + chunksize])
+            low, high = min(low, chunk.min()), max(high, chunk.max())
+        range = (low, high)
+    edges = np.histogram_bin_edges([], bins, range)
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    for start in np.arange(0, len(data), chunksize):
+        counts += np.histogram(np.asarray(data[start:start + chunksize]), edges)[0]
+    return counts, edges
+
+class ChartRenderer:
+    """
+    Renders charts straight to image files through the Agg canvas, without
+    pyplot or a display
+    """
+
+    def __init__(self, figsize=(10, 7), dpi=100, decimation='minmax', max_points=MAX_POINTS):
+        self.figsize = figsize
+        self.dpi = dpi
+        self.decimation = decimation
+        self.max_points = max_points
+        self.charts = {
+            'line': self.line,
+            'line3d': self.line3d,
+            'hist': self.hist,
+            'bar': self.bar,
+            'pie': self.pie
+        }
+
+    def decimate(self, x, y):
+        if self.decimation == 'lttb':
+            return lttb(x, y, self.max_points)
+        if self.decimation == 'minmax':
+            return minmax_decimate(x, y, self.max_points // 2)
+        return np.asarray(x), np.asarray(y)
+
+    def line(self, ax, series, xlabel=None, ylabel=None):
+        """:param series: List of (x, y, label) tuples"""
+        for x, y, label in series:
+            ax.plot(*self.decimate(x, y), label=label)
+        ax.set_xlabel(xlabel or '')
+        ax.set_ylabel(ylabel or '')
+        if any(label for _, _, label in series):
+            ax.legend()
+
+    def line3d(self, ax, x, y, z, label=None, xlabel=None, ylabel=None, zlabel=None):
+        # A 3D curve has no single sorted axis, so it is strided down evenly
+        step = max(1, -(-len(x) // self.max_points))
+        ax.plot(np.asarray(x[::step]), np.asarray(y[::step]), np.asarray(z[::step]), label=label)
+        ax.set_xlabel(xlabel or '')
+        ax.set_ylabel(ylabel or '')
+        ax.set_zlabel(zlabel or '')
+        if label:
+            ax.legend()
+
+    def hist(self, ax, counts, edges, xlabel='Values', ylabel='Frequency', **style):
+        """Draw precomputed bin counts (see binned_histogram) as one artist"""
+        ax.stairs(counts, edges, fill=True, **style)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+
+    def bar(self, ax, labels, values):
+        ax.bar(labels, values)
+
+    def pie(self, ax, values, labels):
+        ax.pie(values, labels=labels)
+
+    def render(self, filepath, kind, title=None, **options):
+        """
+        Draw one chart and save it
+        :param kind: One of self.charts
+        :param options: Arguments of the chart method
+        """
+        figure = Figure(figsize=self.figsize, dpi=self.dpi)
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot(111, projection='3d' if kind == 'line3d' else None)
+        self.charts[kind](ax, **options)
+        if title:
+            ax.set_title(title)
+        figure.savefig(filepath)
+        return filepath
+
+def _render_in_worker(args):
+    """Process pool worker rendering one chart"""
+    renderer_options, filepath, spec = args
+    return ChartRenderer(**renderer_options).render(filepath, **spec)
+
+def render_batch(specs, output_dir='charts', workers=0, **renderer_options):
+    """
+    Render a batch of dashboard charts to files
+    :param specs: Dict of chart name -> render() options (kind, title, data)
+    :param workers: Processes to render in, 0 to render in this process
+    :return: List of written file paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(renderer_options, os.path.join(output_dir, f"{name}.png"), spec)
+             for name, spec in specs.items()]
+    if not workers:
+        renderer = ChartRenderer(**renderer_options)
+        return [renderer.render(filepath, **spec) for _, filepath, spec in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_in_worker, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+
+def benchmark(points=5_000_000, output_dir='charts'):
+    """
+    Time a raw line plot of a large series against the decimated ones, and a
+    binned histogram of it
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = np.random.default_rng(0)
+    x = np.arange(points, dtype=np.float64)
+    y = np.cumsum(rng.normal(0, 1, points)) + 50 * (rng.random(points) < 1e-5)
+
+    for decimation in ('none', 'minmax', 'lttb'):
+        renderer = ChartRenderer(decimation=decimation)
+        start = time.perf_counter()
+        renderer.render(os.path.join(output_dir, f"telemetry_{decimation}.png"), 'line',
+                        title=f"{points:,} points ({decimation})", series=[(x, y, 'telemetry')])
+        print(f"line {decimation:>7}: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    counts, edges = binned_histogram(y, bins=100)
+    ChartRenderer().render(os.path.join(output_dir, 'telemetry_hist.png'), 'hist',
+                           counts=counts, edges=edges)
+    print(f"binned hist:  {time.perf_counter() - start:.3f}s")
+
+def main():
+    print("Decimated Chart Rendering")
+    print("=========================")
+    benchmark()
+    print("\nCharts written to the 'charts' directory.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+
+def _group(df, value, by):
+    """Grouped column plus each row's group number (-1 for rows without a group)"""
+    if by is None:
+        return None, np.zeros(len(df), dtype=np.intp)
+    grouped = df.groupby(by, sort=False, observed=True)[value]
+    # ngroup() gives NaN for rows whose key is null, since groupby drops them
+    return grouped, grouped.ngroup().fillna(-1).astype(np.intp).to_numpy()
+
+def iqr_fences(df, value, by=None, k=1.5, quantiles=(0.25, 0.75)):
+    """
+    Tukey fences per group, computed in one vectorized groupby pass
+    :param value: Column to check
+    :param by: Column name(s) to group by, or None for the whole column
+    :param k: Fence distance in IQRs (1.5 for outliers, 3 for extreme values)
+    :param quantiles: Lower and upper quartile levels
+    :return: DataFrame indexed by group with q1, median, q3, iqr, lower and upper
+    """
+    grouped, _ = _group(df, value, by)
+    levels = [quantiles[0], 0.5, quantiles[1]]
+    if grouped is None:
+        fences = df[value].quantile(levels).to_frame().T
+        fences.index = pd.Index(['all'], name='group')
+    else:
+        fences = grouped.quantile(levels).unstack()
+    fences.columns = ['q1', 'median', 'q3']
+    fences['iqr'] = fences['q3'] - fences['q1']
+    fences['lower'] = fences['q1'] - k * fences['iqr']
+    fences['upper'] = fences['q3'] + k * fences['iqr']
+    return fences
+
+def outlier_mask(df, value, by=None, k=1.5, fences=None):
+    """
+    Boolean array marking rows outside their group's fences. Fences are
+    looked up by group number, so the frame is never copied or merged.
+    """
+    grouped, codes = _group(df, value, by)
+    if fences is None:
+        fences = iqr_fences(df, value, by, k)
+    elif by is not None:
+        # Align given fences to this frame's group numbering
+        keys = grouped.size().index
+        fences = fences.reindex(keys)
+    grouped_rows = codes >= 0
+    # Rows without a group (code -1) pick up the last group's fences here,
+    # and are then cleared by grouped_rows
+    lower = fences['lower'].to_numpy()[codes]
+    upper = fences['upper'].to_numpy()[codes]
+    values = df[value].to_numpy()
+    return grouped_rows & ((values < lower) | (values > upper))
+
+def find_outliers(df, value, by=None, k=1.5):
+    """Rows of df outside the Tukey fences of their group (a view selection, not a copy of df)"""
+    return df[outlier_mask(df, value, by, k)]
+
+class TDigest:
+    """
+    Mergeable approximate quantile sketch (t-digest with the k1 scale function).
+    Values are buffered and merged into centroids in vectorized batches; the
+    number of centroids stays around `compression`, whatever the input size.
+    """
+
+    def __init__(self, compression=200, buffer_size=50000):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.buffer = []
+        self.buffered = 0
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """Add an array of values"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.buffer.append(values)
+        self.buffered += len(values)
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        if self.buffered >= self.buffer_size:
+            self.compress()
+
+    def merge(self, other):
+        """Fold another digest into this one"""
+        other.compress()
+        self.means = np.concatenate((self.means, other.means))
+        self.weights = np.concatenate((self.weights, other.weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress(force=True)
+
+    def compress(self, force=False):
+        """Merge buffered values and centroids so each cluster spans at most one k-unit"""
+        if not self.buffer and not force:
+            return
+        means = np.concatenate([self.means] + self.buffer)
+        weights = np.concatenate([self.weights] + [np.ones(len(b)) for b in self.buffer])
+        self.buffer = []
+        self.buffered = 0
+        if not len(means):
+            return
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        # Cluster by the scale function at each point's left cumulative edge
+        total = weights.sum()
+        left = (np.cumsum(weights) - weights) / total
+        scale = self.compression / (2 * np.pi) * np.arcsin(2 * left - 1)
+        cluster = np.floor(scale - scale[0]).astype(np.intp)
+        cluster = np.unique(cluster, return_inverse=True)[1]
+        merged_weights = np.bincount(cluster, weights)
+        self.means = np.bincount(cluster, weights * means) / merged_weights
+        self.weights = merged_weights
+
+    def quantile(self, q):
+        """Approximate quantile(s) q in [0, 1]"""
+        self.compress()
+        if not len(self.means):
+            return np.full(np.shape(q), np.nan)
+        # Centroid centres sit at the middle of their cumulative weight
+        centres = (np.cumsum(self.weights) - self.weights / 2) / self.count
+        positions = np.concatenate(([0.0], centres, [1.0]))
+        values = np.concatenate(([self.min], self.means, [self.max]))
+        return np.interp(q, positions, values)
+
+class StreamingOutlierDetector:
+    """
+    Outlier fences for data that does not fit in memory. A first pass feeds
+    chunks into one TDigest per group; fences() then turns the approximate
+    quartiles into the same table iqr_fences returns, for flagging chunks in
+    a second pass.
+    """
+
+    def __init__(self, value, by=None, k=1.5, compression=200):
+        self.value = value
+        self.by = by
+        self.k = k
+        self.compression = compression
+        self.digests = {}
+
+    def update(self, chunk):
+        """Add a DataFrame chunk"""
+        if self.by is None:
+            groups = [('all', chunk[self.value])]
+        else:
+            groups = chunk.groupby(self.by, sort=False, observed=True)[self.value]
+        for key, values in groups:
+            if key not in self.digests:
+                self.digests[key] = TDigest(self.compression)
+            self.digests[key].update(values.to_numpy())
+
+    def fences(self):
+        """Approximate fences per group as a DataFrame like iqr_fences"""
+        keys = list(self.digests)
+        quartiles = np.array([self.digests[key].quantile([0.25, 0.5, 0.75]) for key in keys])
+        if self.by is None or isinstance(self.by, str):
+            index = pd.Index(keys, name=self.by or 'group')
+        else:
+            index = pd.MultiIndex.from_tuples(keys, names=self.by)
+        fences = pd.DataFrame(quartiles, index=index, columns=['q1', 'median', 'q3'])
+        fences['iqr'] = fences['q3'] - fences['q1']
+        fences['lower'] = fences['q1'] - self.k * fences['iqr']
+        fences['upper'] = fences['q3'] + self.k * fences['iqr']
+        return fences
+
+    def flag(self, chunk, fences=None):
+        """Outlier mask for a chunk against the streamed fences"""
+        fences = self.fences() if fences is None else fences
+        return outlier_mask(chunk, self.value, self.by, self.k, fences)
+
+def scan_csv(path, value, by=None, k=1.5, chunksize=1_000_000, compression=200):
+    """
+    Find outliers in a CSV file that may not fit in memory, in two chunked passes
+    :return: (fences, DataFrame of outlier rows)
+    """
+    columns = [value] + ([] if by is None else [by] if isinstance(by, str) else list(by))
+    detector = StreamingOutlierDetector(value, by, k, compression)
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+        detector.update(chunk)
+    fences = detector.fences()
+    found = [chunk[detector.flag(chunk, fences)]
+             for chunk in pd.read_csv(path, chunksize=chunksize)]
+    return fences, pd.concat(found) if found else pd.DataFrame()
+
+def plot_fences(fences, outliers=None, value=None, by=None, filepath=None):
+    """
+    Draw box plots from precomputed fences (no raw data needed), with the
+    outlier rows as red points. Needs matplotlib, imported only when plotting.
+    :param filepath: Save to this file (headless) instead of showing the plot
+    """
+    import matplotlib
+    if filepath:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    stats = []
+    for key, row in fences.iterrows():
+        fliers = []
+        if outliers is not None and len(outliers):
+            rows = outliers if by is None else outliers[outliers[by] == key]
+            fliers = rows[value].to_numpy()
+        stats.append({'label': str(key), 'q1': row['q1'], 'med': row['median'], 'q3': row['q3'],
+                      'whislo': row['lower'], 'whishi': row['upper'], 'fliers': fliers})
+    fig, ax = plt.subplots()
+    ax.bxp(stats, flierprops=dict(markerfacecolor='red', markersize=8, marker='o', linestyle='none'))
+    ax.set_title('Box Plot with Outliers')
+    ax.set_xlabel(by or 'Columns')
+    ax.set_ylabel(value or 'Values')
+    if filepath:
+        fig.savefig(filepath)
+        plt.close(fig)
+    else:
+        plt.show()
+    return filepath
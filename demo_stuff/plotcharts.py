@@ -1,58 +1,21 @@
-import matplotlib.pyplot as plt
-
 import numpy as np
- 
-# Generate random data for the histogram
+from fast_plots import binned_histogram, render_batch
 
+# Generate random data for the histogram
 data = np.random.randn(1000)
- 
-# Plotting a basic histogram
-
-plt.hist(data, bins=30, color='skyblue', edgecolor='black')
- 
-# Adding labels and title
-
-plt.xlabel('Values')
-
-plt.ylabel('Frequency')
-
-plt.title('Basic Histogram')
- 
-# Display the plot
-plt.show()
-
-
-
-import matplotlib.pyplot as plt
-fig = plt.figure()
-ax = fig.add_axes([0,0,1,1])
-langs = ['C', 'C++', 'Java', 'Python', 'PHP']
-students = [23,17,35,29,12]
-ax.bar(langs,students)
-
-plt.show()
-
-# Import libraries
-
-from matplotlib import pyplot as plt
-
-import numpy as np
- 
- 
-# Creating dataset
-
-cars = ['AUDI', 'BMW', 'FORD',
-
-        'TESLA', 'JAGUAR', 'MERCEDES']
- 
-
-data = [23, 17, 35, 29, 12, 41]
- 
-# Creating plot
-
-fig = plt.figure(figsize =(10, 7))
 
-plt.pie(data, labels = cars)
- 
-# show plot
-plt.show()
\ No newline at end of file
+# Bin the data up front; the chart only draws the counts
+counts, edges = binned_histogram(data, bins=30)
+
+# Describe every chart, then render them all headlessly to files
+charts = {
+    'histogram': {'kind': 'hist', 'title': 'Basic Histogram', 'counts': counts, 'edges': edges,
+                  'xlabel': 'Values', 'ylabel': 'Frequency', 'color': 'skyblue', 'edgecolor': 'black'},
+    'languages': {'kind': 'bar', 'labels': ['C', 'C++', 'Java', 'Python', 'PHP'],
+                  'values': [23, 17, 35, 29, 12]},
+    'cars': {'kind': 'pie', 'labels': ['AUDI', 'BMW', 'FORD', 'TESLA', 'JAGUAR', 'MERCEDES'],
+             'values': [23, 17, 35, 29, 12, 41]}
+}
+
+for filepath in render_batch(charts, 'charts'):
+    print(filepath)
@@ -26,4 +26,12 @@ accuracy = accuracy_score(y_test, y_pred)
 print(f'Accuracy: {accuracy:.2f}')
 
 # Display classification report
-print('\nClassification Report:\n', classification_report(y_test, y_pred))
\ No newline at end of file
+print('\nClassification Report:\n', classification_report(y_test, y_pred))
+
+# The same model trained in mini-batches with SGDClassifier.partial_fit, as
+# streaming_classifier.py does for datasets too large to load at once
+from streaming_classifier import StreamingClassifier, report
+
+streaming = StreamingClassifier(chunksize=30, epochs=20).fit((X_train, y_train))
+print('\nStreaming (mini-batch SGD):')
+report(streaming.evaluate((X_test, y_test)), streaming.classes)
@@ -0,0 +1,231 @@
+import os
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+def open_source(source):
+    """
+    Open training data without reading it into memory
+    :param source: (X, y) arrays or memory maps; a .npy file of shape
+                   (rows, features + 1) with the label in the last column,
+                   opened as a memory map; or a CSV file without header, label last
+    :return: (X, y) for arrays, the CSV path otherwise
+    """
+    if isinstance(source, tuple):
+        return source
+    if source.endswith('.npy'):
+        data = np.load(source, mmap_mode='r')
+        return data[:, :-1], data[:, -1]
+    return source
+
+def iter_chunks(source, chunksize=100_000, shuffle=False, rng=None):
+    """
+    Yield (X, y) float/int chunks from a source (see open_source)
+    :param shuffle: Visit array chunks in random order and shuffle rows within
+                    each chunk; CSV files are always read front to back
+    """
+    data = open_source(source)
+    if isinstance(data, str):
+        for frame in pd.read_csv(data, header=None, chunksize=chunksize):
+            values = frame.to_numpy(dtype=np.float64)
+            yield values[:, :-1], values[:, -1].astype(np.int64)
+        return
+    X, y = data
+    starts = np.arange(0, len(y), chunksize)
+    if shuffle:
+        rng = rng or np.random.default_rng()
+        starts = rng.permutation(starts)
+    for start in starts:
+        X_chunk = np.asarray(X[start:start + chunksize], dtype=np.float64)
+        y_chunk = np.asarray(y[start:start + chunksize]).astype(np.int64)
+        if shuffle:
+            order = rng.permutation(len(y_chunk))
+            X_chunk, y_chunk = X_chunk[order], y_chunk[order]
+        yield X_chunk, y_chunk
+
+def bounded_map(function, items, workers):
+    """
+    Like ThreadPoolExecutor.map, but keeps at most 2 * workers items in
+    flight, so chunks read from disk are not all held at once
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(function, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+class StreamingClassifier:
+    """
+    Linear classifier trained chunk by chunk with SGDClassifier.partial_fit.
+    One pass fits a StandardScaler and collects the classes, then every epoch
+    streams the scaled chunks through partial_fit, so memory use is bounded
+    by the chunk size, not the dataset.
+    """
+
+    def __init__(self, chunksize=100_000, epochs=3, seed=0, **sgd_options):
+        self.chunksize = chunksize
+        self.epochs = epochs
+        self.seed = seed
+        # n_jobs runs the one-vs-rest binary fits of each partial_fit in parallel
+        options = {'loss': 'log_loss', 'alpha': 1e-5, 'random_state': seed, 'n_jobs': -1}
+        options.update(sgd_options)
+        self.model = SGDClassifier(**options)
+        self.scaler = StandardScaler()
+        self.classes = None
+
+    def fit(self, source):
+        """Train on a source (see open_source)"""
+        classes = set()
+        for X, y in iter_chunks(source, self.chunksize):
+            self.scaler.partial_fit(X)
+            classes.update(np.unique(y).tolist())
+        self.classes = np.array(sorted(classes))
+
+        rng = np.random.default_rng(self.seed)
+        for epoch in range(self.epochs):
+            for X, y in iter_chunks(source, self.chunksize, shuffle=True, rng=rng):
+                self.model.partial_fit(self.scaler.transform(X), y, classes=self.classes)
+        return self
+
+    def predict(self, X):
+        return self.model.predict(self.scaler.transform(np.asarray(X, dtype=np.float64)))
+
+    def confusion(self, chunk):
+        """Confusion matrix counts of one (X, y) chunk"""
+        X, y = chunk
+        k = len(self.classes)
+        truth = np.searchsorted(self.classes, y)
+        predicted = np.searchsorted(self.classes, self.predict(X))
+        return np.bincount(truth * k + predicted, minlength=k * k).reshape(k, k)
+
+    def evaluate(self, source, workers=4):
+        """
+        Score a source in parallel, chunk by chunk
+        :return: Summed confusion matrix (rows are true classes)
+        """
+        chunks = iter_chunks(source, self.chunksize)
+        return sum(bounded_map(self.confusion, chunks, workers))
+
+    def save(self, filepath):
+        """Persist the fitted scaler and model"""
+        partial = filepath + '.partial'
+        joblib.dump({'scaler': self.scaler, 'model': self.model, 'classes': self.classes,
+                     'chunksize': self.chunksize}, partial)
+        os.replace(partial, filepath)
+        return filepath
+
+    @classmethod
+    def load(cls, filepath):
+        """Reload a classifier saved with save()"""
+        state = joblib.load(filepath)
+        classifier = cls(chunksize=state['chunksize'])
+        classifier.scaler = state['scaler']
+        classifier.model = state['model']
+        classifier.classes = state['classes']
+        return classifier
+
+def report(confusion, classes):
+    """Print accuracy and per-class precision, recall and F1 from a confusion matrix"""
+    correct = np.diag(confusion).astype(np.float64)
+    support = confusion.sum(axis=1)
+    precision = correct / np.maximum(confusion.sum(axis=0), 1)
+    recall = correct / np.maximum(support, 1)
+    f1 = 2 * precision * recall / np.maximum(precision + recall, 1e-12)
+    print(f"Accuracy: {correct.sum() / confusion.sum():.4f}")
+    print(f"{'class':>8} {'precision':>10} {'recall':>8} {'f1':>8} {'support':>10}")
+    for label, p, r, f, s in zip(classes, precision, recall, f1, support):
+        print(f"{label:>8} {p:>10.3f} {r:>8.3f} {f:>8.3f} {s:>10}")
+    return correct.sum() / confusion.sum()
+
+def make_dataset(filepath, rows, features=20, classes=3, chunksize=500_000, seed=0, sample_seed=None):
+    """
+    Write a synthetic Gaussian-blob dataset to a .npy memory map chunk by
+    chunk (label in the last column), so it never has to fit in memory
+    :param seed: Seed of the class centres and feature scales
+    :param sample_seed: Seed of the rows; give train and test sets different ones
+    """
+    problem = np.random.default_rng(seed)
+    centres = problem.normal(0, 1, (classes, features))
+    scales = problem.uniform(1, 100, features)  # Uneven feature scales, as raw telemetry has
+    rng = np.random.default_rng(seed if sample_seed is None else sample_seed)
+    data = np.lib.format.open_memmap(filepath, mode='w+', dtype=np.float32, shape=(rows, features + 1))
+    for start in range(0, rows, chunksize):
+        count = min(chunksize, rows - start)
+        labels = rng.integers(0, classes, count)
+        data[start:start + count, :-1] = (centres[labels] + rng.normal(0, 1.5, (count, features))) * scales
+        data[start:start + count, -1] = labels
+    data.flush()
+    del data
+    return filepath
+
+def benchmark(sizes=(100_000, 1_000_000, 4_000_000), features=20, workdir='classifier_data'):
+    """
+    Compare full-batch LogisticRegression on data loaded into memory with the
+    streaming classifier on the memory-mapped file: training time, held-out
+    accuracy and peak traced memory
+    """
+    os.makedirs(workdir, exist_ok=True)
+    print(f"{'rows':>9} {'path':>10} {'train':>9} {'accuracy':>9} {'peak MiB':>9}")
+    results = []
+    for rows in sizes:
+        train = make_dataset(os.path.join(workdir, f"train_{rows}.npy"), rows, features)
+        test = make_dataset(os.path.join(workdir, f"test_{rows}.npy"), max(rows // 10, 10_000),
+                            features, sample_seed=1)
+
+        for name in ('full', 'streaming'):
+            tracemalloc.start()
+            start = time.perf_counter()
+            if name == 'full':
+                data = np.load(train)
+                scaler = StandardScaler().fit(data[:, :-1])
+                model = LogisticRegression(max_iter=200).fit(scaler.transform(data[:, :-1]), data[:, -1])
+                del data
+                classifier = StreamingClassifier()
+                classifier.scaler, classifier.model = scaler, model
+                classifier.classes = model.classes_.astype(np.int64)
+            else:
+                classifier = StreamingClassifier().fit(train)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+
+            confusion = classifier.evaluate(test)
+            accuracy = np.trace(confusion) / confusion.sum()
+            print(f"{rows:>9} {name:>10} {elapsed:>8.2f}s {accuracy:>9.4f} {peak:>9.1f}")
+            results.append({'rows': rows, 'path': name, 'seconds': elapsed,
+                            'accuracy': accuracy, 'peak_mib': peak})
+        os.remove(train)
+        os.remove(test)
+    return results
+
+def main():
+    print("Streaming Classifier")
+    print("====================")
+    workdir = 'classifier_data'
+    os.makedirs(workdir, exist_ok=True)
+    data = make_dataset(os.path.join(workdir, 'demo.npy'), 1_000_000)
+    # Held-out rows from the same distribution, never seen in training
+    test = make_dataset(os.path.join(workdir, 'demo_test.npy'), 100_000, sample_seed=1)
+    classifier = StreamingClassifier().fit(data)
+    model_path = classifier.save(os.path.join(workdir, 'streaming_classifier.joblib'))
+
+    start = time.perf_counter()
+    reloaded = StreamingClassifier.load(model_path)
+    print(f"Reloaded {model_path} in {(time.perf_counter() - start) * 1e3:.1f} ms")
+    print("Held-out test set:")
+    report(reloaded.evaluate(test), reloaded.classes)
+
+    print("\nFull batch vs streaming")
+    benchmark(workdir=workdir)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,119 @@
 import cv2
+import hashlib
+import json
 import os
+import shutil
+import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 from PIL import Image
+from video_transitions import TransitionEngine, TRANSITION_TYPES
+
+class RepeatFrameWriter:
+    """Constant frame rate writer that repeats a frame for its whole hold duration"""
+
+    def __init__(self, output_file, fps, size):
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.out = cv2.VideoWriter(str(output_file), fourcc, fps, size)
+
+    def write(self, frame, count=1):
+        """Write a frame that stays on screen for count frame intervals"""
+        for _ in range(count):
+            self.out.write(frame)
+
+    def release(self):
+        self.out.release()
+
+class ConcatFrameWriter:
+    """
+    Variable frame rate writer: every frame is stored once together with its
+    display time and the video is muxed by the ffmpeg concat demuxer
+    """
+
+    def __init__(self, output_file, fps, size):
+        self.ffmpeg = shutil.which('ffmpeg')
+        if self.ffmpeg is None:
+            raise RuntimeError("Hold mode 'concat' needs ffmpeg on the PATH")
+        self.output_file = str(output_file)
+        self.fps = fps
+        self.temp_dir = tempfile.TemporaryDirectory(prefix='frames_')
+        self.entries = []
+
+    def write(self, frame, count=1):
+        """Store a frame once with a display time of count frame intervals"""
+        frame_path = os.path.join(self.temp_dir.name, f"frame_{len(self.entries):06d}.png")
+        cv2.imwrite(frame_path, frame, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        self.entries.append((frame_path, count / self.fps))
+
+    def release(self):
+        """Mux the stored frames into the output video"""
+        if self.temp_dir is None:
+            return
+        try:
+            if self.entries:
+                list_path = os.path.join(self.temp_dir.name, 'frames.ffconcat')
+                with open(list_path, 'w') as f:
+                    f.write("ffconcat version 1.0\n")
+                    for frame_path, duration in self.entries:
+                        f.write(f"file '{frame_path}'\nduration {duration:.6f}\n")
+                    # The concat demuxer ignores the duration of the last entry
+                    f.write(f"file '{self.entries[-1][0]}'\n")
+                subprocess.run([
+                    self.ffmpeg, '-y', '-loglevel', 'error',
+                    '-f', 'concat', '-safe', '0', '-i', list_path,
+                    '-fps_mode', 'vfr',
+                    '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                    '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+                    self.output_file
+                ], check=True)
+        finally:
+            self.temp_dir.cleanup()
+            self.temp_dir = None
+
+FRAME_WRITERS = {
+    'repeat': RepeatFrameWriter,
+    'concat': ConcatFrameWriter
+}
+
+def concat_videos(video_files, output_file, work_dir):
+    """
+    Join videos end to end. Uses a stream copy through the ffmpeg concat
+    demuxer when available and falls back to re-encoding with OpenCV.
+    """
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is not None:
+        list_path = os.path.join(work_dir, 'segments.ffconcat')
+        with open(list_path, 'w') as f:
+            f.write("ffconcat version 1.0\n")
+            for video_file in video_files:
+                f.write(f"file '{Path(video_file).resolve()}'\n")
+        subprocess.run([
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'concat', '-safe', '0', '-i', list_path,
+            '-c', 'copy', str(output_file)
+        ], check=True)
+        return
+
+    print("ffmpeg not found, re-encoding cached segments with OpenCV")
+    out = None
+    try:
+        for video_file in video_files:
+            cap = cv2.VideoCapture(str(video_file))
+            if out is None:
+                size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                out = RepeatFrameWriter(output_file, cap.get(cv2.CAP_PROP_FPS), size)
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                out.write(frame)
+            cap.release()
+    finally:
+        if out:
+            out.release()
 
 class ImageVideoConverter:
     def __init__(self, image_folder, output_file='output_video.mp4', fps=30):
@@ -19,13 +130,22 @@ class ImageVideoConverter:
         # Supported image formats
         self.image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
 
+    def scan_images(self):
+        """Scan the folder once, returning sorted (path, mtime_ns, size) for every image"""
+        entries = []
+        with os.scandir(self.image_folder) as it:
+            for entry in it:
+                if os.path.splitext(entry.name)[1].lower() not in self.image_extensions:
+                    continue
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                entries.append((Path(entry.path), stat.st_mtime_ns, stat.st_size))
+        return sorted(entries)
+
     def get_image_files(self):
         """Get all image files from the folder"""
-        image_files = []
-        for ext in self.image_extensions:
-            image_files.extend(list(self.image_folder.glob(f'*{ext}')))
-            image_files.extend(list(self.image_folder.glob(f'*{ext.upper()}')))
-        return sorted(image_files)
+        return [path for path, _, _ in self.scan_images()]
 
     def get_image_size(self, image_path):
         """Get the size of an image using PIL"""
@@ -36,14 +156,102 @@ class ImageVideoConverter:
         """Resize image to target size"""
         return cv2.resize(image, target_size, interpolation=cv2.INTER_AREA)
 
-    def create_video(self, target_size=None, transition_frames=10):
+    def get_reduced_read_flag(self, image_size, target_size):
+        """Pick the smallest IMREAD_REDUCED_* decode that still covers target_size"""
+        for factor, flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                             (4, cv2.IMREAD_REDUCED_COLOR_4),
+                             (2, cv2.IMREAD_REDUCED_COLOR_2)):
+            if image_size[0] // factor >= target_size[0] and image_size[1] // factor >= target_size[1]:
+                return flag
+        return cv2.IMREAD_COLOR
+
+    def load_frame(self, image_path, target_size, thumbnail_dir=None):
+        """
+        Read and resize a single image, returns None if it cannot be read
+        :param thumbnail_dir: Enables draft mode: frames come from a persistent thumbnail
+                              cache, and misses use a reduced-resolution decode
+        """
+        if thumbnail_dir is None:
+            image = cv2.imread(str(image_path))
+            if image is None:
+                return None
+            return self.resize_image(image, target_size)
+
+        stat = os.stat(image_path)
+        settings = [Path(image_path).name, stat.st_mtime_ns, stat.st_size, list(target_size)]
+        key = hashlib.sha1(json.dumps(settings).encode()).hexdigest()
+        thumbnail_path = Path(thumbnail_dir) / f"{key}.jpg"
+        if thumbnail_path.exists():
+            frame = cv2.imread(str(thumbnail_path))
+            if frame is not None:
+                return frame
+
+        # The header read is cheap, JPEGs are then decoded straight at 1/2, 1/4 or 1/8 scale
+        try:
+            flag = self.get_reduced_read_flag(self.get_image_size(image_path), target_size)
+        except OSError:
+            flag = cv2.IMREAD_COLOR
+        image = cv2.imread(str(image_path), flag)
+        if image is None:
+            return None
+        frame = self.resize_image(image, target_size)
+        cv2.imwrite(str(thumbnail_path), frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        return frame
+
+    def iter_frames(self, image_files, target_size, workers=None, lookahead=8, thumbnail_dir=None):
+        """
+        Decode and resize images on a worker pool, yielding frames in order
+        :param image_files: Image paths in the order they should be yielded
+        :param target_size: Target size for the frames (width, height)
+        :param workers: Number of decode threads (defaults to the CPU count)
+        :param lookahead: Maximum number of images decoded ahead of the writer
+        :param thumbnail_dir: Thumbnail cache folder, enables draft decoding
+        """
+        workers = workers or os.cpu_count() or 1
+        lookahead = max(1, lookahead)
+        # OpenCV releases the GIL while decoding and resizing, so threads scale
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            files = iter(image_files)
+            for image_path in files:
+                pending.append((image_path, pool.submit(self.load_frame, image_path, target_size, thumbnail_dir)))
+                if len(pending) >= lookahead:
+                    break
+            while pending:
+                image_path, future = pending.popleft()
+                next_path = next(files, None)
+                if next_path is not None:
+                    pending.append((next_path, pool.submit(self.load_frame, next_path, target_size, thumbnail_dir)))
+                yield image_path, future.result()
+
+    def get_hold_frames(self, image_path, hold_durations=None, default_hold=1.0):
+        """Get the number of frame intervals an image stays on screen"""
+        seconds = default_hold
+        if hold_durations:
+            seconds = hold_durations.get(image_path.name, default_hold)
+        return max(1, round(seconds * self.fps))
+
+    def create_video(self, target_size=None, transition_frames=10, workers=None, lookahead=8,
+                     hold_mode='repeat', hold_durations=None, default_hold=1.0,
+                     transition='crossfade', incremental=False, cache_dir=None, draft=False):
         """
         Create video from images with smooth transitions
         :param target_size: Target size for the video (width, height)
         :param transition_frames: Number of frames for transitions
+        :param workers: Number of threads decoding and resizing images ahead of the writer
+        :param lookahead: Maximum number of decoded images held in memory
+        :param hold_mode: 'repeat' writes a still image once per frame of its hold,
+                          'concat' encodes it once with a duration (needs ffmpeg)
+        :param hold_durations: Optional dict of image file name -> hold time in seconds
+        :param default_hold: Hold time in seconds for images not in hold_durations
+        :param transition: Transition type: 'crossfade', 'wipe', 'slide', 'zoom' or 'kenburns'
+        :param incremental: Reuse cached per-image segments and only encode new or changed images
+        :param cache_dir: Cache folder for segments and thumbnails (default: .video_cache in the image folder)
+        :param draft: Preview proxy mode: reduced-resolution decoding and a persistent thumbnail cache
         """
         # Get image files
-        image_files = self.get_image_files()
+        entries = self.scan_images()
+        image_files = [path for path, _, _ in entries]
         if not image_files:
             print("No image files found!")
             return False
@@ -57,38 +265,52 @@ class ImageVideoConverter:
             print(f"Using size from first image: {target_size}")
 
         # Create video writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(self.output_file, fourcc, self.fps, target_size)
+        if hold_mode not in FRAME_WRITERS:
+            print(f"Unknown hold mode: {hold_mode}")
+            return False
+        if transition not in TRANSITION_TYPES:
+            print(f"Unknown transition: {transition}")
+            return False
+        transitions = TransitionEngine(target_size, transition_frames, transition)
+        thumbnail_dir = None
+        if draft:
+            thumbnail_dir = self.get_cache_dir(cache_dir) / 'thumbs'
+            thumbnail_dir.mkdir(parents=True, exist_ok=True)
+            print(f"Draft mode, thumbnail cache: {thumbnail_dir}")
+
+        if incremental:
+            try:
+                return self.build_incremental(entries, target_size, transitions, workers, lookahead,
+                                              hold_mode, hold_durations, default_hold, cache_dir,
+                                              thumbnail_dir)
+            except Exception as e:
+                print(f"Error creating video: {str(e)}")
+                return False
+
+        out = None
 
         try:
+            out = FRAME_WRITERS[hold_mode](self.output_file, self.fps, target_size)
+            total_seconds = 0.0
             prev_frame = None
-            for i, image_path in enumerate(image_files):
+            frames = self.iter_frames(image_files, target_size, workers, lookahead, thumbnail_dir)
+            for i, (image_path, current_frame) in enumerate(frames):
                 print(f"Processing image {i+1}/{len(image_files)}: {image_path.name}")
 
-                # Read and resize current image
-                current_image = cv2.imread(str(image_path))
-                if current_image is None:
+                # Frames are decoded and resized ahead of time by the worker pool
+                if current_frame is None:
                     print(f"Error reading image: {image_path}")
                     continue
 
-                current_frame = self.resize_image(current_image, target_size)
-
                 # If this is not the first image, create transition
                 if prev_frame is not None:
-                    for t in range(transition_frames):
-                        # Calculate alpha for smooth transition
-                        alpha = t / transition_frames
-                        # Create transition frame
-                        transition_frame = cv2.addWeighted(
-                            prev_frame, 1 - alpha,
-                            current_frame, alpha,
-                            0
-                        )
+                    for transition_frame in transitions.render(prev_frame, current_frame):
                         out.write(transition_frame)
 
-                # Write the current frame multiple times for duration
-                for _ in range(self.fps):  # Show each image for 1 second
-                    out.write(current_frame)
+                # Hold the current frame for its duration
+                hold_frames = self.get_hold_frames(image_path, hold_durations, default_hold)
+                out.write(current_frame, hold_frames)
+                total_seconds += hold_frames / self.fps
 
                 prev_frame = current_frame
 
@@ -98,7 +320,8 @@ class ImageVideoConverter:
             print(f"Video properties:")
             print(f"- Resolution: {target_size}")
             print(f"- FPS: {self.fps}")
-            print(f"- Duration: ~{len(image_files)} seconds (not including transitions)")
+            print(f"- Hold mode: {hold_mode}")
+            print(f"- Duration: ~{total_seconds:.1f} seconds (not including transitions)")
             return True
 
         except Exception as e:
@@ -107,6 +330,144 @@ class ImageVideoConverter:
                 out.release()
             return False
 
+    def get_cache_dir(self, cache_dir=None):
+        """Get the folder for cached segments and thumbnails"""
+        return Path(cache_dir) if cache_dir else self.image_folder / '.video_cache'
+
+    def segment_key(self, prev_entry, entry, target_size, transitions, hold_frames, hold_mode, draft=False):
+        """Hash everything that affects the frames of one image segment"""
+        def identity(e):
+            return None if e is None else [e[0].name, e[1], e[2]]
+        settings = [
+            identity(prev_entry), identity(entry), list(target_size), self.fps,
+            transitions.kind, transitions.steps, hold_frames, hold_mode, draft
+        ]
+        return hashlib.sha1(json.dumps(settings).encode()).hexdigest()
+
+    def load_manifest(self, manifest_path):
+        """Load the incremental build manifest, or an empty one"""
+        try:
+            with open(manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'files': {}, 'unreadable': {}, 'segments': []}
+
+    def save_manifest(self, manifest_path, manifest):
+        """Atomically replace the manifest"""
+        temp_path = f"{manifest_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(temp_path, manifest_path)
+
+    def build_incremental(self, entries, target_size, transitions, workers, lookahead,
+                          hold_mode, hold_durations, default_hold, cache_dir=None, thumbnail_dir=None):
+        """
+        Build the video from cached per-image segments.
+        A segment holds the transition into an image plus its hold and is keyed
+        by both images' mtimes and the render settings, so only segments touched
+        by new or changed images are encoded. Segments are renamed into place
+        when complete, which lets an interrupted build resume where it stopped.
+        """
+        cache_dir = self.get_cache_dir(cache_dir)
+        segment_dir = cache_dir / 'segments'
+        segment_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = cache_dir / 'manifest.json'
+        manifest = self.load_manifest(manifest_path)
+
+        files = {path.name: [mtime, size] for path, mtime, size in entries}
+        changed = [name for name, stamp in files.items() if manifest['files'].get(name) != stamp]
+        removed = [name for name in manifest['files'] if name not in files]
+        print(f"Incremental build: {len(changed)} new or changed, {len(removed)} removed images")
+
+        encoded = 0
+        while True:
+            # Images already known to be unreadable are left out of the segment chain
+            readable = [e for e in entries if manifest['unreadable'].get(e[0].name) != [e[1], e[2]]]
+            plan = []
+            for i, entry in enumerate(readable):
+                prev_entry = readable[i - 1] if i > 0 else None
+                hold_frames = self.get_hold_frames(entry[0], hold_durations, default_hold)
+                key = self.segment_key(prev_entry, entry, target_size, transitions, hold_frames, hold_mode,
+                                       thumbnail_dir is not None)
+                plan.append((key, hold_frames))
+
+            dirty = [i for i, (key, _) in enumerate(plan) if not (segment_dir / f"{key}.mp4").exists()]
+            print(f"{len(plan) - len(dirty)} cached segments, {len(dirty)} to encode")
+
+            written, bad_entry = self.encode_segments(readable, plan, dirty, segment_dir, target_size,
+                                                      transitions, workers, lookahead, hold_mode,
+                                                      thumbnail_dir)
+            # Passes cut short by an unreadable image still wrote segments before it
+            encoded += written
+            if bad_entry is None:
+                break
+            # The neighbouring segment has to be rebuilt without the unreadable image
+            print(f"Error reading image: {bad_entry[0]}")
+            manifest['unreadable'][bad_entry[0].name] = [bad_entry[1], bad_entry[2]]
+
+        # Drop segments that are no longer part of the video
+        used = {key for key, _ in plan}
+        for segment_path in segment_dir.glob('*.mp4'):
+            if segment_path.stem not in used:
+                segment_path.unlink()
+
+        manifest['files'] = files
+        manifest['unreadable'] = {name: stamp for name, stamp in manifest['unreadable'].items()
+                                  if files.get(name) == stamp}
+        manifest['segments'] = [key for key, _ in plan]
+        self.save_manifest(manifest_path, manifest)
+
+        if not plan:
+            print("No readable images found!")
+            return False
+
+        concat_videos([segment_dir / f"{key}.mp4" for key, _ in plan], self.output_file, cache_dir)
+        total_seconds = sum(hold_frames for _, hold_frames in plan) / self.fps
+        print(f"\nVideo created successfully: {self.output_file}")
+        print(f"Video properties:")
+        print(f"- Resolution: {target_size}")
+        print(f"- FPS: {self.fps}")
+        print(f"- Hold mode: {hold_mode}")
+        print(f"- Segments encoded: {encoded} ({len(plan)} in video)")
+        print(f"- Duration: ~{total_seconds:.1f} seconds (not including transitions)")
+        return True
+
+    def encode_segments(self, entries, plan, dirty, segment_dir, target_size, transitions,
+                        workers, lookahead, hold_mode, thumbnail_dir=None):
+        """
+        Encode the dirty segments of a build plan.
+        Returns (segments written, entry of the first unreadable image or None when all were written).
+        """
+        dirty_set = set(dirty)
+        # A segment also needs the previous image for its transition
+        needed = sorted(dirty_set | {i - 1 for i in dirty if i > 0})
+        frames = self.iter_frames([entries[i][0] for i in needed], target_size, workers, lookahead,
+                                  thumbnail_dir)
+        prev_frame = None
+        written = 0
+        try:
+            for i, (image_path, frame) in zip(needed, frames):
+                if frame is None:
+                    return written, entries[i]
+                if i in dirty_set:
+                    key, hold_frames = plan[i]
+                    print(f"Encoding segment {i+1}/{len(plan)}: {image_path.name}")
+                    partial_path = segment_dir / f"{key}.partial.mp4"
+                    out = FRAME_WRITERS[hold_mode](partial_path, self.fps, target_size)
+                    try:
+                        if i > 0:
+                            for transition_frame in transitions.render(prev_frame, frame):
+                                out.write(transition_frame)
+                        out.write(frame, hold_frames)
+                    finally:
+                        out.release()
+                    os.replace(partial_path, segment_dir / f"{key}.mp4")
+                    written += 1
+                prev_frame = frame
+        finally:
+            frames.close()
+        return written, None
+
 def main():
     # Get current directory
     current_dir = Path.cwd()
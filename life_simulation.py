@@ -197,35 +197,44 @@ class LifeSimulation(AnimatedArtGenerator):
     
     def create_frame(self, frame_num: int, total_frames: int):
         """Create a frame of the life simulation"""
-        # Create base image with alpha channel
-        image = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
+        # Opaque black base: the alpha of the fills was never shown, and when
+        # supersampled, edge pixels must average against black to come out
+        # partially covered (an RGBA reduce keeps their full colour)
+        canvas = self.new_canvas('RGB', 'black')
+        draw = canvas.draw
         
         # Update and draw particles
         for particle in self.particles[:]:
-            self.update_particle(particle)
-            self.draw_particle(draw, particle, frame_num)
+            with self.profiler.span('update_particle'):
+                self.update_particle(particle)
+            with self.profiler.span('draw_particle'):
+                self.draw_particle(draw, particle, frame_num)
             
             # Remove old particles
             if particle.age > self.max_age or particle.energy <= 0:
                 self.particles.remove(particle)
         
         # Add new particles if population is low
-        while len(self.particles) < self.num_particles // 2:
-            self.initialize_particles()
+        with self.profiler.span('respawn'):
+            while len(self.particles) < self.num_particles // 2:
+                self.initialize_particles()
         
         # Apply post-processing effects
+        with self.profiler.span('resolve'):
+            image = canvas.resolve()
         # Add bloom
-        bloom = image.filter(ImageFilter.GaussianBlur(3))
-        image = Image.blend(image, bloom, 0.3)
+        with self.profiler.span('bloom'):
+            bloom = image.filter(ImageFilter.GaussianBlur(3))
+            image = Image.blend(image, bloom, 0.3)
         
         # Add subtle color aberration
-        r, g, b, a = image.split()
-        r = ImageChops.offset(r, 2, 0)
-        b = ImageChops.offset(b, -2, 0)
-        image = Image.merge('RGBA', (r, g, b, a))
+        with self.profiler.span('aberration'):
+            r, g, b = image.split()
+            r = ImageChops.offset(r, 2, 0)
+            b = ImageChops.offset(b, -2, 0)
+            image = Image.merge('RGB', (r, g, b))
         
-        return image.convert('RGB')
+        return image
 
 def main():
     print("Life Simulation Generator")
@@ -0,0 +1,94 @@
+import numpy as np
+from turtle_engine import TurtleProgram
+
+# Drawing conventions: F and G draw forward, f moves without drawing,
+# + turns right, - turns left and | turns around. Other symbols only
+# take part in rewriting.
+PRESETS = {
+    'koch': {'axiom': 'F++F++F', 'rules': {'F': 'F-F++F-F'}, 'angle': 60},
+    'hilbert': {'axiom': 'A', 'rules': {'A': '+BF-AFA-FB+', 'B': '-AF+BFB+FA-'}, 'angle': 90},
+    'dragon': {'axiom': 'FX', 'rules': {'X': 'X+YF+', 'Y': '-FX-Y'}, 'angle': 90},
+    'sierpinski': {'axiom': 'F-G-G', 'rules': {'F': 'F-G+F+G-F', 'G': 'GG'}, 'angle': 120}
+}
+
+class LSystem:
+    """
+    Lindenmayer system that expands iteratively and compiles to turtle steps.
+    Every depth that has been expanded is memoized, so asking for a deeper
+    curve continues from the deepest expansion already computed.
+    """
+
+    def __init__(self, axiom, rules, angle, draw_symbols='FG', move_symbols='f'):
+        """
+        Initialize the L-system
+        :param axiom: Starting string
+        :param rules: Dict of symbol -> replacement string
+        :param angle: Turn angle in degrees for + and -
+        :param draw_symbols: Symbols that move forward drawing a line
+        :param move_symbols: Symbols that move forward without drawing
+        """
+        if '[' in axiom or any('[' in r for r in rules.values()):
+            raise ValueError("Branching L-systems ([ and ]) are not supported")
+        self.axiom = axiom
+        self.rules = rules
+        self.angle = angle
+        self.table = str.maketrans(rules)
+        self.expansions = {0: axiom}
+        self.compiled = {}
+
+        # Per-symbol lookup tables used to compile expanded strings
+        self.turn_table = np.zeros(256)
+        self.turn_table[ord('+')] = angle
+        self.turn_table[ord('-')] = -angle
+        self.turn_table[ord('|')] = 180
+        self.step_table = np.zeros(256, dtype=np.uint8)
+        for symbol in draw_symbols:
+            self.step_table[ord(symbol)] = 1
+        for symbol in move_symbols:
+            self.step_table[ord(symbol)] = 2
+
+    @classmethod
+    def preset(cls, name):
+        """Create one of the PRESETS curves"""
+        if name not in PRESETS:
+            raise ValueError(f"Unknown L-system '{name}', choose from {', '.join(PRESETS)}")
+        return cls(**PRESETS[name])
+
+    def expand(self, depth):
+        """Get the string after depth rewrites"""
+        if depth not in self.expansions:
+            known = max(d for d in self.expansions if d < depth)
+            result = self.expansions[known]
+            for d in range(known + 1, depth + 1):
+                # str.translate rewrites every symbol in one C-level pass
+                result = result.translate(self.table)
+                self.expansions[d] = result
+        return self.expansions[depth]
+
+    def compile(self, depth):
+        """
+        Compile the expansion into compact step arrays
+        :return: (turns, pen, trailing_turn) where turns[i] is the turn before step i
+                 and pen[i] tells whether step i draws
+        """
+        if depth in self.compiled:
+            return self.compiled[depth]
+        codes = np.frombuffer(self.expand(depth).encode('ascii'), dtype=np.uint8)
+        kinds = self.step_table[codes]
+        steps = np.flatnonzero(kinds)
+        # Turns only sit between steps, so the turn before a step is the
+        # difference of the running turn total at consecutive steps
+        total = np.cumsum(self.turn_table[codes])
+        at_steps = total[steps]
+        turns = np.diff(at_steps, prepend=0.0)
+        trailing_turn = (total[-1] if len(total) else 0.0) - (at_steps[-1] if len(steps) else 0.0)
+        self.compiled[depth] = (turns, kinds[steps] == 1, trailing_turn)
+        return self.compiled[depth]
+
+    def program(self, depth, step=1.0, colors=None):
+        """Build a TurtleProgram drawing the curve at the given depth"""
+        turns, pen, trailing_turn = self.compile(depth)
+        program = TurtleProgram()
+        program.add_steps(np.full(len(turns), float(step)), turns, colors, pen)
+        program.right(trailing_turn)
+        return program
@@ -0,0 +1,249 @@
+import os
+import time
+import numpy as np
+from PIL import Image
+from bpy_stub import NODE_SOCKETS, NODE_PROPERTIES
+from node_graph import MATERIAL_SPECS, spec_hash
+from noise_texture_generator import perlin3, fbm3, cellular3
+
+# Cycles' weights for turning a colour into a float socket value
+LUMINANCE = np.array([0.2126, 0.7152, 0.0722])
+
+def as_float(value):
+    """Convert a socket value (float or (n, 3) colour/vector array) to floats"""
+    return value @ LUMINANCE if np.ndim(value) == 2 else value
+
+def as_color(value, count):
+    """Convert a socket value to an (n, 3) array"""
+    value = np.asarray(value, dtype=np.float64)
+    if value.ndim == 2:
+        return value
+    if value.ndim == 1 and len(value) in (3, 4) and count not in (3, 4):
+        # A constant colour or vector default value
+        return np.broadcast_to(value[:3], (count, 3))
+    return np.repeat(np.broadcast_to(value, (count,))[:, None], 3, axis=1)
+
+def linear_to_srgb(color):
+    """Encode linear colour for an 8-bit image, which Blender reads as sRGB"""
+    color = np.clip(color, 0.0, 1.0)
+    return np.where(color <= 0.0031308, color * 12.92, 1.055 * color ** (1 / 2.4) - 0.055)
+
+class MaterialBaker:
+    """
+    Evaluates material node graph specs on the CPU with NumPy and bakes the
+    base colour to an image. Every node is evaluated once for all pixels of
+    the image, following links back from the material output.
+    """
+
+    def __init__(self, width=512, height=512, seed=0):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.evaluators = {
+            'ShaderNodeOutputMaterial': self.eval_output,
+            'ShaderNodeBsdfPrincipled': self.eval_principled,
+            'ShaderNodeTexCoord': self.eval_tex_coord,
+            'ShaderNodeMapping': self.eval_mapping,
+            'ShaderNodeTexNoise': self.eval_noise,
+            'ShaderNodeTexVoronoi': self.eval_voronoi,
+            'ShaderNodeTexWave': self.eval_wave,
+            'ShaderNodeTexMusgrave': self.eval_musgrave,
+            'ShaderNodeValToRGB': self.eval_color_ramp,
+            'ShaderNodeMixRGB': self.eval_mix
+        }
+
+    def generated_coords(self):
+        """Generated coordinates of a flat plane: x and y across [0, 1], z at 0.5"""
+        u = (np.arange(self.width) + 0.5) / self.width
+        v = 1 - (np.arange(self.height) + 0.5) / self.height  # Image rows run top down
+        x, y = np.meshgrid(u, v)
+        return np.stack((x.ravel(), y.ravel(), np.full(x.size, 0.5)), axis=1)
+
+    def bake(self, spec):
+        """Evaluate the spec's base colour as an (height, width, 3) linear float array"""
+        self.spec = spec
+        self.count = self.width * self.height
+        self.links = {(to_node, to_socket): (from_node, from_socket)
+                      for from_node, from_socket, to_node, to_socket in spec['links']}
+        self.results = {}
+        output = next(key for key, node in spec['nodes'].items()
+                      if node['type'] == 'ShaderNodeOutputMaterial')
+        color = as_color(self.output(output, None), self.count)
+        return color.reshape(self.height, self.width, 3)
+
+    def bake_image(self, spec):
+        """Bake the spec to an 8-bit sRGB PIL image"""
+        return Image.fromarray(np.rint(linear_to_srgb(self.bake(spec)) * 255).astype(np.uint8))
+
+    def bake_cached(self, spec, cache_dir='baked_textures'):
+        """
+        Bake to a PNG named after the graph hash and resolution, reusing an
+        earlier bake of an identical graph
+        :return: Path of the baked image
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        key = spec_hash({'spec': spec, 'size': (self.width, self.height), 'seed': self.seed})
+        filepath = os.path.join(cache_dir, f"{key}.png")
+        if not os.path.exists(filepath):
+            partial = filepath + '.partial.png'
+            self.bake_image(spec).save(partial)
+            os.replace(partial, filepath)
+        return filepath
+
+    def output(self, node, socket):
+        """Evaluate a node once and return one of its outputs"""
+        if node not in self.results:
+            settings = self.spec['nodes'][node]
+            evaluator = self.evaluators.get(settings['type'])
+            if evaluator is None:
+                raise ValueError(f"Cannot evaluate node type {settings['type']}")
+            self.results[node] = evaluator(node, settings)
+        outputs = self.results[node]
+        if socket is None:
+            return next(iter(outputs.values()))
+        if isinstance(socket, int):
+            return list(outputs.values())[socket]
+        return outputs[socket]
+
+    def input(self, node, socket):
+        """Value of an input: the linked output, else the spec's or the type's default"""
+        settings = self.spec['nodes'][node]
+        sockets = NODE_SOCKETS[settings['type']][0]
+        # Specs may address a socket by name or by index
+        index = socket if isinstance(socket, int) else [name for name, _ in sockets].index(socket)
+        keys = (sockets[index][0], index)
+        for key in keys:
+            if (node, key) in self.links:
+                return self.output(*self.links[(node, key)])
+        for key in keys:
+            if key in settings.get('inputs', {}):
+                return settings['inputs'][key]
+        return sockets[index][1]
+
+    def property(self, settings, name):
+        return settings.get('properties', {}).get(name, NODE_PROPERTIES[settings['type']][name])
+
+    def vector(self, node):
+        """Texture vector input times the Scale input, Generated coordinates when unlinked"""
+        if (node, 'Vector') in self.links:
+            vector = as_color(self.input(node, 'Vector'), self.count)
+        else:
+            vector = self.generated_coords()
+        scale = as_float(self.input(node, 'Scale'))
+        return vector * (scale[:, None] if np.ndim(scale) else scale)
+
+    def eval_output(self, node, settings):
+        return {'Surface': self.input(node, 'Surface')}
+
+    def eval_principled(self, node, settings):
+        # The bake captures the albedo; lighting is left to the renderer
+        return {'BSDF': as_color(self.input(node, 'Base Color'), self.count)}
+
+    def eval_tex_coord(self, node, settings):
+        return {'Generated': self.generated_coords()}
+
+    def eval_mapping(self, node, settings):
+        # Point mapping: scale, then rotate (XYZ Euler), then translate
+        vector = as_color(self.input(node, 'Vector'), self.count) * np.asarray(self.input(node, 'Scale'))
+        rx, ry, rz = self.input(node, 'Rotation')
+        if rx or ry or rz:
+            cx, sx, cy, sy, cz, sz = np.cos(rx), np.sin(rx), np.cos(ry), np.sin(ry), np.cos(rz), np.sin(rz)
+            rotation = (np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]]) @
+                        np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]]) @
+                        np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]]))
+            vector = vector @ rotation.T
+        return {'Vector': vector + np.asarray(self.input(node, 'Location'))}
+
+    def eval_noise(self, node, settings):
+        p = self.vector(node)
+        x, y, z = p.T
+        detail = float(self.input(node, 'Detail'))
+        roughness = float(self.input(node, 'Roughness'))
+        distortion = float(self.input(node, 'Distortion'))
+        if distortion:
+            x, y, z = (c + perlin3(x + offset, y + offset, z + offset, self.seed) * distortion
+                       for c, offset in ((x, 13.5), (y, 27.1), (z, 41.3)))
+        fac = fbm3(x, y, z, detail, roughness, seed=self.seed)
+        # Colour channels sample the same noise at offset positions
+        color = np.stack([fac] + [fbm3(x + offset, y + offset, z + offset, detail, roughness, seed=self.seed)
+                                  for offset in (97.3, 181.7)], axis=1)
+        return {'Fac': fac, 'Color': color}
+
+    def eval_voronoi(self, node, settings):
+        p = self.vector(node)
+        distance, edge, color = cellular3(*p.T, float(self.input(node, 'Randomness')), self.seed)
+        feature = self.property(settings, 'feature')
+        if feature == 'DISTANCE_TO_EDGE':
+            distance = edge
+        elif feature != 'F1':
+            raise ValueError(f"Voronoi feature {feature} is not supported")
+        return {'Distance': distance, 'Color': np.stack(color, axis=1), 'Position': p}
+
+    def eval_wave(self, node, settings):
+        p = self.vector(node)
+        x, y, z = p.T
+        if self.property(settings, 'wave_type') == 'RINGS':
+            axes = {'X': (y, z), 'Y': (x, z), 'Z': (x, y), 'SPHERICAL': (x, y, z)}
+            n = np.sqrt(sum(c * c for c in axes[self.property(settings, 'rings_direction')])) * 20
+        else:
+            direction = self.property(settings, 'bands_direction')
+            n = {'X': x * 20, 'Y': y * 20, 'Z': z * 20, 'DIAGONAL': (x + y + z) * 10}[direction]
+        distortion = float(self.input(node, 'Distortion'))
+        if distortion:
+            detail_scale = float(self.input(node, 'Detail Scale'))
+            noise = fbm3(x * detail_scale, y * detail_scale, z * detail_scale,
+                         float(self.input(node, 'Detail')), seed=self.seed)
+            n = n + distortion * (noise * 2 - 1)
+        fac = 0.5 + 0.5 * np.sin(n - np.pi / 2)
+        return {'Color': as_color(fac, self.count), 'Fac': fac}
+
+    def eval_musgrave(self, node, settings):
+        p = self.vector(node)
+        if self.property(settings, 'musgrave_type') != 'FBM':
+            raise ValueError("Only FBM Musgrave textures are supported")
+        lacunarity = float(self.input(node, 'Lacunarity'))
+        gain = lacunarity ** -float(self.input(node, 'Dimension'))
+        # Musgrave fBm is unnormalized and signed like Blender's
+        fac = fbm3(*p.T, max(float(self.input(node, 'Detail')) - 1, 0), gain, lacunarity,
+                   self.seed, normalize=False)
+        return {'Fac': fac}
+
+    def eval_color_ramp(self, node, settings):
+        fac = np.asarray(as_float(self.input(node, 'Fac')), dtype=np.float64)
+        stops = sorted(settings.get('ramp', [(0.0, (0, 0, 0, 1)), (1.0, (1, 1, 1, 1))]))
+        positions = [position for position, _ in stops]
+        channels = [np.interp(fac, positions, [color[c] for _, color in stops]) for c in range(4)]
+        return {'Color': np.stack(channels[:3], axis=1), 'Alpha': channels[3]}
+
+    def eval_mix(self, node, settings):
+        fac = np.asarray(as_float(self.input(node, 'Fac')))
+        if np.ndim(fac):
+            fac = fac[:, None]
+        color1 = as_color(self.input(node, 1), self.count)
+        color2 = as_color(self.input(node, 2), self.count)
+        blend = self.property(settings, 'blend_type')
+        if blend == 'MIX':
+            result = color1 * (1 - fac) + color2 * fac
+        elif blend == 'MULTIPLY':
+            result = color1 * (1 - fac + fac * color2)
+        elif blend == 'ADD':
+            result = color1 + fac * color2
+        elif blend == 'OVERLAY':
+            low = color1 * (1 - fac + 2 * fac * color2)
+            high = 1 - (1 - fac + 2 * fac * (1 - color2)) * (1 - color1)
+            result = np.where(color1 < 0.5, low, high)
+        else:
+            raise ValueError(f"Mix blend type {blend} is not supported")
+        return {'Color': result}
+
+def main():
+    baker = MaterialBaker(512, 512)
+    print("Material Baker")
+    print("==============")
+    for name, spec in MATERIAL_SPECS.items():
+        start = time.perf_counter()
+        filepath = baker.bake_cached(spec)
+        print(f"{name}: {filepath} ({time.perf_counter() - start:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,395 @@
 import os
+import errno
+import json
 import shutil
+import time
+import argparse
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def move_files_to_folder(source_dir, new_folder_name):
+# Files to exclude (compared lowercase)
+EXCLUDED_FILES = {
+    'requirements.txt',
+    'readme.md',
+    'move_files.py'  # Exclude this script itself
+}
+
+# Journal written into the destination folder by bulk moves
+JOURNAL_NAME = '.move_journal.jsonl'
+
+def scan_files(source_path, excluded_files=EXCLUDED_FILES):
+    """List the files to move with a single os.scandir pass"""
+    with os.scandir(source_path) as entries:
+        return [entry for entry in entries
+                if entry.is_file() and entry.name.lower() not in excluded_files]
+
+def resolve_target_names(names, existing):
+    """
+    Pick a free target name for every source name, entirely in memory.
+    Conflicts get a _1, _2, ... suffix like the per-file mode, but the next
+    counter is remembered per name so each collision costs O(1).
+    :param names: Source file names in move order
+    :param existing: Names already present in the target folder
+    :return: List of target names, one per source name
+    """
+    taken = set(existing)
+    counters = {}
+    targets = []
+    for name in names:
+        target = name
+        if target in taken:
+            base, suffix = os.path.splitext(name)
+            counter = counters.get(name, 1)
+            while target in taken:
+                target = f"{base}_{counter}{suffix}"
+                counter += 1
+            counters[name] = counter
+        taken.add(target)
+        targets.append(target)
+    return targets
+
+class MoveProgress:
+    """Prints moved counts and throughput at most every `interval` seconds"""
+
+    def __init__(self, total, interval=1.0, label='Moved'):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.done = 0
+        self.bytes = 0
+        self.start = time.perf_counter()
+        self.last_report = self.start
+
+    def update(self, count=1, size=0):
+        self.done += count
+        self.bytes += size
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report(now)
+
+    def report(self, now=None):
+        elapsed = max((now or time.perf_counter()) - self.start, 1e-9)
+        print(f"{self.label} {self.done}/{self.total} files "
+              f"({self.done / elapsed:.0f} files/s, {self.bytes / elapsed / 2**20:.1f} MiB/s)")
+
+def plan_moves(source_dir, target_dir, excluded_files=EXCLUDED_FILES):
+    """
+    Compute the full move plan up front from one listing of each folder.
+    Every file in a directory lives on that directory's filesystem, so one
+    stat of each folder decides between rename and copy for the whole plan.
+    :param target_dir: Destination folder, which does not have to exist yet
+    :return: Plan dict with source, target, same_device and a list of
+             (source_name, target_name) moves
+    """
+    source_dir = os.path.abspath(source_dir)
+    target_dir = os.path.abspath(target_dir)
+    names = [entry.name for entry in scan_files(source_dir, excluded_files)]
+    if os.path.isdir(target_dir):
+        with os.scandir(target_dir) as existing:
+            existing_names = {entry.name for entry in existing}
+        target_device = os.stat(target_dir).st_dev
+    else:
+        existing_names = set()
+        target_device = os.stat(os.path.dirname(target_dir)).st_dev
+    # execute_plan creates the journal after this listing, so its name is
+    # reserved up front; a source file with that name must not overwrite it
+    existing_names.add(JOURNAL_NAME)
+    targets = resolve_target_names(names, existing_names)
+    return {
+        'source': source_dir,
+        'target': target_dir,
+        'same_device': os.stat(source_dir).st_dev == target_device,
+        'moves': list(zip(names, targets))
+    }
+
+def print_plan(plan, limit=10):
+    """Summarize a move plan without touching any files"""
+    moves = plan['moves']
+    renamed = sum(1 for source, target in moves if source != target)
+    print(f"Plan: {len(moves)} files from {plan['source']} to {plan['target']}")
+    print(f"Method: {'rename' if plan['same_device'] else 'copy across filesystems'}")
+    print(f"Name conflicts resolved: {renamed}")
+    for source, target in moves[:limit]:
+        print(f"  {source} -> {target}")
+    if len(moves) > limit:
+        print(f"  ... and {len(moves) - limit} more")
+
+class MoveJournal:
+    """
+    Append-only JSON lines journal of a bulk move.
+    The whole plan is written before anything moves, then the indexes of each
+    committed batch are appended and synced, so an interrupted run can be
+    resumed or rolled back from the journal alone.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = None
+
+    def __enter__(self):
+        torn = False
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b'\n'
+        self.file = open(self.path, 'a', encoding='utf-8')
+        # Start on a fresh line if a crash left a torn record at the end
+        if torn:
+            self.file.write('\n')
+        return self
+
+    def __exit__(self, *exc):
+        self.file.close()
+        self.file = None
+
+    def append(self, record):
+        self.file.write(json.dumps(record) + '\n')
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def write_plan(self, plan):
+        """Record the plan header and every planned move"""
+        self.append({'event': 'plan', 'source': plan['source'], 'target': plan['target'],
+                     'same_device': plan['same_device'], 'count': len(plan['moves']),
+                     'created': datetime.now().isoformat()})
+        for source, target in plan['moves']:
+            self.append({'event': 'move', 'source': source, 'target': target})
+        self.sync()
+
+    def commit(self, event, indexes):
+        """Record that the moves at indexes were done ('done') or reverted ('undone')"""
+        if indexes:
+            self.append({'event': event, 'indexes': indexes})
+            self.sync()
+
+    def mark(self, event):
+        self.append({'event': event, 'time': datetime.now().isoformat()})
+        self.sync()
+
+    def load(self):
+        """
+        Replay the journal
+        :return: (plan, done) where done is the set of move indexes currently applied
+        """
+        plan = None
+        done = set()
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a torn record; later appends start on a new line
+                    continue
+                event = record['event']
+                if event == 'plan':
+                    plan = {'source': record['source'], 'target': record['target'],
+                            'same_device': record['same_device'], 'moves': []}
+                elif event == 'move':
+                    plan['moves'].append((record['source'], record['target']))
+                elif event == 'done':
+                    done.update(record['indexes'])
+                elif event == 'undone':
+                    done.difference_update(record['indexes'])
+        if plan is None:
+            raise ValueError(f"No move plan found in {self.path}")
+        return plan, done
+
+def _rename_no_replace(source, target):
+    """
+    Rename within a filesystem, failing with FileExistsError instead of
+    replacing a file that appeared at the target after planning. A hard link
+    cannot replace an existing name, so link then unlink is atomic about it;
+    filesystems without hard links fall back to a check right before rename.
+    """
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        raise
+    except OSError as e:
+        if e.errno == errno.EXDEV:
+            raise
+        if os.path.lexists(target):
+            raise FileExistsError(errno.EEXIST, "Destination already exists", target)
+        os.rename(source, target)
+    else:
+        os.unlink(source)
+
+def _copy_move(source, target):
+    """Move across filesystems, returning the number of bytes copied"""
+    if os.path.lexists(target):
+        raise FileExistsError(errno.EEXIST, "Destination already exists", target)
+    size = os.path.getsize(source)
+    shutil.move(source, target)
+    return size
+
+def run_moves(moves, journal, event='done', same_device=True, workers=8,
+              progress_interval=1.0, batch_size=1000, label='Moved'):
+    """
+    Carry out (index, source_path, target_path) moves, journaling each batch.
+    Same-device moves are renames that never replace an existing file; the
+    rest are copied and removed by a thread pool, since cross-device moves
+    spend their time waiting on I/O. Name collisions are reported as errors.
+    :return: (moved_count, list of (path, error) pairs)
+    """
+    progress = MoveProgress(len(moves), progress_interval, label)
+    errors = []
+    copies = []
+    batch = []
+    for index, source, target in moves:
+        if same_device:
+            try:
+                _rename_no_replace(source, target)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    errors.append((source, e))
+                    continue
+            else:
+                progress.update()
+                batch.append(index)
+                if len(batch) >= batch_size:
+                    journal.commit(event, batch)
+                    batch = []
+                continue
+        copies.append((index, source, target))
+    journal.commit(event, batch)
+    batch = []
+
+    if copies:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_copy_move, source, target): (index, source)
+                       for index, source, target in copies}
+            for future in as_completed(futures):
+                index, source = futures[future]
+                try:
+                    progress.update(1, future.result())
+                except Exception as e:
+                    errors.append((source, e))
+                    continue
+                batch.append(index)
+                if len(batch) >= batch_size:
+                    journal.commit(event, batch)
+                    batch = []
+        journal.commit(event, batch)
+
+    progress.report()
+    return progress.done, errors
+
+def _list_names(path):
+    if not os.path.isdir(path):
+        return set()
+    with os.scandir(path) as entries:
+        return {entry.name for entry in entries}
+
+def execute_plan(plan, journal_path=None, workers=8, progress_interval=1.0):
+    """
+    Carry out a plan from plan_moves, journaling it in the destination folder
+    :return: (moved_count, errors, journal_path)
+    """
+    os.makedirs(plan['target'], exist_ok=True)
+    journal_path = journal_path or os.path.join(plan['target'], JOURNAL_NAME)
+    moves = [(i, os.path.join(plan['source'], source), os.path.join(plan['target'], target))
+             for i, (source, target) in enumerate(plan['moves'])]
+    with MoveJournal(journal_path) as journal:
+        journal.write_plan(plan)
+        moved_count, errors = run_moves(moves, journal, 'done', plan['same_device'],
+                                        workers, progress_interval)
+        if not errors:
+            journal.mark('complete')
+    return moved_count, errors, journal_path
+
+def resume_moves(journal_path, workers=8, progress_interval=1.0):
+    """
+    Finish an interrupted bulk move from its journal.
+    Moves that happened after the last journaled batch are recognised from
+    one listing of each folder and recorded instead of being repeated.
+    :return: (moved_count, errors)
+    """
+    journal = MoveJournal(journal_path)
+    plan, done = journal.load()
+    source_names = _list_names(plan['source'])
+    target_names = _list_names(plan['target'])
+    pending, settled, errors = [], [], []
+    for i, (source, target) in enumerate(plan['moves']):
+        if i in done:
+            continue
+        if source in source_names:
+            pending.append((i, os.path.join(plan['source'], source),
+                            os.path.join(plan['target'], target)))
+        elif target in target_names:
+            settled.append(i)
+        else:
+            errors.append((source, FileNotFoundError("missing from source and destination")))
+    print(f"Resuming: {len(done)} done, {len(settled)} already moved, {len(pending)} remaining")
+
+    with journal:
+        journal.commit('done', settled)
+        moved_count, move_errors = run_moves(pending, journal, 'done', plan['same_device'],
+                                             workers, progress_interval)
+        errors.extend(move_errors)
+        if not errors:
+            journal.mark('complete')
+    return moved_count, errors
+
+def rollback_moves(journal_path, workers=8, progress_interval=1.0):
+    """
+    Move every journaled file back to its original name, newest first.
+    Moves that happened after the last journaled batch are recognised from
+    one listing of each folder, as in resume_moves, and restored too.
+    Files whose original name has been taken again are left in place.
+    :return: (restored_count, errors)
+    """
+    journal = MoveJournal(journal_path)
+    plan, done = journal.load()
+    source_names = _list_names(plan['source'])
+    target_names = _list_names(plan['target'])
+    pending, errors = [], []
+    for i in range(len(plan['moves']) - 1, -1, -1):
+        source, target = plan['moves'][i]
+        if i not in done:
+            # Renamed before a crash, but its batch was never journaled
+            if target in target_names and source not in source_names:
+                pending.append((i, os.path.join(plan['target'], target),
+                                os.path.join(plan['source'], source)))
+            continue
+        if source in source_names:
+            errors.append((target, FileExistsError(f"{source} exists in the source folder again")))
+        elif target not in target_names:
+            errors.append((target, FileNotFoundError("missing from destination")))
+        else:
+            pending.append((i, os.path.join(plan['target'], target),
+                            os.path.join(plan['source'], source)))
+    print(f"Rolling back {len(pending)} moves")
+
+    with journal:
+        restored, move_errors = run_moves(pending, journal, 'undone', plan['same_device'],
+                                          workers, progress_interval, label='Restored')
+        errors.extend(move_errors)
+        if not errors:
+            journal.mark('rolled_back')
+    return restored, errors
+
+def report(moved_count, errors, destination):
+    for name, e in errors:
+        print(f"Error moving {name}: {str(e)}")
+    print(f"\nOperation complete!")
+    print(f"Files moved: {moved_count}")
+    print(f"Destination folder: {destination}")
+
+def move_files_to_folder(source_dir, new_folder_name, bulk=False, destination_dir=None,
+                         workers=8, progress_interval=1.0, dry_run=False):
     """
     Move all files from source directory to a new folder,
     except requirements.txt and README.md
+    :param bulk: Plan all moves from one directory listing, then rename in
+                 journaled batches instead of per-file probing and messages
+    :param destination_dir: Where to create the new folder (defaults to source_dir)
+    :param workers: Threads used for cross-device copies in bulk mode
+    :param progress_interval: Seconds between progress reports in bulk mode
+    :param dry_run: Only compute and print the plan, and return it
     """
     # Convert to Path object
     source_path = Path(source_dir)
@@ -14,26 +397,31 @@ def move_files_to_folder(source_dir, new_folder_name):
     # Create timestamp for folder name
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     new_folder_name = f"{new_folder_name}_{timestamp}"
+    new_folder_path = Path(destination_dir or source_dir) / new_folder_name
+    
+    if dry_run:
+        plan = plan_moves(source_path, new_folder_path)
+        print_plan(plan)
+        return plan
     
     # Create new folder
-    new_folder_path = source_path / new_folder_name
     new_folder_path.mkdir(exist_ok=True)
     
     print(f"Created folder: {new_folder_name}")
     
-    # Files to exclude
-    excluded_files = {
-        'requirements.txt',
-        'README.md',
-        'readme.md',
-        'move_files.py'  # Exclude this script itself
-    }
+    if bulk:
+        plan = plan_moves(source_path, new_folder_path)
+        print(f"Planned {len(plan['moves'])} moves")
+        moved_count, errors, journal_path = execute_plan(plan, None, workers, progress_interval)
+        print(f"Journal: {journal_path}")
+        report(moved_count, errors, new_folder_path)
+        return
     
     # Move files
     moved_count = 0
     for item in source_path.iterdir():
         # Skip if it's a directory or an excluded file
-        if item.is_dir() or item.name.lower() in excluded_files:
+        if item.is_dir() or item.name.lower() in EXCLUDED_FILES:
             continue
             
         try:
@@ -56,20 +444,38 @@ def move_files_to_folder(source_dir, new_folder_name):
         except Exception as e:
             print(f"Error moving {item.name}: {str(e)}")
     
-    print(f"\nOperation complete!")
-    print(f"Files moved: {moved_count}")
-    print(f"Destination folder: {new_folder_path}")
+    report(moved_count, [], new_folder_path)
 
 def main():
-    # Get current directory
-    current_dir = os.getcwd()
+    parser = argparse.ArgumentParser(description="Move files into a new timestamped folder")
+    parser.add_argument('source', nargs='?', default=os.getcwd(), help="Folder to move files out of")
+    parser.add_argument('--name', default='project_files', help="Base name of the new folder")
+    parser.add_argument('--dest', help="Create the new folder here instead of in the source folder")
+    parser.add_argument('--dry-run', action='store_true', help="Print the move plan without moving anything")
+    parser.add_argument('--bulk', action='store_true',
+                        help="Plan all moves from one listing and rename in journaled batches")
+    parser.add_argument('--resume', metavar='JOURNAL', help="Finish an interrupted move from its journal")
+    parser.add_argument('--rollback', metavar='JOURNAL', help="Undo the moves recorded in a journal")
+    parser.add_argument('--workers', type=int, default=8, help="Threads for cross-device copies")
+    args = parser.parse_args()
     
     print("File Moving Utility")
     print("==================")
-    print(f"Working directory: {current_dir}")
     
-    # Move files to a new folder named 'project_files'
-    move_files_to_folder(current_dir, "project_files")
+    if args.resume:
+        moved_count, errors = resume_moves(args.resume, args.workers)
+        report(moved_count, errors, Path(args.resume).parent)
+    elif args.rollback:
+        restored, errors = rollback_moves(args.rollback, args.workers)
+        for name, e in errors:
+            print(f"Error restoring {name}: {str(e)}")
+        print(f"\nRollback complete!")
+        print(f"Files restored: {restored}")
+    else:
+        print(f"Working directory: {args.source}")
+        move_files_to_folder(args.source, args.name, bulk=args.bulk,
+                             destination_dir=args.dest, workers=args.workers,
+                             dry_run=args.dry_run)
 
 if __name__ == "__main__":
     main()
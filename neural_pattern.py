@@ -1,5 +1,5 @@
 from animated_art_generator import AnimatedArtGenerator, ColorPalette
-from PIL import Image, ImageDraw, ImageFilter, ImageChops, ImageEnhance
+from PIL import Image, ImageFilter, ImageChops, ImageEnhance
 import math
 import random
 import numpy as np
@@ -207,55 +207,62 @@ class NeuralPattern(AnimatedArtGenerator):
 
     def create_frame(self, frame_num, total_frames):
         """Create a frame of the neural network animation"""
-        # Create base image with alpha channel
-        image = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
+        # Opaque black base: the alpha of the fills was never shown, and when
+        # supersampled, edge pixels must average against black to come out
+        # partially covered (an RGBA reduce keeps their full colour)
+        canvas = self.new_canvas('RGB', 'black')
+        draw = canvas.draw
         
         # Update activations and pulses
-        self._update_activations(frame_num, total_frames)
-        self._update_pulses(frame_num, total_frames)
+        with self.profiler.span('update'):
+            self._update_activations(frame_num, total_frames)
+            self._update_pulses(frame_num, total_frames)
         
         # Draw connections with pulses
-        for conn in self.connections:
-            start_pos = conn['start']['pos']
-            end_pos = conn['end']['pos']
-            activation = self.activations.get((conn['end']['layer'], conn['end']['index']), 0)
+        with self.profiler.span('connections'):
+            for conn in self.connections:
+                start_pos = conn['start']['pos']
+                end_pos = conn['end']['pos']
+                activation = self.activations.get((conn['end']['layer'], conn['end']['index']), 0)
             
-            # Get color based on activation
-            hue = 0.6 + 0.1 * activation  # Blue to purple
-            color = tuple(list(map(int, self.palette.hsv_to_rgb(hue, 0.8, 1))) + [255])
+                # Get color based on activation
+                hue = 0.6 + 0.1 * activation  # Blue to purple
+                color = tuple(list(map(int, self.palette.hsv_to_rgb(hue, 0.8, 1))) + [255])
             
-            self.draw_connection(draw, start_pos, end_pos, conn['weight'],
-                               activation, color, conn['pulses'], conn['style'],
-                               frame_num, total_frames)
+                self.draw_connection(draw, start_pos, end_pos, conn['weight'],
+                                   activation, color, conn['pulses'], conn['style'],
+                                   frame_num, total_frames)
         
         # Draw nodes
-        for node in self.nodes:
-            x, y = node['pos']
-            size = node['size']
-            activation = self.activations.get((node['layer'], node['index']), 0)
+        with self.profiler.span('nodes'):
+            for node in self.nodes:
+                x, y = node['pos']
+                size = node['size']
+                activation = self.activations.get((node['layer'], node['index']), 0)
             
-            # Node glow based on activation
-            for i in range(3):
-                glow_size = size * (1 + i * 0.5)
-                alpha = int(100 * activation / (i + 1))
-                glow_color = (100, 200, 255, alpha)
-                draw.ellipse([x - glow_size, y - glow_size,
-                            x + glow_size, y + glow_size],
-                           fill=glow_color)
+                # Node glow based on activation
+                for i in range(3):
+                    glow_size = size * (1 + i * 0.5)
+                    alpha = int(100 * activation / (i + 1))
+                    glow_color = (100, 200, 255, alpha)
+                    draw.ellipse([x - glow_size, y - glow_size,
+                                x + glow_size, y + glow_size],
+                               fill=glow_color)
             
-            # Main node
-            node_color = tuple(map(int, self.palette.hsv_to_rgb(0.6, 0.8, 0.5 + 0.5 * activation)))
-            draw.ellipse([x - size, y - size, x + size, y + size],
-                        fill=node_color)
+                # Main node
+                node_color = tuple(map(int, self.palette.hsv_to_rgb(0.6, 0.8, 0.5 + 0.5 * activation)))
+                draw.ellipse([x - size, y - size, x + size, y + size],
+                            fill=node_color)
         
         # Apply post-processing effects
+        with self.profiler.span('resolve'):
+            image = canvas.resolve()
         # Add bloom
-        bloom = image.filter(ImageFilter.GaussianBlur(3))
-        image = Image.blend(image, bloom, 0.3)
+        with self.profiler.span('bloom'):
+            bloom = image.filter(ImageFilter.GaussianBlur(3))
+            image = Image.blend(image, bloom, 0.3)
         
-        # Convert to RGB for final output
-        return image.convert('RGB')
+        return image
 
 def main():
     print("Neural Network Pattern Generator")
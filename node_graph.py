@@ -0,0 +1,200 @@
+import copy
+import hashlib
+import json
+import time
+
+# Shared start of every material: TexCoord -> Mapping -> texture -> ColorRamp -> Principled -> Output.
+# Nodes map a key to settings: 'type', 'location', 'inputs' default values,
+# enum 'properties', 'ramp' stops as (position, rgba) pairs and an 'image' path.
+# Links are (from_node, from_socket, to_node, to_socket); sockets are names or indexes.
+def base_spec(texture_type, texture_output='Fac', texture=None, mapping=None, ramp=None):
+    """Build the standard single-texture material graph"""
+    return {
+        'nodes': {
+            'output': {'type': 'ShaderNodeOutputMaterial', 'location': (300, 0)},
+            'principled': {'type': 'ShaderNodeBsdfPrincipled', 'location': (0, 0)},
+            'texture_coord': {'type': 'ShaderNodeTexCoord', 'location': (-800, 0)},
+            'mapping': {'type': 'ShaderNodeMapping', 'location': (-600, 0), **(mapping or {})},
+            'texture': {'type': texture_type, 'location': (-400, 0), **(texture or {})},
+            'color_ramp': {'type': 'ShaderNodeValToRGB', 'location': (-200, 0), **(ramp or {})}
+        },
+        'links': [
+            ('texture_coord', 'Generated', 'mapping', 'Vector'),
+            ('mapping', 'Vector', 'texture', 'Vector'),
+            ('texture', texture_output, 'color_ramp', 'Fac'),
+            ('color_ramp', 'Color', 'principled', 'Base Color'),
+            ('principled', 'BSDF', 'output', 'Surface')
+        ]
+    }
+
+def marble_spec():
+    """Noise overlaid on ring waves, feeding the colour ramp"""
+    spec = base_spec('ShaderNodeTexNoise')
+    spec['nodes']['wave'] = {
+        'type': 'ShaderNodeTexWave', 'location': (-400, -200),
+        'properties': {'wave_type': 'RINGS'},
+        'inputs': {'Scale': 2.0, 'Distortion': 2.0, 'Detail': 2.0}
+    }
+    spec['nodes']['mix'] = {
+        'type': 'ShaderNodeMixRGB', 'location': (-200, -100),
+        'properties': {'blend_type': 'OVERLAY'}
+    }
+    spec['links'][2] = ('mix', 'Color', 'color_ramp', 'Fac')
+    spec['links'] += [
+        ('wave', 'Color', 'mix', 1),
+        ('texture', 'Color', 'mix', 2)
+    ]
+    return spec
+
+def baked_spec(image_path):
+    """Material that samples a pre-baked base colour image instead of procedurals"""
+    return {
+        'nodes': {
+            'output': {'type': 'ShaderNodeOutputMaterial', 'location': (300, 0)},
+            'principled': {'type': 'ShaderNodeBsdfPrincipled', 'location': (0, 0)},
+            'texture_coord': {'type': 'ShaderNodeTexCoord', 'location': (-600, 0)},
+            'image': {'type': 'ShaderNodeTexImage', 'location': (-400, 0), 'image': image_path}
+        },
+        'links': [
+            ('texture_coord', 'Generated', 'image', 'Vector'),
+            ('image', 'Color', 'principled', 'Base Color'),
+            ('principled', 'BSDF', 'output', 'Surface')
+        ]
+    }
+
+MATERIAL_SPECS = {
+    'clouds': base_spec(
+        'ShaderNodeTexNoise',
+        texture={'inputs': {'Scale': 5.0, 'Detail': 8.0, 'Roughness': 0.7}},
+        ramp={'ramp': [(0.3, (0.1, 0.1, 0.1, 1)), (0.7, (1, 1, 1, 1))]}),
+    'marble': marble_spec(),
+    'wood': base_spec(
+        'ShaderNodeTexNoise',
+        mapping={'inputs': {'Scale': (20.0, 1.0, 1.0)}},
+        texture={'inputs': {'Scale': 15.0, 'Detail': 10.0, 'Roughness': 0.8}},
+        ramp={'ramp': [(0.4, (0.4, 0.2, 0.1, 1)), (0.6, (0.6, 0.3, 0.1, 1))]}),
+    'voronoi': base_spec(
+        'ShaderNodeTexVoronoi', 'Distance',
+        texture={'inputs': {'Scale': 10.0}, 'properties': {'feature': 'DISTANCE_TO_EDGE'}}),
+    'musgrave': base_spec(
+        'ShaderNodeTexMusgrave',
+        texture={'inputs': {'Scale': 5.0, 'Detail': 8.0, 'Dimension': 2.0},
+                 'properties': {'musgrave_type': 'FBM'}}),
+    'wave': base_spec(
+        'ShaderNodeTexWave', 'Color',
+        texture={'inputs': {'Scale': 5.0, 'Distortion': 2.0, 'Detail': 2.0},
+                 'properties': {'wave_type': 'BANDS', 'bands_direction': 'DIAGONAL'}})
+}
+
+def spec_variant(spec, inputs=None, properties=None, ramp=None):
+    """
+    Copy a spec with some settings replaced
+    :param inputs: Dict of node -> {socket: value}
+    :param properties: Dict of node -> {property: value}
+    :param ramp: Dict of node -> list of (position, rgba) stops
+    """
+    variant = copy.deepcopy(spec)
+    nodes = variant['nodes']
+    for node, values in (inputs or {}).items():
+        nodes[node].setdefault('inputs', {}).update(values)
+    for node, values in (properties or {}).items():
+        nodes[node].setdefault('properties', {}).update(values)
+    for node, stops in (ramp or {}).items():
+        nodes[node]['ramp'] = stops
+    return variant
+
+def spec_hash(spec):
+    """Stable hash of a graph: identical nodes, settings and links give the same hash"""
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+class MaterialBuilder:
+    """
+    Creates materials from node graph specs through the bpy data API.
+    Works with the real bpy module or with bpy_stub. Identical graphs are
+    built once and the cached material is returned for every later request.
+    """
+
+    def __init__(self, bpy):
+        self.bpy = bpy
+        self.cache = {}
+        self.hits = 0
+
+    def build(self, name, spec):
+        """Get a material for the spec, building it only if no identical graph exists"""
+        key = spec_hash(spec)
+        material = self.cache.get(key)
+        if material is not None:
+            try:
+                # The cached material may have been removed since it was built
+                if self.bpy.data.materials.get(material.name) is material:
+                    self.hits += 1
+                    return material
+            except ReferenceError:
+                # Real bpy raises on any access to a removed datablock
+                pass
+            del self.cache[key]
+        material = self.create(name, spec)
+        self.cache[key] = material
+        return material
+
+    def build_many(self, items):
+        """Build materials for (name, spec) pairs"""
+        return [self.build(name, spec) for name, spec in items]
+
+    def create(self, name, spec):
+        """Create a new material from the spec"""
+        material = self.bpy.data.materials.new(name=name)
+        material.use_nodes = True
+        tree = material.node_tree
+        tree.nodes.clear()
+
+        nodes = {}
+        for key, settings in spec['nodes'].items():
+            node = tree.nodes.new(settings['type'])
+            node.location = settings.get('location', (0, 0))
+            for prop, value in settings.get('properties', {}).items():
+                setattr(node, prop, value)
+            for socket, value in settings.get('inputs', {}).items():
+                node.inputs[socket].default_value = value
+            if 'image' in settings:
+                node.image = self.bpy.data.images.load(settings['image'], check_existing=True)
+            if 'ramp' in settings:
+                elements = node.color_ramp.elements
+                stops = settings['ramp']
+                while len(elements) < len(stops):
+                    elements.new(1.0)
+                for element, (position, color) in zip(elements, stops):
+                    element.position = position
+                    element.color = color
+            nodes[key] = node
+
+        for from_node, from_socket, to_node, to_socket in spec['links']:
+            tree.links.new(nodes[from_node].outputs[from_socket], nodes[to_node].inputs[to_socket])
+        return material
+
+def benchmark(count=5000, distinct=500):
+    """Build count material variants (about distinct unique graphs) against bpy_stub"""
+    import bpy_stub
+    bpy_stub.reset()
+    kinds = list(MATERIAL_SPECS)
+    items = []
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        scale = 1.0 + (i % distinct) // len(kinds)
+        items.append((f"{kind}_{i}", spec_variant(MATERIAL_SPECS[kind], {'texture': {'Scale': scale}})))
+
+    builder = MaterialBuilder(bpy_stub)
+    start = time.perf_counter()
+    builder.build_many(items)
+    elapsed = time.perf_counter() - start
+    print(f"Built {count} materials in {elapsed:.3f}s: "
+          f"{len(bpy_stub.data.materials)} created, {builder.hits} cache hits")
+    return elapsed
+
+def main():
+    print("Material Node Graph Builder")
+    print("===========================")
+    benchmark()
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,130 @@ from PIL import Image
 import os
 from datetime import datetime
 
+# Procedural noise on arbitrary 3D coordinates. Unlike the image-space
+# generators below, these can be sampled through any coordinate mapping,
+# which is what evaluating Blender texture nodes needs.
+_permutations = {}
+
+def permutation_table(seed=0):
+    """Doubled Perlin permutation table for a seed"""
+    if seed not in _permutations:
+        perm = np.random.RandomState(seed).permutation(256)
+        _permutations[seed] = np.concatenate((perm, perm)).astype(np.intp)
+    return _permutations[seed]
+
+def _fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+# Perlin's 12 edge gradients, padded to 16 so a hash picks one with & 15
+_GRADIENTS = np.array([
+    (1, 1, 0), (-1, 1, 0), (1, -1, 0), (-1, -1, 0),
+    (1, 0, 1), (-1, 0, 1), (1, 0, -1), (-1, 0, -1),
+    (0, 1, 1), (0, -1, 1), (0, 1, -1), (0, -1, -1),
+    (1, 1, 0), (0, -1, 1), (-1, 1, 0), (0, -1, -1)
+], dtype=np.float64).T.copy()
+
+def _grad(hash_values, x, y, z):
+    """Dot product with the gradient picked by hash"""
+    h = hash_values & 15
+    return _GRADIENTS[0][h] * x + _GRADIENTS[1][h] * y + _GRADIENTS[2][h] * z
+
+def perlin3(x, y, z, seed=0):
+    """Signed improved Perlin noise, roughly in [-1, 1]"""
+    perm = permutation_table(seed)
+    xf, yf, zf = np.floor(x), np.floor(y), np.floor(z)
+    xi = xf.astype(np.intp) & 255
+    yi = yf.astype(np.intp) & 255
+    zi = zf.astype(np.intp) & 255
+    x, y, z = x - xf, y - yf, z - zf
+    u, v, w = _fade(x), _fade(y), _fade(z)
+
+    a = perm[xi] + yi
+    b = perm[xi + 1] + yi
+    aa, ab = perm[a] + zi, perm[a + 1] + zi
+    ba, bb = perm[b] + zi, perm[b + 1] + zi
+
+    def lerp(t, p, q):
+        return p + t * (q - p)
+
+    x1 = lerp(u, _grad(perm[aa], x, y, z), _grad(perm[ba], x - 1, y, z))
+    x2 = lerp(u, _grad(perm[ab], x, y - 1, z), _grad(perm[bb], x - 1, y - 1, z))
+    y1 = lerp(v, x1, x2)
+    x1 = lerp(u, _grad(perm[aa + 1], x, y, z - 1), _grad(perm[ba + 1], x - 1, y, z - 1))
+    x2 = lerp(u, _grad(perm[ab + 1], x, y - 1, z - 1), _grad(perm[bb + 1], x - 1, y - 1, z - 1))
+    return lerp(w, y1, lerp(v, x1, x2))
+
+def fbm3(x, y, z, detail=2.0, roughness=0.5, lacunarity=2.0, seed=0, normalize=True):
+    """
+    Fractal sum of Perlin octaves with a fractional last octave
+    :param detail: Number of octaves after the first, may be fractional
+    :param roughness: Amplitude gain per octave
+    :param normalize: Divide by the total amplitude and map to [0, 1]
+    """
+    total = np.zeros(np.shape(x))
+    amplitude = 1.0
+    max_amplitude = 0.0
+    frequency = 1.0
+    octaves = int(detail)
+    for _ in range(octaves + 1):
+        total += perlin3(x * frequency, y * frequency, z * frequency, seed) * amplitude
+        max_amplitude += amplitude
+        amplitude *= roughness
+        frequency *= lacunarity
+    remainder = detail - octaves
+    if remainder > 0:
+        total += remainder * perlin3(x * frequency, y * frequency, z * frequency, seed) * amplitude
+        max_amplitude += remainder * amplitude
+    if normalize:
+        return 0.5 + 0.5 * total / max_amplitude
+    return total
+
+def _cell_hash(cx, cy, cz, seed):
+    """Three pseudo random values in [0, 1) per integer cell"""
+    perm = permutation_table(seed)
+    h = perm[perm[perm[cx & 255] + (cy & 255)] + (cz & 255)]
+    return (perm[h] / 255.0, perm[h + 1] / 255.0, perm[(h + 2) & 511] / 255.0)
+
+def cellular3(x, y, z, randomness=1.0, seed=0):
+    """
+    Worley noise on a jittered grid with one feature point per cell.
+    :return: (distance to the nearest point, distance to the nearest cell
+              edge, (r, g, b) random colour of the nearest cell)
+    """
+    base = [np.floor(c).astype(np.intp) for c in (x, y, z)]
+    local = [c - b for c, b in zip((x, y, z), base)]
+    offsets = [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)]
+
+    # Feature point of each neighbouring cell, relative to the sample's cell
+    points = []
+    for i, j, k in offsets:
+        jitter = _cell_hash(base[0] + i, base[1] + j, base[2] + k, seed)
+        points.append(tuple(o + randomness * r for o, r in zip((i, j, k), jitter)))
+
+    nearest = np.full(np.shape(x), np.inf)
+    nearest_index = np.zeros(np.shape(x), dtype=np.intp)
+    for n, point in enumerate(points):
+        distance = sum((p - l) ** 2 for p, l in zip(point, local))
+        closer = distance < nearest
+        nearest = np.where(closer, distance, nearest)
+        nearest_index = np.where(closer, n, nearest_index)
+    nearest_point = [np.choose(nearest_index, [p[axis] for p in points]) for axis in range(3)]
+
+    # Distance to the bisecting plane between the nearest point and each other point
+    edge = np.full(np.shape(x), np.inf)
+    for n, point in enumerate(points):
+        direction = [p - q for p, q in zip(point, nearest_point)]
+        length = np.sqrt(sum(d * d for d in direction))
+        valid = (nearest_index != n) & (length > 1e-9)
+        middle = [(p + q) / 2 - l for p, q, l in zip(point, nearest_point, local)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distance = sum(m * d for m, d in zip(middle, direction)) / length
+        edge = np.where(valid, np.minimum(edge, distance), edge)
+
+    cell = [b + np.choose(nearest_index, [o[axis] for o in offsets]) for axis, b in enumerate(base)]
+    color = _cell_hash(cell[0], cell[1], cell[2], seed + 1)
+    return np.sqrt(nearest), edge, color
+
 class NoiseTextureGenerator:
     def __init__(self, width=512, height=512):
         self.width = width
@@ -150,7 +274,7 @@ class NoiseTextureGenerator:
             texture += noise_layer * amplitude
             max_value += amplitude
             amplitude *= 0.5
-            frequency *= 2E
+            frequency *= 2
         
         # Normalize and apply cloud-like transformation
         texture /= max_value
@@ -1,5 +1,5 @@
 from animated_art_generator import AnimatedArtGenerator, ColorPalette
-from PIL import Image, ImageDraw, ImageFilter, ImageChops, ImageEnhance
+from PIL import Image, ImageFilter, ImageChops, ImageEnhance
 import math
 import numpy as np
 
@@ -9,8 +9,8 @@ class PatternCombinations(AnimatedArtGenerator):
     
     def create_vortex_layer(self, frame_num, total_frames):
         """Create a spinning vortex effect"""
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         center_x, center_y = self.width/2, self.height/2
         phase = frame_num * (2 * math.pi / total_frames)
@@ -35,12 +35,12 @@ class PatternCombinations(AnimatedArtGenerator):
                     color = self.palette.hsv_to_rgb(*self.palette.neon(hue))
                     draw.line(points[i:i+2], fill=color, width=2)
         
-        return image
+        return canvas.resolve()
     
     def create_matrix_layer(self, frame_num, total_frames):
         """Create a matrix-like digital rain effect"""
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         # Digital rain parameters
         column_width = 20
@@ -64,12 +64,12 @@ class PatternCombinations(AnimatedArtGenerator):
                 if size > 0:
                     draw.ellipse([x-size, y-size, x+size, y+size], fill=color)
         
-        return image
+        return canvas.resolve()
     
     def create_particle_field(self, frame_num, total_frames):
         """Create a flowing particle field effect"""
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         phase = frame_num * (2 * math.pi / total_frames)
         num_particles = 200
@@ -99,12 +99,12 @@ class PatternCombinations(AnimatedArtGenerator):
                             trail_x+size, trail_y+size], 
                            fill=trail_color)
         
-        return image
+        return canvas.resolve()
     
     def create_geometric_weave(self, frame_num, total_frames):
         """Create an interweaving geometric pattern"""
-        image = Image.new('RGB', (self.width, self.height), 'black')
-        draw = ImageDraw.Draw(image)
+        canvas = self.new_canvas()
+        draw = canvas.draw
         
         phase = frame_num * (2 * math.pi / total_frames)
         num_lines = 12
@@ -128,57 +128,68 @@ class PatternCombinations(AnimatedArtGenerator):
                     color = self.palette.hsv_to_rgb(*self.palette.neon(hue))
                     draw.line(points[j:j+2], fill=color, width=2)
         
-        return image
+        return canvas.resolve()
 
     def apply_effects(self, image, frame_num, total_frames):
         """Apply post-processing effects"""
         # Add bloom effect
-        bloom = image.filter(ImageFilter.GaussianBlur(3))
-        image = Image.blend(image, bloom, 0.3)
+        with self.profiler.span('bloom'):
+            bloom = image.filter(ImageFilter.GaussianBlur(3))
+            image = Image.blend(image, bloom, 0.3)
         
         # Add chromatic aberration
-        r, g, b = image.split()
-        r = ImageChops.offset(r, 2, 0)
-        b = ImageChops.offset(b, -2, 0)
-        image = Image.merge('RGB', (r, g, b))
+        with self.profiler.span('aberration'):
+            r, g, b = image.split()
+            r = ImageChops.offset(r, 2, 0)
+            b = ImageChops.offset(b, -2, 0)
+            image = Image.merge('RGB', (r, g, b))
         
         # Adjust contrast
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(1.2)
+        with self.profiler.span('contrast'):
+            enhancer = ImageEnhance.Contrast(image)
+            image = enhancer.enhance(1.2)
         
         return image
 
     def create_frame(self, frame_num, total_frames):
         """Create a frame combining multiple patterns"""
+        profiler = self.profiler
+        
         # Create base layers
-        vortex = self.create_vortex_layer(frame_num, total_frames)
-        matrix = self.create_matrix_layer(frame_num, total_frames)
-        particles = self.create_particle_field(frame_num, total_frames)
-        weave = self.create_geometric_weave(frame_num, total_frames)
+        with profiler.span('vortex_layer'):
+            vortex = self.create_vortex_layer(frame_num, total_frames)
+        with profiler.span('matrix_layer'):
+            matrix = self.create_matrix_layer(frame_num, total_frames)
+        with profiler.span('particle_field'):
+            particles = self.create_particle_field(frame_num, total_frames)
+        with profiler.span('geometric_weave'):
+            weave = self.create_geometric_weave(frame_num, total_frames)
         
         # Blend layers with different modes and phases
         phase = frame_num * (2 * math.pi / total_frames)
         
-        # Start with vortex
-        result = vortex
-        
-        # Blend matrix with screen mode
-        alpha = abs(math.sin(phase))
-        matrix_blend = ImageChops.screen(result, matrix)
-        result = Image.blend(result, matrix_blend, alpha * 0.6)
-        
-        # Blend particles with add mode
-        alpha = abs(math.sin(phase + math.pi/3))
-        particle_blend = ImageChops.add(result, particles)
-        result = Image.blend(result, particle_blend, alpha * 0.5)
-        
-        # Blend weave with screen mode
-        alpha = abs(math.sin(phase + math.pi/2))
-        weave_blend = ImageChops.screen(result, weave)
-        result = Image.blend(result, weave_blend, alpha * 0.7)
+        with profiler.span('blend'):
+            # Start with vortex
+            result = vortex
+            
+            # Blend matrix with screen mode
+            alpha = abs(math.sin(phase))
+            matrix_blend = ImageChops.screen(result, matrix)
+            result = Image.blend(result, matrix_blend, alpha * 0.6)
+            
+            # Blend particles with add mode
+            alpha = abs(math.sin(phase + math.pi/3))
+            particle_blend = ImageChops.add(result, particles)
+            result = Image.blend(result, particle_blend, alpha * 0.5)
+            
+            # Blend weave with screen mode
+            alpha = abs(math.sin(phase + math.pi/2))
+            weave_blend = ImageChops.screen(result, weave)
+            result = Image.blend(result, weave_blend, alpha * 0.7)
         
         # Apply post-processing effects
-        result = self.apply_effects(result, frame_num, total_frames)
+        with profiler.span('effects'):
+            result = self.apply_effects(result, frame_num, total_frames)
         
         return result
 
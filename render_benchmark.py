@@ -0,0 +1,254 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import itertools
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+import numpy as np
+import PIL
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; memory is then left out of the results
+    resource = None
+from animated_art_generator import SpinningMandala, ExpandingSpiral, PulsatingCircles, MorphingStars
+from pattern_combinations import PatternCombinations
+from complex_patterns import ComplexPatterns
+from neural_pattern import NeuralPattern
+from life_simulation import LifeSimulation
+from noise_texture_generator import NoiseTextureGenerator
+from turtle_art_generator import TurtleArtGenerator
+
+RESOLUTIONS = (256, 512, 1024)
+RESULTS_DIR = 'benchmark_results'
+
+# Benchmark cases: name -> (setup(width, height, population) returning a
+# callable that renders one frame or image, population sizes to run)
+CASES = {}
+
+def case(name, populations=(None,)):
+    """Register a benchmark case"""
+    def register(setup):
+        CASES[name] = (setup, populations)
+        return setup
+    return register
+
+def frame_runner(generator, total_frames=60):
+    """Render consecutive frames, as an animation would"""
+    frames = itertools.count()
+    return lambda: generator.create_frame(next(frames) % total_frames, total_frames)
+
+for _cls in (SpinningMandala, ExpandingSpiral, PulsatingCircles, MorphingStars,
+             PatternCombinations, ComplexPatterns, NeuralPattern):
+    case(_cls.__name__)(lambda width, height, population, cls=_cls: frame_runner(cls(width, height)))
+
+@case('LifeSimulation', populations=(50, 100, 400))
+def life_simulation(width, height, population):
+    generator = LifeSimulation(width, height)
+    generator.num_particles = population
+    generator.particles = []
+    generator.initialize_particles()
+    return frame_runner(generator)
+
+def texture_runner(method):
+    def setup(width, height, population):
+        generator = NoiseTextureGenerator(width, height)
+        # Time the synthesis, not PNG encoding and disk writes
+        generator.save_texture = lambda texture, name: texture
+        return getattr(generator, method)
+    return setup
+
+for _method in ('perlin_noise', 'fractal_noise', 'marble_texture', 'wood_texture',
+                'cloud_texture', 'cellular_texture', 'gradient_noise'):
+    case(f"NoiseTextureGenerator.{_method}")(texture_runner(_method))
+
+def turtle_runner(method, parameter, **options):
+    def setup(width, height, population):
+        generator = TurtleArtGenerator(width, height)
+        generator.save_image = lambda name: generator.image
+        return lambda: getattr(generator, method)(**{parameter: population}, **options)
+    return setup
+
+case('TurtleArtGenerator.star_burst', populations=(50, 500, 5000))(
+    turtle_runner('star_burst', 'lines'))
+case('TurtleArtGenerator.circular_pattern', populations=(36, 120, 360))(
+    turtle_runner('circular_pattern', 'points'))
+case('TurtleArtGenerator.lsystem_curve', populations=(4, 6, 8))(
+    turtle_runner('lsystem_curve', 'depth', name='hilbert'))
+
+def measure(run, repeat=5, warmup=1):
+    """
+    Time repeated calls
+    :return: dict of timings in seconds
+    """
+    with redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            run()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    return {'min': min(timings), 'median': float(np.median(timings)), 'mean': float(np.mean(timings)),
+            'repeat': repeat}
+
+def max_rss_mib():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+def _peak_rss_case(name, resolution, population):
+    """Process pool worker: set a case up and render it once"""
+    setup = CASES[name][0]
+    random.seed(0)
+    np.random.seed(0)
+    with redirect_stdout(io.StringIO()):
+        run = setup(resolution, resolution, population)
+        before = max_rss_mib()
+        run()
+    after = max_rss_mib()
+    return after, after - before
+
+def measure_memory(name, resolution, population):
+    """
+    Peak RSS of one render, taken in a fresh process so earlier cases do not
+    raise the high-water mark. Unlike tracemalloc this includes the PIL and
+    NumPy pixel buffers allocated in C.
+    :return: dict with the process peak and the growth during the render, in MiB
+    """
+    if resource is None:
+        return {}
+    # Linux keeps the peak across exec, so a spawned child would start with
+    # this process's peak; children forked from the small fork server do not
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        peak, render = pool.submit(_peak_rss_case, name, resolution, population).result()
+    return {'peak_rss_mib': peak, 'render_rss_mib': render}
+
+def result_key(result):
+    return (result['case'], result['resolution'], result['population'])
+
+def run_benchmarks(names=None, resolutions=RESOLUTIONS, repeat=5, warmup=1, memory=True):
+    """
+    Run every case (or those whose names contain one of names) at each
+    resolution and population size
+    :param memory: Also measure peak RSS, one fresh process per case
+    :return: List of result dicts
+    """
+    results = []
+    print(f"{'case':<38} {'size':>5} {'pop':>5} {'min ms':>9} {'median ms':>10} {'peak MiB':>9} {'render MiB':>11}")
+    for name, (setup, populations) in CASES.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        for resolution, population in itertools.product(resolutions, populations):
+            # Same random scene on every run, so results are comparable
+            random.seed(0)
+            np.random.seed(0)
+            with redirect_stdout(io.StringIO()):
+                run = setup(resolution, resolution, population)
+            result = {'case': name, 'resolution': resolution, 'population': population}
+            result.update(measure(run, repeat, warmup))
+            if memory:
+                result.update(measure_memory(name, resolution, population))
+            results.append(result)
+            peak = f"{result['peak_rss_mib']:>9.1f} {result['render_rss_mib']:>11.1f}" \
+                if 'peak_rss_mib' in result else f"{'-':>9} {'-':>11}"
+            print(f"{name:<38} {resolution:>5} {str(population or '-'):>5} {result['min'] * 1e3:>9.2f} "
+                  f"{result['median'] * 1e3:>10.2f} {peak}")
+    return results
+
+def environment():
+    """Machine and version details stored with the results"""
+    try:
+        # Ask the repository this file lives in, whatever the working directory
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'timestamp': datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'processor': platform.processor(), 'numpy': np.__version__, 'pillow': PIL.__version__}
+
+def save_results(results, filepath=None):
+    """Write results as JSON, by default to a timestamped file in RESULTS_DIR"""
+    if filepath is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        filepath = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(filepath, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    return filepath
+
+def load_results(filepath):
+    with open(filepath) as f:
+        return json.load(f)['results']
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Compare the min timings of two runs case by case. The min is the least
+    noisy statistic for CPU-bound code.
+    :param threshold: Relative slowdown reported as a regression
+    :return: List of (key, baseline min, current min) regressions
+    """
+    before = {result_key(result): result for result in baseline}
+    regressions = []
+    print(f"{'case':<38} {'size':>5} {'pop':>5} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for result in current:
+        key = result_key(result)
+        if key not in before:
+            continue
+        old, new = before[key]['min'], result['min']
+        change = new / old - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append((key, old, new))
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{key[0]:<38} {key[1]:>5} {str(key[2] or '-'):>5} {old * 1e3:>10.2f} {new * 1e3:>10.2f} "
+              f"{change:>+8.1%}{flag}")
+    print(f"\n{len(regressions)} regression(s) over {threshold:.0%}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Time frame rendering of every generator")
+    parser.add_argument('cases', nargs='*', help="Only run cases whose names contain one of these")
+    parser.add_argument('--resolutions', type=int, nargs='+', default=list(RESOLUTIONS))
+    parser.add_argument('--quick', action='store_true', help="Smallest resolution, fewer repeats")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the per-case peak RSS processes")
+    parser.add_argument('--output', help="Results file (default: timestamped in benchmark_results)")
+    parser.add_argument('--compare', metavar='BASELINE', help="Compare against an earlier results file")
+    parser.add_argument('--against', metavar='RESULTS', help="With --compare, compare this file instead of running")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Slowdown counted as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with status 1 on regressions")
+    args = parser.parse_args()
+
+    print("Render Benchmark")
+    print("================")
+    if args.against:
+        current = load_results(args.against)
+    else:
+        resolutions = args.resolutions[:1] if args.quick else args.resolutions
+        current = run_benchmarks(args.cases, resolutions, 2 if args.quick else args.repeat,
+                                 memory=not args.no_memory)
+        print(f"\nSaved: {save_results(current, args.output)}")
+
+    if args.compare:
+        print()
+        regressions = compare(load_results(args.compare), current, args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
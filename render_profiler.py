@@ -0,0 +1,168 @@
+import os
+import csv
+import json
+import threading
+from time import perf_counter_ns
+
+class _NullSpan:
+    """Context manager that does nothing, shared by every disabled span"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class NullProfiler:
+    """
+    Profiler used when profiling is off: span() hands back one shared no-op
+    context manager, so instrumented code costs a method call per stage
+    """
+    enabled = False
+
+    def span(self, name):
+        return _NULL_SPAN
+
+    def frame(self, number):
+        return _NULL_SPAN
+
+NULL_PROFILER = NullProfiler()
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, perf_counter_ns())
+        return False
+
+class _FrameSpan(_Span):
+    __slots__ = ('number', 'previous')
+
+    def __init__(self, profiler, number):
+        super().__init__(profiler, 'frame')
+        self.number = number
+
+    def __enter__(self):
+        self.previous = self.profiler.current_frame
+        self.profiler.current_frame = self.number
+        return super().__enter__()
+
+    def __exit__(self, *exc):
+        super().__exit__(*exc)
+        self.profiler.current_frame = self.previous
+        return False
+
+class RenderProfiler:
+    """
+    Records named spans with nanosecond timestamps, tagged with the frame
+    being rendered. Spans nest: a stage inside another is recorded as its
+    own span and shows up nested in the Chrome trace.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.events = []  # (frame, name, start_ns, end_ns, thread id)
+        self.current_frame = None
+        self.origin = perf_counter_ns()
+
+    def span(self, name):
+        """Time a stage: with profiler.span('bloom'): ..."""
+        return _Span(self, name)
+
+    def frame(self, number):
+        """Time a whole frame; spans opened inside are tagged with its number"""
+        return _FrameSpan(self, number)
+
+    def record(self, name, start, end):
+        self.events.append((self.current_frame, name, start, end, threading.get_ident()))
+
+    def reset(self):
+        self.events = []
+        self.origin = perf_counter_ns()
+
+    def stage_totals(self):
+        """
+        Sum spans per frame and stage
+        :return: Dict of (frame, stage) -> (calls, total ns), in first-seen order
+        """
+        totals = {}
+        for frame, name, start, end, _ in self.events:
+            calls, total = totals.get((frame, name), (0, 0))
+            totals[(frame, name)] = (calls + 1, total + end - start)
+        return totals
+
+    def summary(self):
+        """Print each stage's time over all frames, slowest first"""
+        stages = {}
+        for (frame, name), (calls, total) in self.stage_totals().items():
+            stage_calls, stage_total, frames = stages.get(name, (0, 0, set()))
+            frames.add(frame)
+            stages[name] = (stage_calls + calls, stage_total + total, frames)
+        frame_total = stages.get('frame', (0, 0, None))[1]
+        print(f"{'stage':<28} {'calls':>8} {'total ms':>10} {'ms/frame':>9} {'of frame':>9}")
+        for name, (calls, total, frames) in sorted(stages.items(), key=lambda item: -item[1][1]):
+            share = f"{total / frame_total:>9.1%}" if frame_total else f"{'-':>9}"
+            print(f"{name:<28} {calls:>8} {total / 1e6:>10.2f} {total / 1e6 / len(frames):>9.3f} {share}")
+        return stages
+
+    def export_csv(self, filepath):
+        """Write per-frame stage timings: frame, stage, calls, total_ms"""
+        with open(filepath, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'stage', 'calls', 'total_ms'])
+            for (frame, name), (calls, total) in self.stage_totals().items():
+                writer.writerow(['' if frame is None else frame, name, calls, f"{total / 1e6:.4f}"])
+        return filepath
+
+    def export_chrome_trace(self, filepath):
+        """
+        Write the spans in Chrome trace event format, for chrome://tracing,
+        Perfetto or speedscope
+        """
+        threads = {}
+        events = []
+        for frame, name, start, end, thread in self.events:
+            events.append({'name': name, 'ph': 'X', 'pid': 1, 'tid': threads.setdefault(thread, len(threads) + 1),
+                           'ts': (start - self.origin) / 1e3, 'dur': (end - start) / 1e3,
+                           'args': {} if frame is None else {'frame': frame}})
+        # Complete events must be sorted by start so nesting is reconstructed
+        events.sort(key=lambda event: (event['tid'], event['ts'], -event['dur']))
+        with open(filepath, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return filepath
+
+def main():
+    # Imported here: the generators import this module for NULL_PROFILER
+    from life_simulation import LifeSimulation
+    from pattern_combinations import PatternCombinations
+    from complex_patterns import ComplexPatterns
+    from neural_pattern import NeuralPattern
+
+    print("Render Profiler")
+    print("===============")
+    output_dir = 'profiles'
+    os.makedirs(output_dir, exist_ok=True)
+    for generator in (LifeSimulation(800, 600), PatternCombinations(500, 500),
+                      ComplexPatterns(500, 500), NeuralPattern(800, 600)):
+        name = type(generator).__name__
+        print(f"\n{name}")
+        profiler = generator.profile_frames(frames=20)
+        profiler.summary()
+        profiler.export_csv(os.path.join(output_dir, f"{name}.csv"))
+        profiler.export_chrome_trace(os.path.join(output_dir, f"{name}.trace.json"))
+
+    print("\nStage timings written to the 'profiles' directory (CSV, and Chrome")
+    print("trace JSON for chrome://tracing or https://ui.perfetto.dev).")
+
+if __name__ == "__main__":
+    main()
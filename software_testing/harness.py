@@ -0,0 +1,245 @@
+import os
+import time
+import queue
+import shutil
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Pages under test live at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Browser executables looked up on PATH when CHROME_BINARY is not set
+CHROME_NAMES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+
+class BrowserUnavailable(Exception):
+    """No local Chrome or chromedriver to run the tests with"""
+
+class StandInHandler(SimpleHTTPRequestHandler):
+    """Serves files from a directory, with extra in-memory routes taking precedence"""
+
+    routes = {}
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path in self.routes:
+            content_type, body = self.routes[path]
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+class LocalServer:
+    """
+    Local HTTP server on a free port, running in a background thread, so
+    tests load pages without network access
+    """
+
+    def __init__(self, root=REPO_ROOT, routes=None):
+        """
+        :param root: Directory to serve
+        :param routes: Dict of path -> (content type, bytes or str) stand-ins,
+                       e.g. for scripts a page would load from a CDN
+        """
+        routes = {path: (content_type, body.encode() if isinstance(body, str) else body)
+                  for path, (content_type, body) in (routes or {}).items()}
+        handler = type('Handler', (StandInHandler,), {'routes': routes})
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(handler, directory=root))
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url(self, path=''):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/{path.lstrip('/')}"
+
+def _executable(path):
+    return path if path and os.path.isfile(path) and os.access(path, os.X_OK) else None
+
+def find_browser(driver_path=None, browser_path=None):
+    """
+    Locate chromedriver and Chrome locally, without Selenium Manager, which
+    would download a driver and so needs network access
+    :param driver_path: chromedriver; defaults to CHROMEDRIVER, then PATH
+    :param browser_path: Chrome or Chromium; defaults to CHROME_BINARY, then PATH
+    :return: (driver_path, browser_path)
+    :raises BrowserUnavailable: Saying what is missing and how to provide it
+    """
+    driver = driver_path or os.environ.get('CHROMEDRIVER') or shutil.which('chromedriver')
+    if not _executable(driver):
+        raise BrowserUnavailable(f"chromedriver not found ({driver or 'not on PATH'}); "
+                                 f"set CHROMEDRIVER or pass its path")
+    browser = browser_path or os.environ.get('CHROME_BINARY')
+    if browser is None:
+        browser = next(filter(None, map(shutil.which, CHROME_NAMES)), None)
+    if not _executable(browser):
+        raise BrowserUnavailable(f"Chrome not found ({browser or 'not on PATH'}); "
+                                 f"set CHROME_BINARY or pass its path")
+    return driver, browser
+
+def chrome_options(width=1280, height=800):
+    """Headless Chrome settings that work in containers and CI"""
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f'--window-size={width},{height}')
+    return options
+
+class BrowserPool:
+    """
+    Headless Chrome sessions started once and shared by every test. Starting
+    Chrome costs far more than most tests, so sessions are only reset
+    between tests. Chrome and chromedriver are found locally (see
+    find_browser); BrowserUnavailable is raised when either is missing.
+    """
+
+    def __init__(self, size=1, options=None, driver_path=None, browser_path=None):
+        self.size = size
+        self.driver_path, browser_path = find_browser(driver_path, browser_path)
+        self.options = options or chrome_options()
+        self.options.binary_location = browser_path
+        self.idle = queue.Queue()
+        self.drivers = []
+        self.lock = threading.Lock()
+        self.startup_time = 0.0
+        self.failure = None  # Set when Chrome fails to start, so later tests skip at once
+
+    def start_driver(self):
+        if self.failure:
+            raise self.failure
+        start = time.perf_counter()
+        try:
+            driver = webdriver.Chrome(service=Service(executable_path=self.driver_path), options=self.options)
+        except WebDriverException as e:
+            message = (e.msg or type(e).__name__).strip().splitlines()[0]
+            self.failure = BrowserUnavailable(f"Chrome failed to start: {message}")
+            raise self.failure from e
+        self.startup_time += time.perf_counter() - start
+        return driver
+
+    @contextmanager
+    def session(self):
+        """Borrow a driver, starting one if the pool is not full yet"""
+        with self.lock:
+            if self.idle.empty() and len(self.drivers) < self.size:
+                driver = self.start_driver()
+                self.drivers.append(driver)
+                self.idle.put(driver)
+        driver = self.idle.get()
+        try:
+            yield driver
+        finally:
+            # Leave the page so timers and animation loops stop between tests
+            try:
+                driver.get('about:blank')
+                driver.delete_all_cookies()
+            except WebDriverException:
+                pass
+            self.idle.put(driver)
+
+    def close(self):
+        for driver in self.drivers:
+            driver.quit()
+        self.drivers = []
+
+def wait_for(driver, condition, timeout=5, message=''):
+    """
+    Poll condition(driver) until it returns something truthy, instead of
+    sleeping for a fixed time
+    :return: The condition's value
+    """
+    return WebDriverWait(driver, timeout, poll_frequency=0.05).until(condition, message)
+
+def wait_for_script(driver, script, timeout=5):
+    """Wait until a JavaScript expression is truthy and return its value"""
+    return wait_for(driver, lambda d: d.execute_script(f"return {script};"), timeout,
+                    f"timed out waiting for: {script}")
+
+class TestRunner:
+    """
+    Runs registered browser tests against a local server with pooled
+    browsers and reports how long each test took
+    """
+
+    def __init__(self):
+        self.tests = {}
+        self.results = []
+        self.server = None
+        self.pool = None
+
+    def test(self, function):
+        """Decorator registering a test(driver, server) function"""
+        self.tests[function.__name__] = function
+        return function
+
+    def run_test(self, name):
+        function = self.tests[name]
+        try:
+            with self.pool.session() as driver:
+                start = time.perf_counter()
+                try:
+                    function(driver, self.server)
+                    status, detail = 'passed', ''
+                except (AssertionError, TimeoutException, WebDriverException) as e:
+                    status, detail = 'failed', str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+                elapsed = time.perf_counter() - start
+        except BrowserUnavailable as e:
+            return {'test': name, 'status': 'skipped', 'seconds': 0.0, 'detail': str(e)}
+        return {'test': name, 'status': status, 'seconds': elapsed, 'detail': detail}
+
+    def skip_all(self, reason, names=None):
+        """Report every test as skipped, e.g. when no browser is available"""
+        self.results = [{'test': name, 'status': 'skipped', 'seconds': 0.0, 'detail': ''}
+                        for name in (names or self.tests)]
+        for result in self.results:
+            print(f"{result['status']:>7}  {result['test']}")
+        print(f"\n{len(self.results)} skipped: {reason}")
+        return True
+
+    def run(self, server, pool, names=None, workers=1):
+        """
+        Run tests and print a timing report
+        :param server: Running LocalServer the tests load pages from
+        :param pool: BrowserPool lending the drivers
+        :param workers: Tests run at once; use at most the pool size
+        :return: True when no test failed (skipped tests do not count)
+        """
+        self.server = server
+        self.pool = pool
+        names = list(names or self.tests)
+        start = time.perf_counter()
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                self.results = list(executor.map(self.run_test, names))
+        else:
+            self.results = [self.run_test(name) for name in names]
+        total = time.perf_counter() - start
+
+        for result in self.results:
+            line = f"{result['status']:>7}  {result['seconds'] * 1e3:8.1f} ms  {result['test']}"
+            print(line + (f"  ({result['detail']})" if result['detail'] else ''))
+        counts = {status: sum(result['status'] == status for result in self.results)
+                  for status in ('passed', 'failed', 'skipped')}
+        print(f"\n{counts['passed']}/{len(self.results)} passed, {counts['skipped']} skipped in {total:.2f}s "
+              f"(browser startup {self.pool.startup_time:.2f}s)")
+        return counts['failed'] == 0
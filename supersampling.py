@@ -0,0 +1,161 @@
+from PIL import Image, ImageDraw, ImageColor
+
+class Canvas:
+    """Plain drawing canvas: an image and an ImageDraw on it"""
+
+    def __init__(self, size, mode='RGB', color='black'):
+        self.size = size
+        self.mode = mode
+        self.image = Image.new(mode, size, color)
+        self.draw = ImageDraw.Draw(self.image)
+
+    def resolve(self):
+        """Get the finished image"""
+        return self.image
+
+class SupersampledDraw:
+    """
+    ImageDraw stand-in that draws on a canvas `factor` times larger.
+    Coordinates and line widths are scaled up and every primitive marks the
+    tiles its bounding box touches, so resolve() only has to filter those.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.factor = canvas.factor
+        self.draw = ImageDraw.Draw(canvas.image)
+        # Maps low resolution pixel centres onto high resolution pixel centres
+        self.offset = (self.factor - 1) / 2
+
+    def _points(self, xy):
+        """Flatten xy, either [(x, y), ...] or [x, y, ...], into [x0, y0, x1, y1, ...]"""
+        if isinstance(xy[0], (tuple, list)):
+            return [v for point in xy for v in point]
+        return list(xy)
+
+    def _scale_points(self, xy, margin=0):
+        flat = self._points(xy)
+        scaled = [v * self.factor + self.offset for v in flat]
+        self.canvas.mark(flat[0::2], flat[1::2], margin)
+        return scaled
+
+    def _scale_box(self, xy, margin=0):
+        x0, y0, x1, y1 = self._points(xy)
+        self.canvas.mark((x0, x1), (y0, y1), margin)
+        k = self.factor
+        return [x0 * k, y0 * k, x1 * k + k - 1, y1 * k + k - 1]
+
+    def line(self, xy, fill=None, width=1, joint=None):
+        self.draw.line(self._scale_points(xy, width), fill=fill, width=width * self.factor, joint=joint)
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self.draw.polygon(self._scale_points(xy, width), fill=fill, outline=outline, width=width * self.factor)
+
+    def point(self, xy, fill=None):
+        flat = self._points(xy)
+        for x, y in zip(flat[0::2], flat[1::2]):
+            self.draw.rectangle(self._scale_box((x, y, x, y)), fill=fill)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self.draw.ellipse(self._scale_box(xy, width), fill=fill, outline=outline, width=width * self.factor)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self.draw.rectangle(self._scale_box(xy, width), fill=fill, outline=outline, width=width * self.factor)
+
+class SupersampledCanvas(Canvas):
+    """
+    Antialiased canvas using tile-based supersampling. Geometry is drawn at
+    `factor` times the resolution, but only tiles touched by a primitive are
+    box filtered back down; untouched tiles are filled with the background.
+    Once a quarter of the tiles are touched the whole frame is reduced in one
+    call, which is then cheaper than reducing tiles one run at a time, and
+    tiles are no longer tracked.
+    """
+
+    def __init__(self, size, mode='RGB', color='black', factor=2, tile=32, pool=None):
+        """
+        :param pool: List the canvas returns itself to once resolved, so the
+                     next frame reuses its buffer (see new_canvas)
+        """
+        self.size = size
+        self.mode = mode
+        self.color = color
+        self.factor = factor
+        self.tile = tile
+        self.pool = pool
+        width, height = size
+        self.image = Image.new(mode, (width * factor, height * factor), color)
+        self.tiles_x = (width + tile - 1) // tile
+        self.tiles_y = (height + tile - 1) // tile
+        self.touched = set()
+        self.full = False
+        self.draw = SupersampledDraw(self)
+
+    def reset(self):
+        """Clear the canvas for reuse; the buffer is already mapped, so this is a plain fill"""
+        self.image.paste(ImageColor.getcolor(self.color, self.mode) if isinstance(self.color, str)
+                         else self.color, (0, 0) + self.image.size)
+        self.touched = set()
+        self.full = False
+
+    def mark(self, xs, ys, margin=0):
+        """Mark the tiles covered by the bounding box of the points (low resolution coordinates)"""
+        if self.full:
+            return
+        pad = margin + 1
+        tx0 = max(0, int((min(xs) - pad) // self.tile))
+        tx1 = min(self.tiles_x - 1, int((max(xs) + pad) // self.tile))
+        ty0 = max(0, int((min(ys) - pad) // self.tile))
+        ty1 = min(self.tiles_y - 1, int((max(ys) + pad) // self.tile))
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                self.touched.add((tx, ty))
+        if len(self.touched) * 4 > self.tiles_x * self.tiles_y:
+            self.full = True
+
+    def resolve(self):
+        """Downsample the touched tiles into the final image"""
+        result = self.downsample()
+        if self.pool is not None:
+            self.pool.append(self)
+        return result
+
+    def downsample(self):
+        if self.full:
+            return self.image.reduce(self.factor)
+
+        result = Image.new(self.mode, self.size, self.color)
+        k = self.factor * self.tile
+        # Neighbouring touched tiles of a row are reduced and pasted as one run
+        for ty, tx0, tx1 in self.runs():
+            box = (tx0 * k, ty * k,
+                   min(tx1 * k, self.image.width), min((ty + 1) * k, self.image.height))
+            result.paste(self.image.reduce(self.factor, box), (tx0 * self.tile, ty * self.tile))
+        return result
+
+    def runs(self):
+        """Touched tiles as (row, first column, end column) horizontal runs"""
+        runs = []
+        for ty, tx in sorted((ty, tx) for tx, ty in self.touched):
+            if runs and runs[-1][0] == ty and runs[-1][2] == tx:
+                runs[-1][2] = tx + 1
+            else:
+                runs.append([ty, tx, tx + 1])
+        return runs
+
+def new_canvas(size, mode='RGB', color='black', antialias=1, pool=None):
+    """
+    Create a canvas, supersampled by `antialias` in each direction when above 1
+    :param pool: List of resolved supersampled canvases to reuse. A fresh
+                 large buffer costs a page fault per page on first touch,
+                 which is more than drawing a simple frame.
+    """
+    if antialias > 1:
+        if pool:
+            for i, canvas in enumerate(pool):
+                if (canvas.size, canvas.mode, canvas.color, canvas.factor) == (size, mode, color, antialias):
+                    del pool[i]
+                    canvas.reset()
+                    return canvas
+        return SupersampledCanvas(size, mode, color, antialias, pool=pool)
+    return Canvas(size, mode, color)
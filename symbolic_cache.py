@@ -0,0 +1,168 @@
+import os
+import ast
+import time
+import hashlib
+import numpy as np
+import sympy as sp
+
+# Names srepr output refers to: SymPy classes and constants, but no functions
+# such as sympify that would parse (and evaluate) a string argument
+SREPR_NAMESPACE = {name: obj for name, obj in vars(sp).items()
+                   if not name.startswith('_') and isinstance(obj, (type, sp.Basic))}
+# Classes srepr passes a string to, as a name or a number
+STRING_ARGUMENT_CLASSES = {'Symbol', 'Dummy', 'Wild', 'Function', 'Float', 'Str'}
+SREPR_NODES = (ast.Expression, ast.Call, ast.Name, ast.Load, ast.Constant, ast.keyword,
+               ast.Tuple, ast.List, ast.Dict, ast.UnaryOp, ast.USub)
+
+def parse_srepr(text):
+    """
+    Rebuild a result from srepr text without running arbitrary code: only
+    literals and calls of SymPy classes are accepted, strings only as the
+    name or number given to a Symbol, Function or Float
+    """
+    tree = ast.parse(text, mode='eval')
+    strings = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, SREPR_NODES):
+            raise ValueError(f"Unexpected {type(node).__name__} in srepr text")
+        if isinstance(node, ast.Name) and node.id not in SREPR_NAMESPACE:
+            raise ValueError(f"Unknown name {node.id!r} in srepr text")
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in STRING_ARGUMENT_CLASSES and node.args):
+            strings.add(id(node.args[0]))
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in strings:
+            raise ValueError(f"Unexpected string {node.value!r} in srepr text")
+    return sp.parse_expr(text, local_dict={}, global_dict=dict(SREPR_NAMESPACE, __builtins__={}),
+                         transformations=())
+
+class SymbolicCache:
+    """
+    Memoizes symbolic results in memory and on disk, keyed by the srepr of
+    the operation's arguments, and compiles expressions to NumPy functions.
+    Results are stored as srepr text, so the cache stays readable and does
+    not depend on pickle compatibility between SymPy versions. Each file
+    starts with the full key text and is parsed with parse_srepr, so a stale
+    or foreign cache file is recomputed instead of trusted.
+    """
+
+    def __init__(self, cache_dir='.sympy_cache'):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.operations = {
+            'expand': sp.expand,
+            'factor': sp.factor,
+            'solve': sp.solve,
+            'diff': sp.diff,
+            'integrate': sp.integrate,
+            'limit': sp.limit,
+            'series': sp.series,
+            'simplify': sp.simplify,
+            'det': lambda matrix: matrix.det(),
+            'eigenvals': lambda matrix: matrix.eigenvals()
+        }
+        self.results = {}
+        self.functions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key_text(self, operation, args):
+        """Text identifying an operation applied to args"""
+        return operation + '|' + '|'.join(sp.srepr(arg) for arg in args)
+
+    def key(self, operation, args):
+        """Cache key of an operation applied to args"""
+        return hashlib.sha1(self.key_text(operation, args).encode()).hexdigest()
+
+    def load(self, filepath, key_text):
+        """
+        Read a cached result
+        :return: The result, or None when the file is missing, belongs to
+                 another key or does not parse as srepr text
+        """
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath) as f:
+            stored_key, _, text = f.read().partition('\n')
+        if stored_key != key_text:
+            return None
+        try:
+            return parse_srepr(text)
+        except (SyntaxError, ValueError, TypeError):
+            return None
+
+    def apply(self, operation, *args):
+        """Run a symbolic operation, or load its result from the cache"""
+        key_text = self.key_text(operation, args)
+        key = hashlib.sha1(key_text.encode()).hexdigest()
+        if key in self.results:
+            self.hits += 1
+            return self.results[key]
+
+        filepath = os.path.join(self.cache_dir, f"{key}.txt")
+        result = self.load(filepath, key_text)
+        if result is not None:
+            self.hits += 1
+        else:
+            result = self.operations[operation](*args)
+            # Write then rename so an interrupted run never leaves half a result
+            partial = filepath + '.partial'
+            with open(partial, 'w') as f:
+                f.write(key_text + '\n' + sp.srepr(result))
+            os.replace(partial, filepath)
+            self.misses += 1
+        self.results[key] = result
+        return result
+
+    def compile(self, expr, args, cse=False):
+        """
+        Compile an expression to a vectorized NumPy function of args
+        :param args: Symbol or sequence of symbols, in call order
+        :param cse: Eliminate common subexpressions before generating code
+        """
+        symbols = tuple(args) if isinstance(args, (list, tuple)) else (args,)
+        key = self.key('lambdify_cse' if cse else 'lambdify', (expr,) + symbols)
+        if key not in self.functions:
+            self.functions[key] = sp.lambdify(args, expr, modules='numpy', cse=cse)
+        return self.functions[key]
+
+    def clear(self):
+        """Forget all cached results, on disk as well"""
+        self.results = {}
+        self.functions = {}
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.txt'):
+                os.remove(os.path.join(self.cache_dir, name))
+
+def benchmark(points=2000, compiled_points=1_000_000, cache_dir='.sympy_cache'):
+    """
+    Compare evaluating a derived expression point by point with subs/evalf
+    against the lambdify-compiled path over a large array
+    """
+    x = sp.symbols('x')
+    cache = SymbolicCache(cache_dir)
+    expr = cache.apply('diff', sp.sin(x) ** 2 * sp.exp(-x / 5) + sp.cos(3 * x) / (1 + x ** 2), x)
+
+    values = np.linspace(0, 10, points)
+    start = time.perf_counter()
+    slow = [float(expr.subs(x, v).evalf()) for v in values]
+    subs_time = (time.perf_counter() - start) / points
+
+    function = cache.compile(expr, x)
+    start = time.perf_counter()
+    fast = function(values)
+    big = function(np.linspace(0, 10, compiled_points))
+    compiled_time = (time.perf_counter() - start) / (points + len(big))
+    check = np.max(np.abs(np.asarray(slow) - fast))
+
+    print(f"subs/evalf: {subs_time * 1e6:.1f} us per point")
+    print(f"lambdify:   {compiled_time * 1e9:.1f} ns per point ({subs_time / compiled_time:.0f}x faster)")
+    print(f"max difference: {check:.2e}")
+    return subs_time, compiled_time
+
+def main():
+    print("Symbolic Cache Benchmark")
+    print("========================")
+    benchmark()
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
-from sympy import (
-    symbols, expand, factor, solve, simplify,
-    diff, integrate, limit, Matrix, init_printing
-)
+from sympy import symbols, Matrix, init_printing
 import sympy as sp
+import numpy as np
+from symbolic_cache import SymbolicCache
+from batched_linalg import batch_det
 
-def demonstrate_sympy():
-    """Demonstrate key features of SymPy library"""
+def demonstrate_sympy(cache=None):
+    """
+    Demonstrate key features of SymPy library
+    :param cache: SymbolicCache for the symbolic results, so reruns load them from disk
+    """
+    cache = cache or SymbolicCache()
+    
     # Enable pretty printing
     init_printing(use_unicode=True)
     
@@ -20,18 +25,18 @@ def demonstrate_sympy():
     print("--------------")
     expr = (x + y)**2
     print(f"Expand (x + y)²:")
-    print(f"Result: {expand(expr)}")
+    print(f"Result: {cache.apply('expand', expr)}")
     
     expr2 = x**2 + 2*x*y + y**2
     print(f"\nFactor x² + 2xy + y²:")
-    print(f"Result: {factor(expr2)}")
+    print(f"Result: {cache.apply('factor', expr2)}")
     
     # 2. Equation Solving
     print("\n2. Equation Solving")
     print("-----------------")
     equation = x**2 - 5*x + 6
     print(f"Solve x² - 5x + 6 = 0:")
-    print(f"Solutions: {solve(equation, x)}")
+    print(f"Solutions: {cache.apply('solve', equation, x)}")
     
     # 3. Calculus
     print("\n3. Calculus")
@@ -39,17 +44,21 @@ def demonstrate_sympy():
     
     # Differentiation
     expr3 = x**3 + x**2 + x + 1
-    derivative = diff(expr3, x)
+    derivative = cache.apply('diff', expr3, x)
     print(f"Derivative of x³ + x² + x + 1:")
     print(f"Result: {derivative}")
     
+    # Numeric evaluation of the derivative over a large array
+    values = cache.compile(derivative, x)(np.linspace(-1, 1, 1_000_000))
+    print(f"Evaluated at 1,000,000 points in [-1, 1]: min {values.min():.4f}, max {values.max():.4f}")
+    
     # Integration
-    integral = integrate(x**2, x)
+    integral = cache.apply('integrate', x**2, x)
     print(f"\nIntegral of x²:")
     print(f"Result: {integral}")
     
     # Limits
-    lim = limit(sp.sin(x)/x, x, 0)
+    lim = cache.apply('limit', sp.sin(x)/x, x, 0)
     print(f"\nLimit of sin(x)/x as x → 0:")
     print(f"Result: {lim}")
     
@@ -59,13 +68,29 @@ def demonstrate_sympy():
     matrix = Matrix([[1, 2], [3, 4]])
     print(f"Matrix:")
     print(matrix)
-    print(f"\nDeterminant: {matrix.det()}")
-    print(f"Eigenvalues: {matrix.eigenvals()}")
+    print(f"\nDeterminant: {cache.apply('det', matrix)}")
+    print(f"Eigenvalues: {cache.apply('eigenvals', matrix)}")
+    
+    # Numeric matrices in bulk go through NumPy in one batched call
+    angles = np.linspace(0, np.pi, 10_000)
+    transforms = np.zeros((len(angles), 4, 4))
+    transforms[:, 0, 0] = transforms[:, 1, 1] = np.cos(angles)
+    transforms[:, 0, 1] = -np.sin(angles)
+    transforms[:, 1, 0] = np.sin(angles)
+    transforms[:, 2, 2] = 2.0
+    transforms[:, 3, 3] = 1.0
+    determinants = batch_det(transforms)
+    print(f"\nBatched determinants of {len(transforms)} 4x4 transforms: "
+          f"min {min(determinants):.4f}, max {max(determinants):.4f}")
+    
+    # Mixed batches keep the exact path for matrices with symbols
+    mixed = [matrix, Matrix([[x, 1], [1, x]]), Matrix(4, 4, lambda i, j: i + j + (i == j))]
+    print(f"Mixed batch determinants: {batch_det(mixed, cache)}")
     
     # 5. Series Expansion
     print("\n5. Series Expansion")
     print("-----------------")
-    series = sp.series(sp.exp(x), x, 0, 5)
+    series = cache.apply('series', sp.exp(x), x, 0, 5)
     print(f"Taylor series of e^x around 0 (up to 4th term):")
     print(series)
     
@@ -74,14 +99,14 @@ def demonstrate_sympy():
     print("--------------")
     trig_expr = sp.sin(x)**2 + sp.cos(x)**2
     print(f"Simplify sin²(x) + cos²(x):")
-    print(f"Result: {simplify(trig_expr)}")
+    print(f"Result: {cache.apply('simplify', trig_expr)}")
     
     # 7. Solving Systems of Equations
     print("\n7. Systems of Equations")
     print("---------------------")
     eq1 = sp.Eq(2*x + y, 8)
     eq2 = sp.Eq(x + 2*y, 10)
-    solution = solve((eq1, eq2), (x, y))
+    solution = cache.apply('solve', (eq1, eq2), (x, y))
     print(f"Solve system:")
     print("2x + y = 8")
     print("x + 2y = 10")
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from move_files import JOURNAL_NAME, MoveJournal, plan_moves, execute_plan, rollback_moves
+
+class JournalNameCollisionTest(unittest.TestCase):
+    """A source file named like the journal must not overwrite it"""
+
+    def test_source_file_named_like_journal(self):
+        with tempfile.TemporaryDirectory() as root:
+            source = os.path.join(root, 'source')
+            target = os.path.join(source, 'moved')
+            os.makedirs(source)
+            for name, text in ((JOURNAL_NAME, 'not a journal\n'), ('data.txt', 'data\n')):
+                with open(os.path.join(source, name), 'w') as f:
+                    f.write(text)
+
+            plan = plan_moves(source, target)
+            moves = dict(plan['moves'])
+            self.assertNotEqual(moves[JOURNAL_NAME], JOURNAL_NAME)
+
+            moved_count, errors, journal_path = execute_plan(plan)
+            self.assertEqual((moved_count, errors), (2, []))
+            with open(os.path.join(target, moves[JOURNAL_NAME])) as f:
+                self.assertEqual(f.read(), 'not a journal\n')
+
+            restored, errors = rollback_moves(journal_path)
+            self.assertEqual((restored, errors), (2, []))
+            self.assertEqual(sorted(os.listdir(source)), sorted([JOURNAL_NAME, 'data.txt', 'moved']))
+
+class CrashMidBatchTest(unittest.TestCase):
+    """Files renamed after the last journaled batch are still rolled back"""
+
+    def test_rollback_after_crash_mid_batch(self):
+        with tempfile.TemporaryDirectory() as root:
+            source = os.path.join(root, 'source')
+            target = os.path.join(root, 'moved')
+            os.makedirs(source)
+            names = [f"file_{i:04}.txt" for i in range(2500)]
+            for name in names:
+                open(os.path.join(source, name), 'w').close()
+
+            # Crash while journaling the second batch: 2000 files are renamed,
+            # only the first 1000 are recorded as done
+            commit = MoveJournal.commit
+            calls = []
+            def crash(journal, event, indexes):
+                calls.append(event)
+                if calls.count('done') == 2:
+                    raise KeyboardInterrupt
+                commit(journal, event, indexes)
+            plan = plan_moves(source, target)
+            with mock.patch.object(MoveJournal, 'commit', crash):
+                with self.assertRaises(KeyboardInterrupt):
+                    execute_plan(plan)
+            self.assertEqual(len(os.listdir(source)), 500)
+
+            restored, errors = rollback_moves(os.path.join(target, JOURNAL_NAME))
+            self.assertEqual((restored, errors), (2000, []))
+            self.assertEqual(sorted(os.listdir(source)), names)
+            self.assertEqual(os.listdir(target), [JOURNAL_NAME])
+
+class LateCollisionTest(unittest.TestCase):
+    """A file created at a planned target after planning is not overwritten"""
+
+    def test_target_created_after_planning(self):
+        with tempfile.TemporaryDirectory() as root:
+            source = os.path.join(root, 'source')
+            target = os.path.join(root, 'moved')
+            os.makedirs(source)
+            for name in ('a.txt', 'b.txt'):
+                with open(os.path.join(source, name), 'w') as f:
+                    f.write('source\n')
+
+            plan = plan_moves(source, target)
+            os.makedirs(target)
+            with open(os.path.join(target, 'a.txt'), 'w') as f:
+                f.write('newer\n')
+            moved_count, errors, _ = execute_plan(plan)
+
+            self.assertEqual(moved_count, 1)
+            self.assertEqual([type(e) for _, e in errors], [FileExistsError])
+            with open(os.path.join(target, 'a.txt')) as f:
+                self.assertEqual(f.read(), 'newer\n')
+            self.assertEqual(os.listdir(source), ['a.txt'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,15 @@ from PIL import Image, ImageDraw
 import os
 from datetime import datetime
 import math
+import numpy as np
+from turtle_engine import TurtleProgram, draw_segments, draw_segments_additive
+from lsystem import LSystem, PRESETS
 
 class TurtleArtGenerator:
-    def __init__(self, width=800, height=800):
+    def __init__(self, width=800, height=800, antialias=False):
         self.width = width
         self.height = height
+        self.antialias = antialias  # Coverage-based antialiasing for batched drawing
         self.output_dir = 'turtle_art'
         os.makedirs(self.output_dir, exist_ok=True)
         
@@ -17,6 +21,7 @@ class TurtleArtGenerator:
         self.draw = ImageDraw.Draw(self.image)
         self.current_pos = (width//2, height//2)
         self.angle = 0  # 0 degrees is pointing right
+        self.lsystems = {}  # Keeps expanded L-system strings between renders
         
     def save_image(self, name):
         """Save the image"""
@@ -42,6 +47,27 @@ class TurtleArtGenerator:
             random.randint(50, 255)
         )
     
+    def random_colors(self, count):
+        """Generate an (count, 3) array of random RGB colors in one call"""
+        return np.random.randint(50, 256, size=(count, 3), dtype=np.uint8)
+    
+    def run_program(self, program, width=2):
+        """Evaluate a TurtleProgram from the current position and draw it in one batched pass"""
+        result = program.evaluate(self.current_pos, self.angle)
+        self.draw_result(result, width)
+        self.current_pos = (int(result['position'][0]), int(result['position'][1]))
+        self.angle = result['heading']
+    
+    def draw_result(self, result, width=2):
+        """Draw the segments of an evaluated TurtleProgram"""
+        pen = result['pen']
+        pixels = np.array(self.image)
+        draw_segments(pixels, result['x0'][pen], result['y0'][pen],
+                      result['x1'][pen], result['y1'][pen], result['colors'][pen], width,
+                      self.antialias)
+        self.image = Image.fromarray(pixels)
+        self.draw = ImageDraw.Draw(self.image)
+    
     def move_forward(self, distance, draw_line=True, color=None):
         """Move forward and optionally draw a line"""
         # Calculate new position
@@ -69,10 +95,13 @@ class TurtleArtGenerator:
         print("Generating spiral pattern...")
         self.clear_screen()
         
-        for i in range(size):
-            color = self.random_color()
-            self.move_forward(i * 2, color=color)
-            self.right(angle)
+        # forward(i * 2) then right(angle), recorded as one batch of steps
+        program = TurtleProgram()
+        turns = np.full(size, float(angle))
+        turns[:1] = 0
+        program.add_steps(np.arange(size) * 2.0, turns, self.random_colors(size))
+        program.right(angle)
+        self.run_program(program)
         
         return self.save_image("spiral")
     
@@ -81,11 +110,15 @@ class TurtleArtGenerator:
         print("Generating star burst pattern...")
         self.clear_screen()
         
-        for _ in range(lines):
-            color = self.random_color()
-            self.move_forward(size, color=color)
-            self.move_forward(-size, color=color)
-            self.right(360/lines)
+        # Out and back along each ray with the same color, then turn to the next ray
+        program = TurtleProgram()
+        turns = np.zeros(lines * 2)
+        turns[2::2] = 360/lines
+        distances = np.tile([size, -size], lines).astype(float)
+        colors = np.repeat(self.random_colors(lines), 2, axis=0)
+        program.add_steps(distances, turns, colors)
+        program.right(360/lines)
+        self.run_program(program)
         
         return self.save_image("star_burst")
     
@@ -94,57 +127,90 @@ class TurtleArtGenerator:
         print("Generating geometric pattern...")
         self.clear_screen()
         
-        for _ in range(iterations):
-            color = self.random_color()
-            for _ in range(4):
-                self.move_forward(size, color=color)
-                self.right(90)
-            self.right(360/iterations)
+        # One square per iteration, rotated by 360/iterations after each
+        program = TurtleProgram()
+        turns = np.full(iterations * 4, 90.0)
+        turns[4::4] += 360/iterations
+        turns[:1] = 0
+        colors = np.repeat(self.random_colors(iterations), 4, axis=0)
+        program.add_steps(np.full(iterations * 4, float(size)), turns, colors)
+        program.right(90 + 360/iterations)
+        self.run_program(program)
         
         return self.save_image("geometric")
     
+    def get_lsystem(self, name):
+        """Get a preset L-system, reusing its memoized expansions"""
+        if name not in self.lsystems:
+            self.lsystems[name] = LSystem.preset(name)
+        return self.lsystems[name]
+    
     def snowflake(self, size=100, iterations=6):
         """Generate a snowflake pattern"""
         print("Generating snowflake pattern...")
         self.clear_screen()
         
-        def koch_curve(size, depth):
-            if depth == 0:
-                self.move_forward(size, color=self.random_color())
-            else:
-                size /= 3
-                koch_curve(size, depth-1)
-                self.left(60)
-                koch_curve(size, depth-1)
-                self.right(120)
-                koch_curve(size, depth-1)
-                self.left(60)
-                koch_curve(size, depth-1)
-        
-        for _ in range(3):
-            koch_curve(size, iterations)
-            self.right(120)
+        # Koch curve L-system: each side is split into 4 segments per iteration
+        koch = self.get_lsystem('koch')
+        segments = len(koch.compile(iterations)[0])
+        program = koch.program(iterations, size / 3**iterations, self.random_colors(segments))
+        program.right(120)
+        self.run_program(program)
         
         return self.save_image("snowflake")
     
-    def circular_pattern(self, radius=200, points=36):
-        """Generate a circular pattern with connecting lines"""
+    def lsystem_curve(self, name='hilbert', depth=6, margin=40, width=1):
+        """
+        Generate a fractal curve from an L-system preset scaled to fit the image
+        :param name: One of 'koch', 'hilbert', 'dragon', 'sierpinski'
+        :param depth: Number of rewriting iterations
+        :param margin: Border in pixels around the curve
+        """
+        print(f"Generating {name} curve (depth {depth})...")
+        self.clear_screen()
+        
+        system = self.get_lsystem(name)
+        segments = len(system.compile(depth)[0])
+        result = system.program(depth, 1.0, self.random_colors(segments)).evaluate()
+        
+        # Fit the unit-step curve into the image
+        xs = np.concatenate((result['x0'], result['x1']))
+        ys = np.concatenate((result['y0'], result['y1']))
+        span = max(xs.max() - xs.min(), ys.max() - ys.min(), 1e-9)
+        scale = min(self.width, self.height) - 2 * margin
+        scale /= span
+        offset_x = (self.width - (xs.max() - xs.min()) * scale) / 2 - xs.min() * scale
+        offset_y = (self.height - (ys.max() - ys.min()) * scale) / 2 - ys.min() * scale
+        for key, offset in (('x0', offset_x), ('x1', offset_x), ('y0', offset_y), ('y1', offset_y)):
+            result[key] = result[key] * scale + offset
+        self.draw_result(result, width)
+        
+        return self.save_image(f"{name}_curve")
+    
+    def circular_pattern(self, radius=200, points=36, alpha=None):
+        """
+        Generate a circular pattern with connecting lines
+        :param alpha: When set, chords add alpha-weighted color into a float buffer
+                      instead of overwriting, so thousands of points stay readable
+        """
         print("Generating circular pattern...")
         self.clear_screen()
         
         # Calculate points on circle
-        circle_points = []
-        for i in range(points):
-            angle = math.radians(i * 360 / points)
-            x = self.width//2 + radius * math.cos(angle)
-            y = self.height//2 + radius * math.sin(angle)
-            circle_points.append((int(x), int(y)))
-        
-        # Connect each point to every other point
-        for i in range(points):
-            for j in range(i + 1, points):
-                self.draw.line([circle_points[i], circle_points[j]], 
-                             fill=self.random_color(), width=1)
+        angles = np.radians(np.arange(points) * 360 / points)
+        xs = (self.width//2 + radius * np.cos(angles)).astype(int).astype(float)
+        ys = (self.height//2 + radius * np.sin(angles)).astype(int).astype(float)
+        
+        # Connect each point to every other point in one batch
+        i, j = np.triu_indices(points, k=1)
+        colors = self.random_colors(len(i))
+        pixels = np.array(self.image)
+        if alpha is None:
+            draw_segments(pixels, xs[i], ys[i], xs[j], ys[j], colors, 1, self.antialias)
+        else:
+            draw_segments_additive(pixels, xs[i], ys[i], xs[j], ys[j], colors, alpha)
+        self.image = Image.fromarray(pixels)
+        self.draw = ImageDraw.Draw(self.image)
         
         return self.save_image("circular_pattern")
 
@@ -163,6 +229,8 @@ def main():
     generator.geometric_pattern(200, 36)
     generator.snowflake(200, 4)
     generator.circular_pattern(300, 36)
+    for name in PRESETS:
+        generator.lsystem_curve(name, 6)
     
     print("\nAll patterns generated successfully!")
     print("Check the 'turtle_art' directory for the output files.")
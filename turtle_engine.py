@@ -0,0 +1,277 @@
+import numpy as np
+
+class TurtleProgram:
+    """
+    Records a turtle command stream (turn / forward / colour) and evaluates
+    all headings and positions at once with cumulative sums.
+    Each step is a turn applied before a forward move, so a program is just
+    a few parallel arrays no matter how it was recorded.
+    """
+
+    def __init__(self, color=(255, 255, 255)):
+        self.color = color
+        self.pending_turn = 0.0
+        self.chunks = []
+        self.turns = []
+        self.distances = []
+        self.colors = []
+        self.pen = []
+
+    def right(self, angle):
+        """Turn right by angle degrees before the next step"""
+        self.pending_turn += angle
+
+    def left(self, angle):
+        """Turn left by angle degrees before the next step"""
+        self.pending_turn -= angle
+
+    def set_color(self, color):
+        """Set the colour used by later steps without an explicit colour"""
+        self.color = color
+
+    def forward(self, distance, color=None, pen_down=True):
+        """Record a forward move"""
+        self.turns.append(self.pending_turn)
+        self.distances.append(distance)
+        self.colors.append(self.color if color is None else color)
+        self.pen.append(pen_down)
+        self.pending_turn = 0.0
+
+    def add_steps(self, distances, turns=0.0, colors=None, pen_down=True):
+        """
+        Record many steps at once
+        :param distances: Forward distance of each step
+        :param turns: Turn in degrees applied before each step (scalar or array)
+        :param colors: (n, 3) array of RGB colours, defaults to the current colour
+        :param pen_down: Whether the steps draw (scalar or boolean array)
+        """
+        self._flush()
+        distances = np.asarray(distances, dtype=np.float64)
+        n = len(distances)
+        turns = np.broadcast_to(np.asarray(turns, dtype=np.float64), (n,)).copy()
+        if n:
+            turns[0] += self.pending_turn
+            self.pending_turn = 0.0
+        if colors is None:
+            colors = np.broadcast_to(np.asarray(self.color, dtype=np.uint8), (n, 3))
+        colors = np.asarray(colors, dtype=np.uint8).reshape(n, 3)
+        pen = np.broadcast_to(np.asarray(pen_down, dtype=bool), (n,))
+        self.chunks.append((turns, distances, colors, pen))
+
+    def _flush(self):
+        """Move individually recorded steps into an array chunk"""
+        if self.distances:
+            self.chunks.append((
+                np.asarray(self.turns, dtype=np.float64),
+                np.asarray(self.distances, dtype=np.float64),
+                np.asarray(self.colors, dtype=np.uint8).reshape(-1, 3),
+                np.asarray(self.pen, dtype=bool)
+            ))
+            self.turns, self.distances, self.colors, self.pen = [], [], [], []
+
+    def __len__(self):
+        self._flush()
+        return sum(len(chunk[1]) for chunk in self.chunks)
+
+    def evaluate(self, start=(0.0, 0.0), heading=0.0):
+        """
+        Evaluate the program
+        :param start: Starting position (x, y)
+        :param heading: Starting heading in degrees (0 points right, y grows down)
+        :return: dict with segment arrays x0, y0, x1, y1, colors, pen and the
+                 final position and heading
+        """
+        self._flush()
+        if self.chunks:
+            turns, distances, colors, pen = (np.concatenate(parts) for parts in zip(*self.chunks))
+        else:
+            turns = distances = np.zeros(0)
+            colors = np.zeros((0, 3), np.uint8)
+            pen = np.zeros(0, bool)
+
+        headings = heading + np.cumsum(turns)
+        radians = np.radians(headings)
+        x = start[0] + np.cumsum(distances * np.cos(radians))
+        y = start[1] + np.cumsum(distances * np.sin(radians))
+        x0 = np.concatenate(([start[0]], x[:-1]))
+        y0 = np.concatenate(([start[1]], y[:-1]))
+
+        end = (x[-1], y[-1]) if len(x) else tuple(start)
+        end_heading = (headings[-1] if len(headings) else heading) + self.pending_turn
+        return {
+            'x0': x0, 'y0': y0, 'x1': x, 'y1': y,
+            'colors': colors, 'pen': pen,
+            'position': end, 'heading': end_heading % 360
+        }
+
+def _within(values, limit):
+    """Check that all values lie in [0, limit-1]"""
+    return len(values) == 0 or (values.min() >= 0 and values.max() <= limit - 1)
+
+def clip_segments(x0, y0, x1, y1, width, height):
+    """
+    Clip segments to the rectangle [0, width-1] x [0, height-1] (Liang-Barsky)
+    :return: Clipped x0, y0, x1, y1 and a mask of segments that are visible
+    """
+    # Curves fitted to the canvas need no clipping at all
+    if (_within(x0, width) and _within(x1, width) and
+            _within(y0, height) and _within(y1, height)):
+        return x0, y0, x1, y1, np.ones(x0.shape, dtype=bool)
+    dx = x1 - x0
+    dy = y1 - y0
+    t0 = np.zeros_like(x0)
+    t1 = np.ones_like(x0)
+    visible = np.ones(x0.shape, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in ((-dx, x0), (dx, width - 1 - x0), (-dy, y0), (dy, height - 1 - y0)):
+            parallel = p == 0
+            visible &= ~(parallel & (q < 0))
+            r = q / p
+            entering = p < 0
+            t0 = np.where(~parallel & entering, np.maximum(t0, r), t0)
+            t1 = np.where(~parallel & ~entering, np.minimum(t1, r), t1)
+    visible &= t0 <= t1
+    return (x0 + t0 * dx, y0 + t0 * dy, x0 + t1 * dx, y0 + t1 * dy, visible)
+
+def iter_segment_samples(x0, y0, x1, y1, max_samples=1 << 16):
+    """
+    Sample points along segments, one sample per pixel step.
+    Yields (segment_index, x, y) arrays in chunks of about max_samples points;
+    small chunks stay in cache and keep memory bounded for huge programs.
+    """
+    lengths = np.ceil(np.maximum(np.abs(x1 - x0), np.abs(y1 - y0))).astype(np.int64) + 1
+    step_x = (x1 - x0) / np.maximum(lengths - 1, 1)
+    step_y = (y1 - y0) / np.maximum(lengths - 1, 1)
+    ends = np.cumsum(lengths)
+    start = 0
+    while start < len(lengths):
+        base = ends[start - 1] if start else 0
+        stop = max(start + 1, int(np.searchsorted(ends, base + max_samples, side='right')))
+        counts = lengths[start:stop]
+        offsets = np.arange(ends[stop - 1] - base, dtype=np.float64)
+        offsets -= np.repeat(ends[start:stop] - base - counts, counts)
+        xs = np.repeat(step_x[start:stop], counts)
+        xs *= offsets
+        xs += np.repeat(x0[start:stop], counts)
+        ys = np.repeat(step_y[start:stop], counts)
+        ys *= offsets
+        ys += np.repeat(y0[start:stop], counts)
+        yield np.repeat(np.arange(start, stop, dtype=np.int32), counts), xs, ys
+        start = stop
+
+def draw_segments(pixels, x0, y0, x1, y1, colors, width=1, antialias=False):
+    """
+    Rasterize all segments into an (h, w, 3) uint8 array in one batched pass.
+    Later segments are drawn over earlier ones like sequential draw.line calls.
+    With antialias, pixel coverage is accumulated instead (see draw_segments_coverage).
+    """
+    height, width_px = pixels.shape[:2]
+    x0, y0, x1, y1, visible = clip_segments(x0, y0, x1, y1, width_px, height)
+    x0, y0, x1, y1, colors = x0[visible], y0[visible], x1[visible], y1[visible], colors[visible]
+    if antialias:
+        return draw_segments_coverage(pixels, x0, y0, x1, y1, colors, width)
+
+    # Record the index of the segment that touched each pixel last; samples come
+    # in segment order, so plain assignment keeps the latest (largest) index
+    latest = np.full(height * width_px, -1, dtype=np.int32)
+    for index, xs, ys in iter_segment_samples(x0, y0, x1, y1):
+        # Clipped coordinates are non-negative, so +0.5 and truncation rounds
+        xs += 0.5
+        ys += 0.5
+        pixel = ys.astype(np.intp)
+        pixel *= width_px
+        pixel += xs.astype(np.intp)
+        latest[pixel] = index
+    latest = latest.reshape(height, width_px)
+
+    # A square brush is a max filter over the index image, the latest segment still wins
+    if width > 1:
+        brush = range(-((width - 1) // 2), width // 2 + 1)
+        source = latest
+        latest = source.copy()
+        for oy in brush:
+            for ox in brush:
+                if oy or ox:
+                    target = latest[max(oy, 0):height + min(oy, 0), max(ox, 0):width_px + min(ox, 0)]
+                    shifted = source[max(-oy, 0):height + min(-oy, 0), max(-ox, 0):width_px + min(-ox, 0)]
+                    np.maximum(target, shifted, out=target)
+
+    drawn = latest >= 0
+    pixels[drawn] = colors[latest[drawn]]
+    return pixels
+
+def draw_segments_coverage(pixels, x0, y0, x1, y1, colors, width=1):
+    """
+    Antialiased rasterization by coverage accumulation.
+    Each sample splats bilinear weights onto its four neighbouring pixels, so a
+    pixel's summed weight approximates how much of it the lines cover. Colours
+    of overlapping segments are averaged by coverage, then composited over the
+    existing pixels with the clamped coverage as alpha. Costs about one
+    bincount pass per channel, far less than rendering at a higher resolution.
+    """
+    height, width_px = pixels.shape[:2]
+    size = height * width_px
+    coverage = np.zeros(size)
+    color_sum = np.zeros((3, size))
+    colors = colors.astype(np.float64)
+    brush = np.arange(width) - (width - 1) / 2
+    for index, xs, ys in iter_segment_samples(x0, y0, x1, y1, max_samples=1 << 20):
+        pixel_parts, weight_parts, index_parts = [], [], []
+        for oy in brush:
+            for ox in brush:
+                sx = xs + ox
+                sy = ys + oy
+                fx0 = np.floor(sx)
+                fy0 = np.floor(sy)
+                fx = sx - fx0
+                fy = sy - fy0
+                for dx, dy, weight in ((0, 0, (1 - fx) * (1 - fy)), (1, 0, fx * (1 - fy)),
+                                       (0, 1, (1 - fx) * fy), (1, 1, fx * fy)):
+                    px = fx0.astype(np.intp) + dx
+                    py = fy0.astype(np.intp) + dy
+                    inside = (px >= 0) & (px < width_px) & (py >= 0) & (py < height)
+                    pixel_parts.append(py[inside] * width_px + px[inside])
+                    weight_parts.append(weight[inside])
+                    index_parts.append(index[inside])
+        pixel = np.concatenate(pixel_parts)
+        weight = np.concatenate(weight_parts)
+        index = np.concatenate(index_parts)
+        coverage += np.bincount(pixel, weight, size)
+        for c in range(3):
+            color_sum[c] += np.bincount(pixel, weight * colors[index, c], size)
+
+    alpha = np.minimum(coverage, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_color = np.where(coverage > 0, color_sum / coverage, 0.0)
+    flat = pixels.reshape(size, 3)
+    blended = flat * (1 - alpha)[:, None] + mean_color.T * alpha[:, None]
+    flat[:] = np.clip(np.rint(blended), 0, 255).astype(np.uint8)
+    return pixels
+
+def draw_segments_additive(pixels, x0, y0, x1, y1, colors, alpha=0.1):
+    """
+    Rasterize segments by adding alpha-weighted colour into a float buffer.
+    Dense overdraw (string art, chord diagrams) builds up brightness instead
+    of the last line winning; the sum is exposure mapped as
+    1 - (1 - base) * exp(-sum) so it approaches white without hard clipping.
+    """
+    height, width_px = pixels.shape[:2]
+    size = height * width_px
+    x0, y0, x1, y1, visible = clip_segments(x0, y0, x1, y1, width_px, height)
+    x0, y0, x1, y1, colors = x0[visible], y0[visible], x1[visible], y1[visible], colors[visible]
+    energy = np.zeros((3, size))
+    weights = colors.astype(np.float64) * (alpha / 255.0)
+    for index, xs, ys in iter_segment_samples(x0, y0, x1, y1, max_samples=1 << 20):
+        xs += 0.5
+        ys += 0.5
+        pixel = ys.astype(np.intp)
+        pixel *= width_px
+        pixel += xs.astype(np.intp)
+        for c in range(3):
+            energy[c] += np.bincount(pixel, weights[index, c], size)
+
+    flat = pixels.reshape(size, 3)
+    base = flat / 255.0
+    exposed = 1 - (1 - base) * np.exp(-energy.T)
+    flat[:] = np.clip(np.rint(exposed * 255), 0, 255).astype(np.uint8)
+    return pixels
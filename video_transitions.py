@@ -0,0 +1,98 @@
+import cv2
+import numpy as np
+
+TRANSITION_TYPES = ('crossfade', 'wipe', 'slide', 'zoom', 'kenburns')
+
+class TransitionEngine:
+    """
+    Renders transition frames between two images of the same size.
+    All work buffers and remap grids are allocated once, so rendering a
+    transition does not allocate per frame. The frames yielded by render()
+    share one output buffer and must be consumed before the next frame.
+    """
+
+    def __init__(self, size, steps, kind='crossfade', zoom=1.3, pan=(0.08, 0.05)):
+        """
+        Initialize the engine
+        :param size: Frame size (width, height)
+        :param steps: Number of transition frames between two images
+        :param kind: One of TRANSITION_TYPES
+        :param zoom: Maximum zoom factor for 'zoom' and 'kenburns'
+        :param pan: Starting pan of 'kenburns' as a fraction of (width, height)
+        """
+        if kind not in TRANSITION_TYPES:
+            raise ValueError(f"Unknown transition '{kind}', choose from {', '.join(TRANSITION_TYPES)}")
+        self.width, self.height = size
+        self.steps = steps
+        self.kind = kind
+        self.zoom = zoom
+        self.pan = (pan[0] * self.width, pan[1] * self.height)
+
+        shape = (self.height, self.width, 3)
+        self.output = np.empty(shape, np.uint8)
+        if kind in ('zoom', 'kenburns'):
+            # Pixel offsets from the frame centre, scaled per step into the remap grids
+            self.center = ((self.width - 1) / 2, (self.height - 1) / 2)
+            xs = np.arange(self.width, dtype=np.float32) - np.float32(self.center[0])
+            ys = np.arange(self.height, dtype=np.float32) - np.float32(self.center[1])
+            self.grid_x, self.grid_y = np.meshgrid(xs, ys)
+            self.map_x = np.empty_like(self.grid_x)
+            self.map_y = np.empty_like(self.grid_y)
+            self.warped = np.empty(shape, np.uint8)
+
+    def render(self, prev_frame, current_frame):
+        """Yield the transition frames from prev_frame to current_frame"""
+        if self.steps <= 0:
+            return
+        yield from getattr(self, f"_{self.kind}")(prev_frame, current_frame)
+
+    def _crossfade(self, prev_frame, current_frame):
+        # A fused uint8 blend into the output buffer beats stepping a float
+        # accumulator, which moves four times as much memory per frame
+        for t in range(self.steps):
+            alpha = t / self.steps
+            cv2.addWeighted(prev_frame, 1 - alpha, current_frame, alpha, 0, dst=self.output)
+            yield self.output
+
+    def _wipe(self, prev_frame, current_frame):
+        np.copyto(self.output, prev_frame)
+        for t in range(self.steps):
+            x = round(self.width * t / self.steps)
+            self.output[:, :x] = current_frame[:, :x]
+            yield self.output
+
+    def _slide(self, prev_frame, current_frame):
+        for t in range(self.steps):
+            x = round(self.width * t / self.steps)
+            self.output[:, :self.width - x] = prev_frame[:, x:]
+            self.output[:, self.width - x:] = current_frame[:, :x]
+            yield self.output
+
+    def _update_maps(self, scale, offset_x=0.0, offset_y=0.0):
+        """Fill the remap grids for a zoom by scale around the (shifted) centre"""
+        np.multiply(self.grid_x, 1.0 / scale, out=self.map_x)
+        np.multiply(self.grid_y, 1.0 / scale, out=self.map_y)
+        self.map_x += self.center[0] + offset_x
+        self.map_y += self.center[1] + offset_y
+
+    def _zoom(self, prev_frame, current_frame):
+        # Zoom into the previous image while fading to the current one
+        for t in range(self.steps):
+            alpha = t / self.steps
+            self._update_maps(1 + (self.zoom - 1) * alpha)
+            cv2.remap(prev_frame, self.map_x, self.map_y, cv2.INTER_LINEAR,
+                      dst=self.warped, borderMode=cv2.BORDER_REFLECT)
+            cv2.addWeighted(self.warped, 1 - alpha, current_frame, alpha, 0, dst=self.output)
+            yield self.output
+
+    def _kenburns(self, prev_frame, current_frame):
+        # Fade in the current image while it pans and settles from a close-up
+        for t in range(self.steps):
+            alpha = t / self.steps
+            remaining = 1 - alpha
+            self._update_maps(1 + (self.zoom - 1) * remaining,
+                              self.pan[0] * remaining, self.pan[1] * remaining)
+            cv2.remap(current_frame, self.map_x, self.map_y, cv2.INTER_LINEAR,
+                      dst=self.warped, borderMode=cv2.BORDER_REFLECT)
+            cv2.addWeighted(prev_frame, remaining, self.warped, alpha, 0, dst=self.output)
+            yield self.output